@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..models.allocation import AvailableEmployee, MaterialOvercommit, ScheduleCheck, ScheduleProposal
+from ..models.base import naive_utc
+from ..database import get_db
+from ..replicas import get_read_db
+from ..pagination import NEXT_CURSOR_HEADER
+from ..auth import get_current_user
+from ..services.allocation_service import (
+    check_schedule_db,
+    get_available_employees_db,
+    get_material_overcommits_db
+)
+
+router = APIRouter()
+
+def _check_window(start: Optional[datetime], end: Optional[datetime]) -> None:
+    # Either may carry a timezone; compare them as naive UTC, like the service does.
+    start, end = naive_utc(start), naive_utc(end)
+    if start and end and end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+@router.get("/employees/available", response_model=List[AvailableEmployee])
+async def get_available_employees(
+    response: Response,
+    start: datetime,
+    end: Optional[datetime] = Query(None, description="Omit for open-ended availability"),
+    department: Optional[str] = None,
+    role: Optional[str] = None,
+    status: Optional[str] = "active",
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    _check_window(start, end)
+    try:
+        employees, next_cursor = await get_available_employees_db(
+            db, start, end, department, role, status, limit, cursor
+        )
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return employees
+
+@router.get("/materials/{material_id}/overcommits", response_model=List[MaterialOvercommit])
+async def get_material_overcommits(
+    material_id: int,
+    start: Optional[datetime] = Query(None, description="Defaults to now"),
+    end: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    _check_window(start, end)
+    try:
+        overcommits = await get_material_overcommits_db(db, material_id, start, end)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    if overcommits is None:
+        raise HTTPException(status_code=404, detail="Material not found")
+    return overcommits
+
+@router.post("/check", response_model=ScheduleCheck)
+async def check_schedule(
+    proposal: ScheduleProposal,
+    # Read-only, but checked against the primary: the answer usually decides a write.
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        return await check_schedule_db(db, proposal.assignments)
+    except LookupError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error occurred")
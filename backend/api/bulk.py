@@ -0,0 +1,66 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..database import get_db
+from ..auth import get_current_user
+from ..response_cache import response_cache
+from ..services.bulk_service import export_rows, import_rows, read_rows
+from ..services.org_service import rebuild_org_paths
+from .materials import availability_cache
+
+router = APIRouter()
+
+Resource = Literal["employees", "materials", "projects"]
+Format = Literal["csv", "ndjson"]
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _guess_format(filename: Optional[str]) -> Format:
+    if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "csv"
+
+
+@router.post("/{resource}/import")
+async def import_resource(
+    resource: Resource,
+    file: UploadFile = File(...),
+    format: Optional[Format] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    fmt = format or _guess_format(file.filename)
+    try:
+        report = await import_rows(db, resource, read_rows(file.file, fmt))
+    except UnicodeDecodeError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to import {resource}")
+    if report["inserted"]:
+        if resource == "employees":
+            # Imported rows bypass update_employee, so rebuild the org paths in one statement.
+            await rebuild_org_paths(db)
+        elif resource == "materials":
+            # Supplier prices were recorded in the import transaction; see bulk_service.
+            availability_cache.clear()
+        await response_cache.invalidate(resource)
+    return report
+
+
+@router.get("/{resource}/export")
+async def export_resource(
+    resource: Resource,
+    format: Format = "csv",
+    current_user: dict = Depends(get_current_user)
+):
+    return StreamingResponse(
+        export_rows(resource, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{format}"'}
+    )
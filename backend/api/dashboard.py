@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..cache import TTLCache
+from ..config import settings
+from ..models.dashboard import DashboardSummary
+from ..replicas import get_read_db
+from ..auth import get_current_user
+from ..services.dashboard_service import get_dashboard_summary_db
+
+router = APIRouter()
+
+summary_cache = TTLCache(ttl=settings.DASHBOARD_CACHE_TTL, maxsize=1)
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    summary = summary_cache.get("summary")
+    if summary is None:
+        try:
+            summary = await get_dashboard_summary_db(db)
+        except SQLAlchemyError as e:
+            raise HTTPException(status_code=500, detail="Failed to build dashboard summary")
+        summary_cache.set("summary", summary)
+    return summary
@@ -1,56 +1,224 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional, Set
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
-from ..models.employee import Employee, EmployeeCreate, EmployeeUpdate, EmployeeStatus, EmployeePerformance
+from ..models.employee import (
+    Employee,
+    EmployeeCreate,
+    EmployeePerformance,
+    EmployeeRead,
+    EmployeeStatus,
+    EmployeeUpdate,
+    EmployeeWithIncludes,
+    TeamRollup
+)
 from ..database import get_db
+from ..replicas import get_read_db
+from ..singleflight import single_flight
+from ..pagination import NEXT_CURSOR_HEADER, paginate, split_page
+from ..response_cache import detail_loader, page_loader, response_cache
+from ..serialization import EMPLOYEE_FIELDS, parse_fields, row_page_loader
+from ..loading import EMPLOYEE_INCLUDES, expand, parse_includes
+from ..events import STREAM_KEEPALIVE_SECONDS, status_broadcaster
+from ..services.performance_service import get_performance_metrics_db
+from ..services.org_service import (
+    MAX_ORG_DEPTH,
+    OrgCycleError,
+    get_ancestors_db,
+    get_subtree_db,
+    get_team_rollup_db,
+    is_in_subtree_db,
+    supervisor_path,
+    sync_org_path
+)
 from ..auth import get_current_user
 
-router = APIRouter(prefix="/api/employees", tags=["employees"])
+router = APIRouter()
 
-@router.get("/", response_model=List[Employee])
+MAX_STATUS_IDS = 1000
+
+
+def _parse_ids(ids: Optional[str]) -> Optional[Set[int]]:
+    if not ids:
+        return None
+    try:
+        parsed = {int(value) for value in ids.split(",") if value.strip()}
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+    if len(parsed) > MAX_STATUS_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_STATUS_IDS} ids can be requested at once"
+        )
+    return parsed
+
+@router.get("/", response_model=List[EmployeeWithIncludes], response_model_exclude_unset=True)
 async def get_employees(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
+    options = parse_includes(include, EMPLOYEE_INCLUDES)
+    columns = parse_fields(fields, Employee, EMPLOYEE_FIELDS)
+    order = (Employee.id,)
+
+    if columns is not None:
+        if include:
+            raise HTTPException(status_code=400, detail="fields cannot be combined with include")
+
+        async def load_rows():
+            result = await db.execute(paginate(select(*columns), order, limit, skip, cursor))
+            return split_page(result.all(), order, limit)
+
+        try:
+            return await response_cache.respond(
+                request, "employees", f"list:{request.url.query}", row_page_loader(load_rows)
+            )
+        except SQLAlchemyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error occurred"
+            )
+
+    async def load_page():
+        result = await db.execute(paginate(select(Employee).options(*options), order, limit, skip, cursor))
+        return split_page(result.scalars().all(), order, limit)
+
     try:
-        employees = db.query(Employee).offset(skip).limit(limit).all()
-        return employees
+        if not include:
+            return await response_cache.respond(
+                request, "employees", f"list:{request.url.query}", page_loader(load_page)
+            )
+        employees, next_cursor = await load_page()
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return [expand(employee, include) for employee in employees]
     except SQLAlchemyError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database error occurred"
         )
 
-@router.post("/", response_model=Employee, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=EmployeeRead, status_code=status.HTTP_201_CREATED)
 async def create_employee(
     employee: EmployeeCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     try:
         db_employee = Employee(**employee.dict())
+        # Resolved before the insert so an unknown supervisor is a 422, not a foreign key error.
+        parent_path = await supervisor_path(db, db_employee.supervisor_id)
         db.add(db_employee)
-        db.commit()
-        db.refresh(db_employee)
-        return db_employee
+        await db.flush()
+        await sync_org_path(db, db_employee, parent_path)
+        await db.commit()
+        await db.refresh(db_employee)
+        await response_cache.invalidate("employees")
+        return db_employee.to_dict()
+    except LookupError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except OrgCycleError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create employee"
         )
 
-@router.get("/{employee_id}", response_model=Employee)
+@router.get("/status", response_model=List[EmployeeStatus])
+async def get_employee_statuses(
+    ids: str = Query(..., description="Comma-separated employee ids"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    employee_ids = _parse_ids(ids)
+    if not employee_ids:
+        return []
+
+    async def load_statuses():
+        result = await db.execute(
+            select(Employee.id, Employee.status, Employee.last_status_update)
+            .filter(Employee.id.in_(employee_ids))
+        )
+        return [
+            {
+                "id": row.id,
+                "status": row.status,
+                "last_status_update": row.last_status_update.isoformat() if row.last_status_update else None
+            }
+            for row in result
+        ]
+
+    try:
+        return await single_flight.do(("employee-statuses", frozenset(employee_ids)), load_statuses)
+    except SQLAlchemyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred"
+        )
+
+async def _status_events(request: Request, employee_ids: Optional[Set[int]]) -> AsyncIterator[str]:
+    queue = status_broadcaster.subscribe()
+    try:
+        while not await request.is_disconnected():
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if employee_ids is None or payload["id"] in employee_ids:
+                yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        status_broadcaster.unsubscribe(queue)
+
+@router.get("/status/stream")
+async def stream_employee_statuses(
+    request: Request,
+    ids: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    return StreamingResponse(
+        _status_events(request, _parse_ids(ids)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{employee_id}", response_model=EmployeeWithIncludes, response_model_exclude_unset=True)
 async def get_employee(
     employee_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    options = parse_includes(include, EMPLOYEE_INCLUDES)
+    if include:
+        employee = await db.get(Employee, employee_id, options=options)
+        if employee:
+            return expand(employee, include)
+    else:
+        employee = await response_cache.respond(
+            request, "employees", f"detail:{employee_id}",
+            detail_loader(lambda: db.get(Employee, employee_id, options=options))
+        )
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -58,14 +226,14 @@ async def get_employee(
         )
     return employee
 
-@router.put("/{employee_id}", response_model=Employee)
+@router.put("/{employee_id}", response_model=EmployeeRead)
 async def update_employee(
     employee_id: int,
     employee_update: EmployeeUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    db_employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    db_employee = await db.get(Employee, employee_id)
     if not db_employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -73,13 +241,23 @@ async def update_employee(
         )
     
     try:
-        for key, value in employee_update.dict(exclude_unset=True).items():
+        changes = employee_update.dict(exclude_unset=True)
+        for key, value in changes.items():
             setattr(db_employee, key, value)
-        db.commit()
-        db.refresh(db_employee)
-        return db_employee
+        if "supervisor_id" in changes:
+            await sync_org_path(db, db_employee)
+        await db.commit()
+        await db.refresh(db_employee)
+        await response_cache.invalidate("employees")
+        return db_employee.to_dict()
+    except LookupError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except OrgCycleError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update employee"
@@ -88,10 +266,10 @@ async def update_employee(
 @router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_employee(
     employee_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    db_employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    db_employee = await db.get(Employee, employee_id)
     if not db_employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -99,10 +277,11 @@ async def delete_employee(
         )
     
     try:
-        db.delete(db_employee)
-        db.commit()
+        await db.delete(db_employee)
+        await db.commit()
+        await response_cache.invalidate("employees")
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete employee"
@@ -111,27 +290,128 @@ async def delete_employee(
 @router.get("/{employee_id}/status", response_model=EmployeeStatus)
 async def get_employee_status(
     employee_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
-    if not employee:
+    async def load_status():
+        result = await db.execute(
+            select(Employee.id, Employee.status, Employee.last_status_update).filter(Employee.id == employee_id)
+        )
+        row = result.first()
+        return row._asdict() if row else None
+
+    employee_status = await single_flight.do(("employee-status", employee_id), load_status)
+    if employee_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee not found"
+        )
+    return employee_status
+
+@router.put("/{employee_id}/status", response_model=EmployeeStatus)
+async def update_employee_status(
+    employee_id: int,
+    new_status: str = Body(..., embed=True, alias="status"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    db_employee = await db.get(Employee, employee_id)
+    if not db_employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found"
         )
-    return employee.status
+
+    try:
+        db_employee.update_status(new_status)
+        await db.commit()
+        await response_cache.invalidate("employees")
+        return {
+            "id": db_employee.id,
+            "status": db_employee.status,
+            "last_status_update": db_employee.last_status_update
+        }
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update employee status"
+        )
 
 @router.get("/{employee_id}/performance", response_model=EmployeePerformance)
 async def get_employee_performance(
     employee_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    performance = await get_performance_metrics_db(db, employee_id)
+    if performance:
+        return performance
+
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found"
         )
-    return employee.get_performance_metrics()
\ No newline at end of file
+    return EmployeePerformance(
+        employee_id=employee.id,
+        total_hours_worked=employee.total_hours_worked or 0.0,
+        performance_score=employee.performance_score
+    )
+
+def _employee_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Employee not found"
+    )
+
+@router.get("/{employee_id}/subtree")
+async def get_employee_subtree(
+    employee_id: int,
+    max_depth: int = Query(MAX_ORG_DEPTH, ge=1, le=MAX_ORG_DEPTH),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    subtree = await get_subtree_db(db, employee_id, max_depth)
+    if subtree is None:
+        raise _employee_not_found()
+    return subtree
+
+@router.get("/{employee_id}/ancestors")
+async def get_employee_ancestors(
+    employee_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    ancestors = await get_ancestors_db(db, employee_id)
+    if ancestors is None:
+        raise _employee_not_found()
+    return ancestors
+
+@router.get("/{employee_id}/team-rollup", response_model=TeamRollup)
+async def get_employee_team_rollup(
+    employee_id: int,
+    include_self: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    rollup = await get_team_rollup_db(db, employee_id, include_self)
+    if rollup is None:
+        raise _employee_not_found()
+    return rollup
+
+@router.get("/{employee_id}/manages/{other_id}")
+async def get_employee_manages(
+    employee_id: int,
+    other_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    manages = await is_in_subtree_db(db, employee_id, other_id)
+    if manages is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee not found or org paths not built"
+        )
+    return {"supervisor_id": employee_id, "employee_id": other_id, "manages": manages}
@@ -1,108 +1,328 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+import asyncio
+import json
+from typing import AsyncIterator, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
-from ..models.material import Material, MaterialCreate, MaterialUpdate
-from ..database import get_db
+from ..models.material import (
+    Material,
+    MaterialCreate,
+    MaterialRead,
+    MaterialUpdate,
+    MaterialWithIncludes,
+    StockLevel,
+    StockMovementBatch
+)
+from ..cache import TTLCache
+from ..config import settings
+from ..database import escape_like, get_db
+from ..events import STREAM_KEEPALIVE_SECONDS, stock_alert_broadcaster
+from ..replicas import ReadSessionLocal, get_read_db, replica_router
+from ..pagination import NEXT_CURSOR_HEADER, paginate, finalize_page, split_page
+from ..response_cache import detail_loader, page_loader, response_cache
+from ..serialization import MATERIAL_FIELDS, parse_fields, row_page_loader
 from ..auth import get_current_user
+from ..loading import MATERIAL_INCLUDES, expand, parse_includes
+from ..services.project_cost_service import refresh_costs_for_materials
+from ..services.stock_service import apply_stock_movements_db
+from ..services.supplier_price_service import record_material_price
 
 router = APIRouter()
 
-@router.get("/materials", response_model=List[Material])
+# Short-lived cache for the default availability page polled by MaterialsTracker.
+availability_cache = TTLCache(ttl=settings.AVAILABILITY_CACHE_TTL)
+
+
+def _search_materials(search: str, dialect_name: str) -> Select:
+    """Fuzzy match on name/description and prefix match on SKU, ranked by relevance.
+
+    On Postgres every predicate is served by the pg_trgm GIN indexes from
+    migration 0001. Elsewhere there is no trigram support, so the search falls
+    back to substring matches, with SKU prefix hits first.
+    """
+    pattern = f"%{escape_like(search)}%"
+    sku_prefix = f"{escape_like(search)}%"
+    sku_match = Material.sku.ilike(sku_prefix, escape="\\")
+    matches = [
+        sku_match,
+        Material.name.ilike(pattern, escape="\\"),
+        Material.description.ilike(pattern, escape="\\"),
+    ]
+    if dialect_name != "postgresql":
+        rank = case((sku_match, 1.0), else_=0.0)
+        return select(Material).filter(or_(*matches)).order_by(rank.desc(), Material.id)
+
+    rank = func.greatest(
+        case((sku_match, 1.0), else_=0.0),
+        func.word_similarity(search, Material.name),
+        func.coalesce(func.word_similarity(search, Material.description), 0.0) * 0.5,
+    )
+    return (
+        select(Material)
+        .filter(or_(*matches, Material.name.op("%")(search)))
+        .order_by(rank.desc(), Material.id)
+    )
+
+
+@router.get("/", response_model=List[MaterialWithIncludes], response_model_exclude_unset=True)
 async def get_materials(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
-    try:
-        query = db.query(Material)
+    options = parse_includes(include, MATERIAL_INCLUDES)
+    columns = parse_fields(fields, Material, MATERIAL_FIELDS)
+    if search and cursor:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported with search")
+    if columns is not None and include:
+        raise HTTPException(status_code=400, detail="fields cannot be combined with include")
+    order = (Material.id,)
+
+    async def load_page():
+        if search:
+            result = await db.execute(_search_materials(search, db.bind.dialect.name).options(*options).offset(skip).limit(limit))
+            return result.scalars().all(), None
+        result = await db.execute(paginate(select(Material).options(*options), order, limit, skip, cursor))
+        return split_page(result.scalars().all(), order, limit)
+
+    async def load_rows():
         if search:
-            query = query.filter(Material.name.ilike(f"%{search}%"))
-        materials = query.offset(skip).limit(limit).all()
-        return materials
+            result = await db.execute(_search_materials(search, db.bind.dialect.name).with_only_columns(*columns).offset(skip).limit(limit))
+            return result.all(), None
+        result = await db.execute(paginate(select(*columns), order, limit, skip, cursor))
+        return split_page(result.all(), order, limit)
+
+    try:
+        if columns is not None:
+            return await response_cache.respond(
+                request, "materials", f"list:{request.url.query}", row_page_loader(load_rows)
+            )
+        if not include:
+            return await response_cache.respond(
+                request, "materials", f"list:{request.url.query}", page_loader(load_page)
+            )
+        materials, next_cursor = await load_page()
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return [expand(material, include) for material in materials]
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail="Database error occurred")
 
-@router.get("/materials/{material_id}", response_model=Material)
+async def _stream_available_materials(min_quantity: int) -> AsyncIterator[str]:
+    async with ReadSessionLocal(bind=replica_router.read_engine()) as session:
+        result = await session.stream_scalars(
+            select(Material)
+            .filter(Material.quantity >= min_quantity)
+            .order_by(Material.quantity.desc(), Material.id.desc())
+            .execution_options(yield_per=500)
+        )
+        async for material in result:
+            yield json.dumps(material.to_dict()) + "\n"
+
+
+@router.get("/availability", response_model=List[MaterialRead])
+async def get_available_materials(
+    response: Response,
+    min_quantity: int = Query(1, ge=0),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if format == "ndjson":
+        return StreamingResponse(
+            _stream_available_materials(min_quantity),
+            media_type="application/x-ndjson"
+        )
+
+    cache_key = (min_quantity, limit) if min_quantity == 1 and not skip and not cursor else None
+    if cache_key:
+        cached = availability_cache.get(cache_key)
+        if cached is not None:
+            materials, next_cursor = cached
+            if next_cursor:
+                response.headers[NEXT_CURSOR_HEADER] = next_cursor
+            return materials
+
+    try:
+        order = (Material.quantity, Material.id)
+        query = select(Material).filter(Material.quantity >= min_quantity)
+        result = await db.execute(paginate(query, order, limit, skip, cursor, descending=True))
+        materials, next_cursor = split_page(result.scalars().all(), order, limit)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Failed to fetch material availability")
+
+    materials = [material.to_dict() for material in materials]
+    if cache_key:
+        availability_cache.set(cache_key, (materials, next_cursor))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return materials
+
+@router.get("/low-stock", response_model=List[MaterialRead])
+async def get_low_stock_materials(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        order = (Material.id,)
+        query = select(Material).filter(Material.is_low_stock)
+        result = await db.execute(paginate(query, order, limit, cursor=cursor))
+        materials = finalize_page(result.scalars().all(), order, limit, response)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Failed to fetch low stock materials")
+    return [material.to_dict() for material in materials]
+
+async def _stock_alert_events(request: Request) -> AsyncIterator[str]:
+    queue = stock_alert_broadcaster.subscribe()
+    try:
+        while not await request.is_disconnected():
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: low-stock\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        stock_alert_broadcaster.unsubscribe(queue)
+
+@router.get("/low-stock/stream")
+async def stream_low_stock_alerts(
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    return StreamingResponse(
+        _stock_alert_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{material_id}", response_model=MaterialWithIncludes, response_model_exclude_unset=True)
 async def get_material(
     material_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
-    material = db.query(Material).filter(Material.id == material_id).first()
+    options = parse_includes(include, MATERIAL_INCLUDES)
+    if include:
+        material = await db.get(Material, material_id, options=options)
+        if material:
+            return expand(material, include)
+    else:
+        material = await response_cache.respond(
+            request, "materials", f"detail:{material_id}",
+            detail_loader(lambda: db.get(Material, material_id, options=options))
+        )
     if not material:
         raise HTTPException(status_code=404, detail="Material not found")
     return material
 
-@router.post("/materials", response_model=Material)
+@router.post("/", response_model=MaterialRead)
 async def create_material(
     material: MaterialCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     try:
         db_material = Material(**material.dict())
         db.add(db_material)
-        db.commit()
-        db.refresh(db_material)
-        return db_material
+        await record_material_price(db, db_material)
+        await db.commit()
+        await db.refresh(db_material)
+        availability_cache.clear()
+        await response_cache.invalidate("materials")
+        return db_material.to_dict()
+    except LookupError as e:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail=str(e))
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create material")
 
-@router.put("/materials/{material_id}", response_model=Material)
+@router.post("/stock-movements", response_model=List[StockLevel])
+async def apply_stock_movements(
+    batch: StockMovementBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        levels = await apply_stock_movements_db(db, batch.movements)
+    except LookupError as e:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail=str(e))
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to apply stock movements")
+    availability_cache.clear()
+    await response_cache.invalidate("materials")
+    return levels
+
+@router.put("/{material_id}", response_model=MaterialRead)
 async def update_material(
     material_id: int,
     material_update: MaterialUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    db_material = db.query(Material).filter(Material.id == material_id).first()
+    db_material = await db.get(Material, material_id)
     if not db_material:
         raise HTTPException(status_code=404, detail="Material not found")
     
     try:
-        for key, value in material_update.dict(exclude_unset=True).items():
+        changes = material_update.dict(exclude_unset=True)
+        for key, value in changes.items():
             setattr(db_material, key, value)
-        db.commit()
-        db.refresh(db_material)
-        return db_material
+        # Flushed first so the price log and the cost refresh below see the new price.
+        await db.flush()
+        if changes.keys() & {"price_per_unit", "supplier_id"}:
+            await record_material_price(db, db_material)
+        if "price_per_unit" in changes:
+            await refresh_costs_for_materials(db, [material_id])
+        await db.commit()
+        await db.refresh(db_material)
+        availability_cache.clear()
+        await response_cache.invalidate("materials")
+        return db_material.to_dict()
+    except LookupError as e:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail=str(e))
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update material")
 
-@router.delete("/materials/{material_id}")
+@router.delete("/{material_id}")
 async def delete_material(
     material_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    db_material = db.query(Material).filter(Material.id == material_id).first()
+    db_material = await db.get(Material, material_id)
     if not db_material:
         raise HTTPException(status_code=404, detail="Material not found")
     
     try:
-        db.delete(db_material)
-        db.commit()
+        await db.delete(db_material)
+        await db.commit()
+        availability_cache.clear()
+        await response_cache.invalidate("materials")
         return {"message": "Material deleted successfully"}
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to delete material")
-
-@router.get("/materials/availability", response_model=List[Material])
-async def get_available_materials(
-    min_quantity: int = Query(1, ge=0),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
-):
-    try:
-        materials = db.query(Material)\
-            .filter(Material.quantity >= min_quantity)\
-            .order_by(Material.quantity.desc())\
-            .all()
-        return materials
-    except SQLAlchemyError as e:
-        raise HTTPException(status_code=500, detail="Failed to fetch material availability")
\ No newline at end of file
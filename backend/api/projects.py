@@ -1,11 +1,24 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
 
-from ..models.project import Project, ProjectCreate, ProjectUpdate, ProjectProgress
+from ..models.project import (
+    Project,
+    ProjectBudget,
+    ProjectCreate,
+    ProjectProgress,
+    ProjectRead,
+    ProjectUpdate,
+    ProjectWithIncludes
+)
 from ..database import get_db
-from ..auth.auth_bearer import JWTBearer
+from ..replicas import get_read_db
+from ..pagination import NEXT_CURSOR_HEADER
+from ..loading import PROJECT_INCLUDES, expand, parse_includes
+from ..response_cache import detail_loader, page_loader, response_cache
+from ..serialization import PROJECT_FIELDS, parse_fields, row_page_loader
+from ..auth import JWTBearer
 from ..services.project_service import (
     create_project_db,
     get_project_db,
@@ -14,58 +27,131 @@ from ..services.project_service import (
     delete_project_db,
     update_project_progress_db
 )
+from ..services.project_cost_service import get_project_budget_db, get_projects_over_budget_db
 
-router = APIRouter(
-    prefix="/api/projects",
-    tags=["projects"],
-    dependencies=[Depends(JWTBearer())]
-)
+router = APIRouter(dependencies=[Depends(JWTBearer())])
 
-@router.post("/", response_model=Project)
+@router.post("/", response_model=ProjectRead)
 async def create_project(
     project: ProjectCreate,
     db: AsyncSession = Depends(get_db)
-) -> Project:
-    return await create_project_db(db, project)
+) -> dict:
+    try:
+        db_project = await create_project_db(db, project)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    await response_cache.invalidate("projects")
+    return db_project.to_dict()
 
-@router.get("/", response_model=List[Project])
+@router.get("/", response_model=List[ProjectWithIncludes], response_model_exclude_unset=True)
 async def get_projects(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
-) -> List[Project]:
-    return await get_projects_db(db, skip, limit, status)
+    include: Optional[str] = None,
+    sort: Literal["id", "computed_progress", "-computed_progress"] = "id",
+    behind_schedule: Optional[bool] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    options = parse_includes(include, PROJECT_INCLUDES)
+    columns = parse_fields(fields, Project, PROJECT_FIELDS)
+    if cursor and sort != "id":
+        raise HTTPException(status_code=400, detail="Cursor pagination is only supported when sorting by id")
+
+    async def load_page():
+        return await get_projects_db(db, skip, limit, status, cursor, options, sort, behind_schedule)
+
+    if columns is not None and include:
+        raise HTTPException(status_code=400, detail="fields cannot be combined with include")
+
+    async def load_rows():
+        return await get_projects_db(db, skip, limit, status, cursor, sort=sort,
+                                     behind_schedule=behind_schedule, columns=columns)
+
+    try:
+        if columns is not None:
+            return await response_cache.respond(
+                request, "projects", f"list:{request.url.query}", row_page_loader(load_rows)
+            )
+        if not include:
+            return await response_cache.respond(
+                request, "projects", f"list:{request.url.query}", page_loader(load_page)
+            )
+        projects, next_cursor = await load_page()
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return [expand(project, include) for project in projects]
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Database error occurred")
 
-@router.get("/{project_id}", response_model=Project)
+@router.get("/over-budget", response_model=List[ProjectBudget])
+async def get_projects_over_budget(
+    threshold: float = Query(1.0, gt=0, description="Fraction of budget spent, e.g. 0.9 for 90%"),
+    db: AsyncSession = Depends(get_read_db)
+) -> List[ProjectBudget]:
+    try:
+        return await get_projects_over_budget_db(db, threshold)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Database error occurred")
+
+@router.get("/{project_id}", response_model=ProjectWithIncludes, response_model_exclude_unset=True)
 async def get_project(
     project_id: int,
-    db: AsyncSession = Depends(get_db)
-) -> Project:
-    project = await get_project_db(db, project_id)
+    request: Request,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    options = parse_includes(include, PROJECT_INCLUDES)
+    try:
+        if include:
+            project = await get_project_db(db, project_id, options)
+            if project:
+                return expand(project, include)
+        else:
+            project = await response_cache.respond(
+                request, "projects", f"detail:{project_id}",
+                detail_loader(lambda: get_project_db(db, project_id, options))
+            )
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Database error occurred")
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
-@router.put("/{project_id}", response_model=Project)
+@router.put("/{project_id}", response_model=ProjectRead)
 async def update_project(
     project_id: int,
     project_update: ProjectUpdate,
     db: AsyncSession = Depends(get_db)
-) -> Project:
-    project = await update_project_db(db, project_id, project_update)
+) -> dict:
+    try:
+        project = await update_project_db(db, project_id, project_update)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error occurred")
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    await response_cache.invalidate("projects")
+    return project.to_dict()
 
 @router.delete("/{project_id}")
 async def delete_project(
     project_id: int,
     db: AsyncSession = Depends(get_db)
 ) -> dict:
-    deleted = await delete_project_db(db, project_id)
+    try:
+        deleted = await delete_project_db(db, project_id)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error occurred")
     if not deleted:
         raise HTTPException(status_code=404, detail="Project not found")
+    await response_cache.invalidate("projects")
     return {"message": "Project deleted successfully"}
 
 @router.put("/{project_id}/progress", response_model=ProjectProgress)
@@ -74,7 +160,25 @@ async def update_project_progress(
     progress: ProjectProgress,
     db: AsyncSession = Depends(get_db)
 ) -> ProjectProgress:
-    updated_progress = await update_project_progress_db(db, project_id, progress)
+    try:
+        updated_progress = await update_project_progress_db(db, project_id, progress)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Database error occurred")
     if not updated_progress:
         raise HTTPException(status_code=404, detail="Project not found")
-    return updated_progress
\ No newline at end of file
+    await response_cache.invalidate("projects")
+    return updated_progress
+
+@router.get("/{project_id}/budget", response_model=ProjectBudget)
+async def get_project_budget(
+    project_id: int,
+    db: AsyncSession = Depends(get_read_db)
+) -> ProjectBudget:
+    try:
+        budget = await get_project_budget_db(db, project_id)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    if not budget:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return budget
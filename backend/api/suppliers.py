@@ -0,0 +1,115 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..models.supplier import PriceComparison, Supplier, SupplierCreate, SupplierPriceBatch
+from ..database import get_db
+from ..replicas import get_read_db
+from ..pagination import NEXT_CURSOR_HEADER, finalize_page, paginate
+from ..auth import get_current_user
+from ..response_cache import response_cache
+from ..services.supplier_price_service import (
+    get_price_comparison_db,
+    get_price_comparisons_db,
+    get_price_history_db,
+    record_prices_db
+)
+from .materials import availability_cache
+
+router = APIRouter()
+
+@router.get("/")
+async def get_suppliers(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    order = (Supplier.id,)
+    try:
+        result = await db.execute(paginate(select(Supplier), order, limit, cursor=cursor))
+        suppliers = finalize_page(result.scalars().all(), order, limit, response)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    return [supplier.to_dict() for supplier in suppliers]
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_supplier(
+    supplier: SupplierCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        db_supplier = Supplier(**supplier.dict())
+        db.add(db_supplier)
+        await db.commit()
+        await db.refresh(db_supplier)
+        return db_supplier.to_dict()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to create supplier")
+
+@router.post("/prices", status_code=status.HTTP_201_CREATED)
+async def record_prices(
+    batch: SupplierPriceBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        sku_count = await record_prices_db(db, batch.prices)
+    except LookupError as e:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail=str(e))
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to record supplier prices")
+    # Materials bought from these suppliers may have taken the new prices.
+    availability_cache.clear()
+    await response_cache.invalidate("materials")
+    return {"recorded": len(batch.prices), "skus": sku_count}
+
+@router.get("/prices/compare", response_model=List[PriceComparison])
+async def compare_prices(
+    response: Response,
+    name: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        comparisons, next_cursor = await get_price_comparisons_db(db, name, limit, cursor)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return comparisons
+
+@router.get("/prices/compare/{sku}", response_model=PriceComparison)
+async def compare_sku_prices(
+    sku: str,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    comparison = await get_price_comparison_db(db, sku)
+    if not comparison:
+        raise HTTPException(status_code=404, detail="No supplier prices recorded for this SKU")
+    return comparison
+
+@router.get("/prices/history/{sku}")
+async def get_price_history(
+    sku: str,
+    supplier_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        return await get_price_history_db(db, sku, supplier_id, since, limit)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail="Database error occurred")
@@ -0,0 +1,53 @@
+from datetime import date
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..models.time_entry import HoursBucket, TimeEntryBatch, TimeEntryBatchResult
+from ..database import get_db
+from ..replicas import get_read_db
+from ..auth import get_current_user
+from ..response_cache import response_cache
+from ..services.time_entry_service import get_hours_db, ingest_time_entries_db
+
+router = APIRouter()
+
+@router.post("/batch", response_model=TimeEntryBatchResult, status_code=status.HTTP_201_CREATED)
+async def ingest_time_entries(
+    batch: TimeEntryBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        result = await ingest_time_entries_db(db, batch.entries)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to record time entries"
+        )
+    await response_cache.invalidate("employees")
+    return result
+
+@router.get("/hours", response_model=List[HoursBucket])
+async def get_hours(
+    granularity: Literal["day", "week"] = "day",
+    group_by: Literal["employee", "project", "department"] = "employee",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    employee_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    department: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        return await get_hours_db(db, granularity, group_by, start, end, employee_id, project_id, department)
+    except SQLAlchemyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred"
+        )
@@ -0,0 +1,57 @@
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+
+from .config import settings
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+def decode_token(token: str) -> dict:
+    """Verify a bearer token (e.g. a Supabase access token) and return its claims."""
+    if not settings.JWT_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Authentication is not configured"
+        )
+    try:
+        return jwt.decode(
+            token,
+            settings.JWT_SECRET,
+            algorithms=[settings.JWT_ALGORITHM],
+            audience=settings.JWT_AUDIENCE,
+            options={"verify_aud": settings.JWT_AUDIENCE is not None}
+        )
+    except JWTError:
+        raise _unauthorized("Invalid or expired token")
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> dict:
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+    return decode_token(credentials.credentials)
+
+
+class JWTBearer(HTTPBearer):
+    """Router-level guard: `APIRouter(dependencies=[Depends(JWTBearer())])`."""
+
+    def __init__(self):
+        super().__init__(auto_error=False)
+
+    async def __call__(self, request: Request) -> dict:
+        credentials = await super().__call__(request)
+        if credentials is None:
+            raise _unauthorized("Not authenticated")
+        return decode_token(credentials.credentials)
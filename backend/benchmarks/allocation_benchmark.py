@@ -0,0 +1,69 @@
+"""Compare interval-index overlap lookups with a linear scan of every booking.
+
+Builds ``--bookings`` synthetic crew bookings (100k by default), spread over
+``--employees`` people and five years, then checks ``--proposals`` proposed
+assignments for double-booking. Everything runs in memory, the same way
+``check_schedule_db`` does once a proposal's bookings are loaded:
+
+* scan: compare each proposal with every booking of its employee
+* index: one ``IntervalIndex`` per employee, queried per proposal
+
+    python -m backend.benchmarks.allocation_benchmark --bookings 100000 --proposals 500
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from ..intervals import IntervalIndex
+
+EPOCH = datetime(2025, 1, 1)
+
+
+def _booking(rng: random.Random) -> tuple:
+    start = EPOCH + timedelta(days=rng.randrange(5 * 365))
+    return start, start + timedelta(days=rng.randint(1, 120))
+
+
+def run(bookings: int, employees: int, proposals: int, seed: int) -> None:
+    rng = random.Random(seed)
+    by_employee = defaultdict(list)
+    for project_id in range(bookings):
+        start, end = _booking(rng)
+        by_employee[rng.randrange(employees)].append((start, end, project_id))
+    proposed = [(rng.randrange(employees), *_booking(rng)) for _ in range(proposals)]
+
+    started = time.perf_counter()
+    scanned = [
+        sum(1 for start, end, _ in by_employee[employee] if start < until and end > since)
+        for employee, since, until in proposed
+    ]
+    scan_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    indexes = {employee: IntervalIndex(booked) for employee, booked in by_employee.items()}
+    build_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    indexed = [
+        sum(1 for _ in indexes[employee].overlapping(since, until)) if employee in indexes else 0
+        for employee, since, until in proposed
+    ]
+    query_ms = (time.perf_counter() - started) * 1000
+
+    assert scanned == indexed, "index and scan disagree"
+    print(f"{'path':>12} {'ms':>10}")
+    print(f"{'scan':>12} {scan_ms:>10.2f}")
+    print(f"{'index build':>12} {build_ms:>10.2f}")
+    print(f"{'index query':>12} {query_ms:>10.2f}")
+    print(f"{sum(1 for count in indexed if count)} of {proposals} proposals double-book someone")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--employees", type=int, default=50)
+    parser.add_argument("--proposals", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    run(args.bookings, args.employees, args.proposals, args.seed)
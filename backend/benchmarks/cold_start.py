@@ -0,0 +1,88 @@
+"""Measure worker cold start: app import time and time to first response.
+
+Each round starts a fresh interpreter, so nothing is cached in-process.
+``import`` is the time to import ``backend.main``. ``first response`` is the
+time from spawning ``uvicorn backend.main:app`` to a 200 from ``/``, which
+includes lifespan startup. Run it from any directory; no schema work happens
+at boot unless ``DB_AUTO_CREATE`` is set.
+
+    python -m backend.benchmarks.cold_start --rounds 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import backend.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _env() -> dict:
+    env = dict(os.environ, LOW_STOCK_CHECK_INTERVAL="0")
+    env.setdefault("DB_AUTO_CREATE", "false")
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_import() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=REPO_ROOT, env=_env(),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def time_first_response(timeout: float) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT, env=_env(),
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/", timeout=0.5).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with code {server.returncode}")
+            time.sleep(0.01)
+        raise TimeoutError(f"no response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run(rounds: int, timeout: float) -> None:
+    imports = [time_import() for _ in range(rounds)]
+    first_responses = [time_first_response(timeout) for _ in range(rounds)]
+    print(f"{'phase':>16} {'min ms':>10} {'median ms':>10} {'max ms':>10}")
+    for name, samples in (("import", imports), ("first response", first_responses)):
+        print(
+            f"{name:>16} {min(samples) * 1000:>10.1f} {statistics.median(samples) * 1000:>10.1f} "
+            f"{max(samples) * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    run(args.rounds, args.timeout)
@@ -0,0 +1,72 @@
+"""Compare OFFSET and keyset page latency as the page depth grows.
+
+Seeds a temporary table with ``--rows`` rows (1M by default) on the database
+pointed to by ``DATABASE_URL`` and times fetching page N with both strategies
+through the same ``paginate`` helper the list endpoints use.
+
+    python -m backend.benchmarks.pagination_benchmark --rows 1000000 --limit 100
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, select, text
+
+from ..database import engine
+from ..pagination import encode_cursor, paginate
+
+metadata = MetaData()
+bench_rows = Table(
+    "bench_pagination_rows",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("payload", String),
+)
+
+
+async def seed(conn, rows: int) -> None:
+    await conn.run_sync(metadata.drop_all)
+    await conn.run_sync(metadata.create_all)
+    await conn.execute(text(
+        "INSERT INTO bench_pagination_rows (id, payload) "
+        "SELECT g, md5(g::text) FROM generate_series(1, :rows) AS g"
+    ), {"rows": rows})
+    await conn.execute(text("ANALYZE bench_pagination_rows"))
+
+
+async def time_query(conn, query, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        (await conn.execute(query)).all()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def run(rows: int, limit: int, repeat: int) -> None:
+    order = (bench_rows.c.id,)
+    async with engine.begin() as conn:
+        await seed(conn, rows)
+
+        print(f"{'page':>8} {'offset ms':>12} {'keyset ms':>12}")
+        depth = 1
+        while depth * limit < rows:
+            skip = (depth - 1) * limit
+            offset_ms = await time_query(conn, paginate(select(bench_rows), order, limit, skip=skip), repeat)
+            # The cursor for page N is the id of the last row on page N-1.
+            cursor = encode_cursor([skip]) if skip else None
+            keyset_ms = await time_query(conn, paginate(select(bench_rows), order, limit, cursor=cursor), repeat)
+            print(f"{depth:>8} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+            depth *= 10
+
+        await conn.run_sync(metadata.drop_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.repeat))
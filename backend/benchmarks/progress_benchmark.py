@@ -0,0 +1,87 @@
+"""Compare per-row Python progress with the set-based SQL expression.
+
+Seeds ``--rows`` projects (100k by default) inside a transaction on the
+database pointed to by ``DATABASE_URL``, then times the "behind schedule,
+least progressed first" page both by loading every project and calling
+``calculate_progress`` and through ``get_projects_db``. The seed is rolled
+back afterwards.
+
+    python -m backend.benchmarks.progress_benchmark --rows 100000 --limit 100
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import engine
+from ..models.project import Project
+from ..services.project_service import get_projects_db
+
+
+async def seed(session: AsyncSession, rows: int) -> None:
+    await session.execute(text(
+        "INSERT INTO projects (name, start_date, end_date, budget, progress, status, priority) "
+        "SELECT 'bench ' || g, "
+        "       now() - (g % 700) * interval '1 day', "
+        "       now() + ((g * 7) % 500 - 100) * interval '1 day', "
+        "       100000, (g * 13) % 101, "
+        "       (ARRAY['PENDING', 'IN_PROGRESS', 'COMPLETED'])[g % 3 + 1], 1 "
+        "FROM generate_series(1, :rows) AS g"
+    ), {"rows": rows})
+    await session.execute(text("ANALYZE projects"))
+
+
+async def python_path(session: AsyncSession, limit: int) -> list:
+    projects = (await session.execute(select(Project))).scalars().all()
+    now = datetime.utcnow()
+    behind = []
+    for project in projects:
+        expected = project.calculate_progress(now)
+        if project.status != 'COMPLETED' and project.progress < expected:
+            behind.append((expected, project.id))
+    behind.sort()
+    return [project_id for _, project_id in behind[:limit]]
+
+
+async def sql_path(session: AsyncSession, limit: int) -> list:
+    projects, _ = await get_projects_db(session, limit=limit, sort="computed_progress", behind_schedule=True)
+    return [project.id for project in projects]
+
+
+async def best_of(repeat: int, func, *args) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+async def run(rows: int, limit: int, repeat: int) -> None:
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            session = AsyncSession(bind=conn, expire_on_commit=False)
+            await seed(session, rows)
+            python_ms, python_ids = await best_of(repeat, python_path, session, limit)
+            session.expunge_all()
+            sql_ms, sql_ids = await best_of(repeat, sql_path, session, limit)
+            print(f"{'path':>8} {'ms':>10}")
+            print(f"{'python':>8} {python_ms:>10.2f}")
+            print(f"{'sql':>8} {sql_ms:>10.2f}")
+            print(f"same page: {python_ids == sql_ids}")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.repeat))
@@ -0,0 +1,115 @@
+"""Compare the ORM list path with the column-tuple fast path on large payloads.
+
+Loads ``--rows`` employees (10k by default) into an in-memory SQLite database
+and times both paths end to end, from query to encoded body:
+
+* orm: ``select(Employee)`` -> ``to_dict()`` -> ``json.dumps`` (the path list
+  endpoints take without ``fields=``)
+* pydantic: ORM instances validated through a Pydantic model and encoded with
+  ``model_dump_json``, as a ``response_model=List[...]`` handler would do
+* fast: ``select(*columns)`` -> row dicts -> orjson, as used with ``fields=``
+
+    python -m backend.benchmarks.serialization_benchmark --rows 10000
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.employee import Employee
+from ..models.registry import metadata
+from ..serialization import EMPLOYEE_FIELDS, dumps, parse_fields
+
+
+class EmployeeRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    email: str
+    first_name: str
+    last_name: str
+    role: str
+    department: str
+    status: str
+    hourly_rate: float
+    is_supervisor: Optional[bool] = None
+    supervisor_id: Optional[int] = None
+    org_path: Optional[str] = None
+    performance_score: Optional[float] = None
+    total_hours_worked: Optional[float] = None
+    available_pto: Optional[float] = None
+    last_status_update: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+def seed(session: Session, rows: int) -> None:
+    now = datetime.utcnow()
+    session.execute(insert(Employee), [
+        {
+            "id": i,
+            "email": f"employee{i}@example.com",
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "role": "worker",
+            "department": "site",
+            "hire_date": now,
+            "status": "active",
+            "hourly_rate": 42.5,
+            "org_path": f"/1/{i}/",
+            "last_status_update": now,
+            "updated_at": now,
+        }
+        for i in range(1, rows + 1)
+    ])
+    session.commit()
+
+
+def orm_path(session: Session) -> bytes:
+    employees = session.execute(select(Employee)).scalars().all()
+    return json.dumps([employee.to_dict() for employee in employees]).encode()
+
+
+def pydantic_path(session: Session) -> bytes:
+    employees = session.execute(select(Employee)).scalars().all()
+    adapter = TypeAdapter(List[EmployeeRead])
+    return adapter.dump_json(adapter.validate_python(employees, from_attributes=True))
+
+
+def fast_path(session: Session) -> bytes:
+    columns = parse_fields(",".join(EMPLOYEE_FIELDS), Employee, EMPLOYEE_FIELDS)
+    return dumps([row._asdict() for row in session.execute(select(*columns))])
+
+
+def best_of(repeat: int, func, session: Session) -> tuple:
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        # Start each run with an empty identity map so the ORM paths pay for hydration.
+        session.expunge_all()
+        started = time.perf_counter()
+        body = func(session)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, len(body)
+
+
+def run(rows: int, repeat: int) -> None:
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine, tables=[Employee.__table__])
+    with Session(engine) as session:
+        seed(session, rows)
+        print(f"{'path':>10} {'ms':>10} {'bytes':>12}")
+        for name, func in (("orm", orm_path), ("pydantic", pydantic_path), ("fast", fast_path)):
+            elapsed, size = best_of(repeat, func, session)
+            print(f"{name:>10} {elapsed:>10.2f} {size:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
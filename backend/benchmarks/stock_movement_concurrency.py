@@ -0,0 +1,72 @@
+"""Check that parallel stock-movement batches never lose updates.
+
+Creates a handful of throwaway materials on the database pointed to by
+``DATABASE_URL``, fires ``--workers`` concurrent batches of +1 deltas at them
+through ``apply_stock_movements_db`` and verifies the final quantities.
+
+    python -m backend.benchmarks.stock_movement_concurrency --workers 50 --rounds 20
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+from sqlalchemy import delete, select
+
+from ..database import AsyncSessionLocal, engine
+from ..models.material import Material, StockMovement, StockMovementCreate
+from ..services.stock_service import apply_stock_movements_db
+
+
+async def seed(count: int) -> list:
+    prefix = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as session:
+        materials = [
+            Material(name=f"bench {i}", sku=f"BENCH-{prefix}-{i}", unit="ea", price_per_unit=1.0, quantity=0)
+            for i in range(count)
+        ]
+        session.add_all(materials)
+        await session.commit()
+        return [material.id for material in materials]
+
+
+async def worker(material_ids: list, rounds: int) -> None:
+    for _ in range(rounds):
+        async with AsyncSessionLocal() as session:
+            await apply_stock_movements_db(session, [
+                StockMovementCreate(material_id=material_id, delta=1, reason="concurrency check")
+                for material_id in material_ids
+            ])
+
+
+async def run(materials: int, workers: int, rounds: int) -> bool:
+    material_ids = await seed(materials)
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(material_ids, rounds) for _ in range(workers)))
+        elapsed = time.perf_counter() - started
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(Material.quantity).filter(Material.id.in_(material_ids)))
+            quantities = result.scalars().all()
+
+        expected = workers * rounds
+        ok = all(quantity == expected for quantity in quantities)
+        print(f"{workers * rounds} batches in {elapsed:.2f}s; expected {expected}, got {sorted(set(quantities))}")
+        return ok
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(StockMovement).filter(StockMovement.material_id.in_(material_ids)))
+            await session.execute(delete(Material).filter(Material.id.in_(material_ids)))
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--materials", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run(args.materials, args.workers, args.rounds)) else 1)
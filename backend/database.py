@@ -0,0 +1,47 @@
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from .config import settings
+from .instrumentation import TimedQueuePool
+
+
+def create_engine_from_settings(url: Optional[str] = None) -> AsyncEngine:
+    url = url or settings.DATABASE_URL
+    engine_kwargs = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if not url.startswith("sqlite"):
+        engine_kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+        if settings.DB_METRICS_ENABLED:
+            engine_kwargs["poolclass"] = TimedQueuePool
+    return create_async_engine(url, **engine_kwargs)
+
+
+engine = create_engine_from_settings()
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+def dialect_insert(dialect_name: str):
+    """Return the `insert` construct that supports ON CONFLICT for this dialect."""
+    return sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input matches literally; use with a backslash `escape`."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+from typing import Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models.employee import Employee
+
+logger = logging.getLogger(__name__)
+
+# Comment lines sent on idle event streams so proxies keep them open.
+STREAM_KEEPALIVE_SECONDS = 15
+# Bounds of the exponential backoff between Redis resubscribe attempts.
+LISTEN_RETRY_MIN_SECONDS = 0.5
+LISTEN_RETRY_MAX_SECONDS = 30.0
+
+
+class EventBroadcaster:
+    """Fans events on one channel out to every open stream.
+
+    Events are relayed through Redis pub/sub when `REDIS_URL` is set so that
+    streams on one worker see events published on another; otherwise they
+    stay in-process. A dropped Redis subscription is retried with backoff;
+    events published while it is down are not replayed.
+    """
+
+    def __init__(self, channel: str, redis_url: Optional[str] = None, queue_size: int = 1000):
+        self.channel = channel
+        self.redis_url = redis_url
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+        # The loop holds tasks weakly, so in-flight publishes are kept here.
+        self._publishing: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if not self.redis_url:
+            return
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(self.redis_url)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        if self._publishing:
+            await asyncio.gather(*self._publishing, return_exceptions=True)
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, payload: dict) -> None:
+        if self._redis:
+            task = asyncio.get_running_loop().create_task(
+                self._redis.publish(self.channel, json.dumps(payload))
+            )
+            self._publishing.add(task)
+            task.add_done_callback(self._published)
+        else:
+            self._fan_out(payload)
+
+    def _published(self, task: asyncio.Task) -> None:
+        self._publishing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Could not publish to %s: %s", self.channel, task.exception())
+
+    def _fan_out(self, payload: dict) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                # Slow consumer: drop its oldest event rather than block publishers.
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    async def _listen(self) -> None:
+        delay = LISTEN_RETRY_MIN_SECONDS
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                delay = LISTEN_RETRY_MIN_SECONDS
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._fan_out(json.loads(message["data"]))
+            except Exception as e:
+                logger.warning("Lost the %s subscription (%s); retrying in %.1fs", self.channel, e, delay)
+            finally:
+                await pubsub.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, LISTEN_RETRY_MAX_SECONDS)
+
+
+status_broadcaster = EventBroadcaster("employee-status", settings.REDIS_URL)
+stock_alert_broadcaster = EventBroadcaster("low-stock-alerts", settings.REDIS_URL)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_status_changes(session: Session, flush_context) -> None:
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Employee) and inspect(obj).attrs.status.history.has_changes():
+            session.info.setdefault("status_changes", {})[obj.id] = {
+                "id": obj.id,
+                "status": obj.status,
+                "last_status_update": obj.last_status_update.isoformat() if obj.last_status_update else None,
+            }
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_status_changes(session: Session) -> None:
+    for payload in session.info.pop("status_changes", {}).values():
+        status_broadcaster.publish(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_status_changes(session: Session) -> None:
+    session.info.pop("status_changes", None)
@@ -0,0 +1,34 @@
+"""Production profile: `gunicorn -c backend/gunicorn.conf.py backend.main:app`.
+
+The app is imported once in the master and forked into the workers. Engine
+and client objects are created at import, but none of them opens a
+connection until first use, and each worker discards any inherited pool
+state after the fork. Run `python -m backend.manage init-db` before starting
+the workers; they never create or introspect the schema themselves.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+# UvicornWorker picks uvloop and httptools automatically when they are installed.
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").strip().lower() in ("1", "true", "yes", "on")
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+
+def post_fork(server, worker):
+    from backend.database import engine
+    from backend.replicas import replica_router
+
+    # Never share pooled connections with the master or sibling workers.
+    for worker_engine in (engine, *replica_router.replicas):
+        worker_engine.sync_engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,171 @@
+import logging
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class RequestDbStats:
+    __slots__ = ("queries", "query_seconds", "checkout_wait_seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.checkout_wait_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+
+class _Metrics:
+    """Prometheus collectors, created by `setup_instrumentation` when metrics are enabled."""
+
+    def __init__(self) -> None:
+        from prometheus_client import Counter, Histogram
+
+        self.query_seconds = Histogram(
+            "db_query_duration_seconds", "Time spent executing a single SQL statement"
+        )
+        self.checkout_wait = Histogram(
+            "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+            buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+        )
+        self.slow_queries = Counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS")
+        self.request_queries = Histogram(
+            "http_request_db_queries", "SQL statements executed per request", ["method", "handler"],
+            buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+        )
+        self.request_db_seconds = Histogram(
+            "http_request_db_seconds", "Time spent in SQL per request", ["method", "handler"]
+        )
+
+
+_metrics: Optional[_Metrics] = None
+
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|(?<![:\w]):[A-Za-z_]\w*")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_GROUP = re.compile(r"(\(\?\.\.\.\)|\(\?\))(?:\s*,\s*\1)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Reduce a statement to its shape so identical queries group together in the log."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _LITERAL.sub("?", statement)
+    statement = _LIST.sub("(?...)", statement)
+    return _REPEATED_GROUP.sub(r"\1, ...", statement)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.checkout_wait_seconds += waited
+            if _metrics is not None:
+                _metrics.checkout_wait.observe(waited)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+    if _metrics is not None:
+        _metrics.query_seconds.observe(elapsed)
+    if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        if _metrics is not None:
+            _metrics.slow_queries.inc()
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, normalize_sql(statement))
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def _route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class DbTimingMiddleware(BaseHTTPMiddleware):
+    """Collect per-request SQL statistics and report them as metrics and a Server-Timing header."""
+
+    async def dispatch(self, request: Request, call_next):
+        stats = RequestDbStats()
+        token = _request_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            _request_stats.reset(token)
+        response.headers[SERVER_TIMING_HEADER] = (
+            f'db;dur={stats.query_seconds * 1000:.1f};desc="{stats.queries} queries", '
+            f"db-wait;dur={stats.checkout_wait_seconds * 1000:.1f}"
+        )
+        if _metrics is not None:
+            labels = {"method": request.method, "handler": _route_template(request)}
+            _metrics.request_queries.labels(**labels).observe(stats.queries)
+            _metrics.request_db_seconds.labels(**labels).observe(stats.query_seconds)
+        return response
+
+
+def setup_instrumentation(app, *engines: AsyncEngine) -> None:
+    """Wire up whatever the settings enable; cheap enough to leave on in production."""
+    global _metrics
+    if settings.SENTRY_DSN:
+        import sentry_sdk
+
+        sentry_sdk.init(dsn=settings.SENTRY_DSN, traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE)
+
+    if settings.DB_METRICS_ENABLED or settings.SLOW_QUERY_MS:
+        for engine in engines:
+            instrument_engine(engine)
+
+    if settings.METRICS_ENABLED:
+        from prometheus_fastapi_instrumentator import Instrumentator
+
+        if _metrics is None:
+            _metrics = _Metrics()
+        Instrumentator(excluded_handlers=["/metrics"]).instrument(app).expose(
+            app, endpoint="/metrics", include_in_schema=False
+        )
+
+    if settings.DB_METRICS_ENABLED:
+        app.add_middleware(DbTimingMiddleware)
@@ -0,0 +1,54 @@
+from bisect import bisect_left
+from typing import Any, Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalIndex(Generic[T]):
+    """Static index of half-open `[start, end)` intervals.
+
+    Intervals are sorted by start and sit at the leaves of an implicit
+    segment tree that stores the latest end under each node. An overlap
+    query only considers the prefix that starts before the query ends, and
+    skips every subtree whose latest end is at or before the query start,
+    so k matches cost O((k + 1) log n) rather than a scan of every interval.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[Any, Any, T]]) -> None:
+        # Empty intervals cover no instant, so they can never overlap anything.
+        entries = sorted((i for i in intervals if i[0] < i[1]), key=lambda interval: interval[0])
+        self._starts = [start for start, _, _ in entries]
+        self._ends = [end for _, end, _ in entries]
+        self._values = [value for _, _, value in entries]
+        self._size = 1
+        while self._size < len(entries):
+            self._size *= 2
+        # Leaves live at [size, 2 * size); None marks padding past the last interval.
+        self._max_end: List[Any] = [None] * (2 * self._size)
+        self._max_end[self._size:self._size + len(entries)] = self._ends
+        for node in range(self._size - 1, 0, -1):
+            left, right = self._max_end[2 * node], self._max_end[2 * node + 1]
+            self._max_end[node] = left if right is None or (left is not None and left >= right) else right
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlapping(self, start: Any, end: Any) -> Iterator[Tuple[Any, Any, T]]:
+        """Yield `(start, end, value)` for intervals sharing any instant with `[start, end)`."""
+        if not self._starts or start >= end:
+            return
+        limit = bisect_left(self._starts, end)
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit:
+                continue
+            latest = self._max_end[node]
+            if latest is None or latest <= start:
+                continue
+            if high - low == 1:
+                yield self._starts[low], self._ends[low], self._values[low]
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
@@ -0,0 +1,61 @@
+from typing import Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from .models.employee import Employee
+from .models.material import Material, ProjectMaterial
+from .models.project import Project
+
+# Relationships each resource can expand with `?include=a,b`. Collections use
+# selectinload (one extra query per relationship, not per row); to-one
+# relationships are joined into the main query.
+EMPLOYEE_INCLUDES: Dict[str, Callable] = {
+    "projects": lambda: selectinload(Employee.projects),
+    "supervisor": lambda: joinedload(Employee.supervisor),
+    "supervised_employees": lambda: selectinload(Employee.supervised_employees),
+}
+
+PROJECT_INCLUDES: Dict[str, Callable] = {
+    "employees": lambda: selectinload(Project.employees),
+    "materials": lambda: selectinload(Project.materials),
+    "project_materials": lambda: selectinload(Project.project_materials).joinedload(ProjectMaterial.material),
+}
+
+MATERIAL_INCLUDES: Dict[str, Callable] = {
+    "project_materials": lambda: selectinload(Material.project_materials),
+    "supplier": lambda: joinedload(Material.supplier),
+}
+
+
+def _requested(include: Optional[str]) -> List[str]:
+    return list(dict.fromkeys(name.strip() for name in include.split(",") if name.strip())) if include else []
+
+
+def parse_includes(include: Optional[str], available: Dict[str, Callable]) -> List:
+    """Turn an `include` query value into loader options.
+
+    Anything not requested is set to raise on access, so a serializer that
+    touches an unloaded relationship fails loudly instead of issuing N+1 lazy
+    loads.
+    """
+    requested = _requested(include)
+    unknown = sorted(set(requested) - available.keys())
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include: {', '.join(unknown)}. Available: {', '.join(sorted(available))}"
+        )
+    return [available[name]() for name in requested] + [raiseload("*")]
+
+
+def expand(row, include: Optional[str]) -> dict:
+    """`row.to_dict()` plus the relationships loaded by `parse_includes(include, ...)`."""
+    data = row.to_dict()
+    for name in _requested(include):
+        related = getattr(row, name)
+        if isinstance(related, list):
+            data[name] = [item.to_dict() for item in related]
+        else:
+            data[name] = related.to_dict() if related is not None else None
+    return data
@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+
+from .database import AsyncSessionLocal, engine
+from .schema import init_schema
+from .services.org_service import rebuild_org_paths
+from .services.performance_service import rebuild_performance_rollups
+from .services.project_cost_service import rebuild_project_costs
+from .services.supplier_price_service import rebuild_price_comparisons
+
+
+async def _rebuild_performance_rollups() -> None:
+    async with AsyncSessionLocal() as session:
+        count = await rebuild_performance_rollups(session)
+    print(f"Rebuilt performance rollups for {count} employees")
+
+
+async def _rebuild_org_paths() -> None:
+    async with AsyncSessionLocal() as session:
+        count = await rebuild_org_paths(session)
+    print(f"Rebuilt org paths for {count} employees")
+
+
+async def _rebuild_project_costs() -> None:
+    async with AsyncSessionLocal() as session:
+        count = await rebuild_project_costs(session)
+    print(f"Rebuilt cost rollups for {count} projects")
+
+
+async def _rebuild_price_comparisons() -> None:
+    async with AsyncSessionLocal() as session:
+        count = await rebuild_price_comparisons(session)
+    print(f"Rebuilt price comparisons for {count} SKUs")
+
+
+async def _init_db() -> None:
+    await init_schema()
+    print("Database schema is at head")
+
+
+COMMANDS = {
+    "init-db": _init_db,
+    "rebuild-org-paths": _rebuild_org_paths,
+    "rebuild-performance-rollups": _rebuild_performance_rollups,
+    "rebuild-project-costs": _rebuild_project_costs,
+    "rebuild-price-comparisons": _rebuild_price_comparisons,
+}
+
+
+async def _run(command: str) -> None:
+    try:
+        await COMMANDS[command]()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Construction Management maintenance commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+    asyncio.run(_run(args.command))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""trigram search indexes on materials
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for column in ("name", "sku", "description"):
+            op.create_index(
+                f"ix_materials_{column}_trgm",
+                "materials",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for column in ("name", "sku", "description"):
+            op.drop_index(
+                f"ix_materials_{column}_trgm",
+                table_name="materials",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,33 @@
+"""composite index for material availability
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_materials_quantity_id",
+            "materials",
+            ["quantity", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_materials_quantity_id",
+            table_name="materials",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
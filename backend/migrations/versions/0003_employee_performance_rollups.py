@@ -0,0 +1,39 @@
+"""employee performance rollup tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "employee_performance_summaries",
+        sa.Column("employee_id", sa.Integer, sa.ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("total_hours_worked", sa.Float, nullable=False, server_default="0"),
+        sa.Column("current_score", sa.Float),
+        sa.Column("previous_score", sa.Float),
+        sa.Column("score_updates", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "employee_performance_periods",
+        sa.Column("employee_id", sa.Integer, sa.ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("period_start", sa.Date, primary_key=True),
+        sa.Column("hours_worked", sa.Float, nullable=False, server_default="0"),
+        sa.Column("score_sum", sa.Float, nullable=False, server_default="0"),
+        sa.Column("score_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("employee_performance_periods")
+    op.drop_table("employee_performance_summaries")
@@ -0,0 +1,50 @@
+"""time-entry ledger with daily and weekly buckets
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def _bucket_table(name: str) -> None:
+    op.create_table(
+        name,
+        sa.Column("bucket", sa.Date, primary_key=True),
+        sa.Column("employee_id", sa.Integer, primary_key=True),
+        sa.Column("project_id", sa.Integer, primary_key=True, server_default="0"),
+        sa.Column("department", sa.String, nullable=False),
+        sa.Column("hours", sa.Float, nullable=False, server_default="0"),
+        sa.Column("entries", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.create_index(f"ix_{name}_project", name, ["project_id", "bucket"])
+    op.create_index(f"ix_{name}_department", name, ["department", "bucket"])
+
+
+def upgrade() -> None:
+    op.create_table(
+        "time_entries",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("employee_id", sa.Integer, sa.ForeignKey("employees.id"), nullable=False),
+        sa.Column("project_id", sa.Integer, sa.ForeignKey("projects.id")),
+        sa.Column("department", sa.String, nullable=False),
+        sa.Column("clock_in", sa.DateTime, nullable=False),
+        sa.Column("clock_out", sa.DateTime),
+        sa.Column("hours", sa.Float, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_time_entries_employee_clock_in", "time_entries", ["employee_id", "clock_in"])
+    _bucket_table("time_entry_daily")
+    _bucket_table("time_entry_weekly")
+
+
+def downgrade() -> None:
+    op.drop_table("time_entry_weekly")
+    op.drop_table("time_entry_daily")
+    op.drop_table("time_entries")
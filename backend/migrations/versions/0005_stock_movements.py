@@ -0,0 +1,31 @@
+"""stock movement log
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stock_movements",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("material_id", sa.Integer, sa.ForeignKey("materials.id"), nullable=False),
+        sa.Column("project_id", sa.Integer, sa.ForeignKey("projects.id")),
+        sa.Column("delta", sa.Float, nullable=False),
+        sa.Column("quantity_after", sa.Float, nullable=False),
+        sa.Column("reason", sa.String(255)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_stock_movements_material_created", "stock_movements", ["material_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("stock_movements")
@@ -0,0 +1,43 @@
+"""partial low-stock index and alert state
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_materials_low_stock",
+            "materials",
+            ["id"],
+            postgresql_where=sa.text("quantity <= min_quantity"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.create_table(
+        "material_stock_alerts",
+        sa.Column("material_id", sa.Integer, sa.ForeignKey("materials.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("quantity", sa.Float, nullable=False),
+        sa.Column("min_quantity", sa.Float, nullable=False),
+        sa.Column("alerted_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("material_stock_alerts")
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_materials_low_stock",
+            table_name="materials",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,41 @@
+"""employee org paths and supervisor index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("employees", sa.Column("org_path", sa.String))
+    op.create_index("ix_employees_supervisor_id", "employees", ["supervisor_id"])
+    op.create_index(
+        "ix_employees_org_path",
+        "employees",
+        ["org_path"],
+        postgresql_ops={"org_path": "text_pattern_ops"},
+    )
+    op.execute("""
+        WITH RECURSIVE org_tree(id, path, depth) AS (
+            SELECT id, '/' || id || '/', 0 FROM employees WHERE supervisor_id IS NULL
+            UNION ALL
+            SELECT e.id, t.path || e.id || '/', t.depth + 1
+            FROM employees e JOIN org_tree t ON e.supervisor_id = t.id
+            WHERE t.depth < 100
+        )
+        UPDATE employees SET org_path = org_tree.path
+        FROM org_tree WHERE employees.id = org_tree.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employees_org_path", table_name="employees")
+    op.drop_index("ix_employees_supervisor_id", table_name="employees")
+    op.drop_column("employees", "org_path")
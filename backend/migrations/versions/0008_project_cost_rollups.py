@@ -0,0 +1,29 @@
+"""project cost rollups
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_costs",
+        sa.Column("project_id", sa.Integer, sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("material_cost", sa.Float, nullable=False, server_default="0"),
+        sa.Column("labour_cost", sa.Float, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    op.create_index("ix_project_materials_project_id", "project_materials", ["project_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_project_materials_project_id", table_name="project_materials")
+    op.drop_table("project_costs")
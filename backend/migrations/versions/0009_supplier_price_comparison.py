@@ -0,0 +1,76 @@
+"""suppliers, price history and precomputed price comparisons
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "suppliers",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("contact_email", sa.String(255)),
+        sa.Column("phone", sa.String(50)),
+        sa.Column("is_active", sa.Boolean, server_default=sa.true()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "supplier_price_history",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("supplier_id", sa.Integer, sa.ForeignKey("suppliers.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("sku", sa.String(50), nullable=False),
+        sa.Column("material_name", sa.String(255), nullable=False),
+        sa.Column("price_per_unit", sa.Float, nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_supplier_price_history_sku_supplier_recorded",
+        "supplier_price_history",
+        ["sku", "supplier_id", "recorded_at"],
+    )
+    op.create_table(
+        "supplier_price_summaries",
+        sa.Column("sku", sa.String(50), primary_key=True),
+        sa.Column("supplier_id", sa.Integer, sa.ForeignKey("suppliers.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("material_name", sa.String(255), nullable=False),
+        sa.Column("current_price", sa.Float, nullable=False),
+        sa.Column("previous_price", sa.Float),
+        sa.Column("min_price", sa.Float, nullable=False),
+        sa.Column("max_price", sa.Float, nullable=False),
+        sa.Column("observations", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("last_recorded", sa.DateTime(timezone=True)),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "material_price_comparisons",
+        sa.Column("sku", sa.String(50), primary_key=True),
+        sa.Column("material_name", sa.String(255), nullable=False),
+        sa.Column("supplier_count", sa.Integer, nullable=False),
+        sa.Column("cheapest_supplier_id", sa.Integer, sa.ForeignKey("suppliers.id", ondelete="SET NULL")),
+        sa.Column("cheapest_price", sa.Float, nullable=False),
+        sa.Column("highest_price", sa.Float, nullable=False),
+        sa.Column("average_price", sa.Float, nullable=False),
+        sa.Column("trend", sa.Float, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_material_price_comparisons_name", "material_price_comparisons", ["material_name"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_material_price_comparisons_name", table_name="material_price_comparisons")
+    op.drop_table("material_price_comparisons")
+    op.drop_table("supplier_price_summaries")
+    op.drop_index("ix_supplier_price_history_sku_supplier_recorded", table_name="supplier_price_history")
+    op.drop_table("supplier_price_history")
+    # suppliers may predate this migration; leave it in place.
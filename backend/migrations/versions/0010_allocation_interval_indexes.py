@@ -0,0 +1,44 @@
+"""interval and lookup indexes for crew and material allocation
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+# Must match `Project.period` exactly for the planner to use it.
+PROJECT_PERIOD = "tsrange(start_date, CASE WHEN (end_date < start_date) THEN start_date ELSE end_date END)"
+
+LOOKUP_INDEXES = (
+    ("ix_project_employee_employee_project", "project_employee", ["employee_id", "project_id"]),
+    ("ix_project_material_material_project", "project_material", ["material_id", "project_id"]),
+    ("ix_project_materials_material_project", "project_materials", ["material_id", "project_id"]),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in LOOKUP_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        if op.get_bind().dialect.name == "postgresql":
+            op.create_index(
+                "ix_projects_period",
+                "projects",
+                [sa.text(PROJECT_PERIOD)],
+                postgresql_using="gist",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_projects_period", table_name="projects", postgresql_concurrently=True, if_exists=True)
+        for name, table, _ in LOOKUP_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,53 @@
+"""trigram index for price comparison name search
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # `material_name ILIKE '%...%'` cannot use the btree index; the trigram one replaces it.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_material_price_comparisons_name_trgm",
+            "material_price_comparisons",
+            ["material_name"],
+            postgresql_using="gin",
+            postgresql_ops={"material_name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_material_price_comparisons_name",
+            table_name="material_price_comparisons",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_material_price_comparisons_name",
+            "material_price_comparisons",
+            ["material_name"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_material_price_comparisons_name_trgm",
+            table_name="material_price_comparisons",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,40 @@
+"""delete stock movements with their material
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite does not enforce foreign keys unless asked to, so only Postgres needs the change.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_constraint("stock_movements_material_id_fkey", "stock_movements", type_="foreignkey")
+    op.create_foreign_key(
+        "stock_movements_material_id_fkey",
+        "stock_movements",
+        "materials",
+        ["material_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_constraint("stock_movements_material_id_fkey", "stock_movements", type_="foreignkey")
+    op.create_foreign_key(
+        "stock_movements_material_id_fkey",
+        "stock_movements",
+        "materials",
+        ["material_id"],
+        ["id"],
+    )
@@ -0,0 +1,40 @@
+"""direct hours on performance periods
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "employee_performance_periods",
+        sa.Column("direct_hours", sa.Float, nullable=False, server_default="0"),
+    )
+    # Until now a period held its direct hours plus its ledger bucket, so the
+    # difference is what was recorded directly.
+    op.execute(
+        "UPDATE employee_performance_periods SET direct_hours = CASE "
+        "WHEN hours_worked > ledger.hours THEN hours_worked - ledger.hours ELSE 0 END "
+        "FROM (SELECT employee_id, bucket, SUM(hours) AS hours FROM time_entry_weekly "
+        "GROUP BY employee_id, bucket) AS ledger "
+        "WHERE ledger.employee_id = employee_performance_periods.employee_id "
+        "AND ledger.bucket = employee_performance_periods.period_start"
+    )
+    op.execute(
+        "UPDATE employee_performance_periods SET direct_hours = hours_worked "
+        "WHERE NOT EXISTS (SELECT 1 FROM time_entry_weekly AS ledger "
+        "WHERE ledger.employee_id = employee_performance_periods.employee_id "
+        "AND ledger.bucket = employee_performance_periods.period_start)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("employee_performance_periods", "direct_hours")
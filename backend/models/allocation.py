@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from .base import naive_utc
+
+
+class AvailableEmployee(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    role: str
+    department: str
+
+
+class MaterialOvercommit(BaseModel):
+    """A stretch of time in which overlapping projects need more than is in stock."""
+
+    material_id: int
+    start: datetime
+    end: Optional[datetime] = None
+    peak_demand: float
+    available: float
+    shortfall: float
+    project_ids: List[int]
+
+
+class ProposedAssignment(BaseModel):
+    """Put an employee, or an extra quantity of a material, on a project.
+
+    The booking covers the project's own dates unless `start`/`end` narrow it.
+    """
+
+    project_id: int
+    employee_id: Optional[int] = None
+    material_id: Optional[int] = None
+    quantity: Optional[float] = Field(None, gt=0)
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    # Project dates are naive UTC; normalizing first also lets aware and naive values be compared.
+    _naive_window = field_validator("start", "end")(naive_utc)
+
+    @model_validator(mode="after")
+    def _require_one_resource(self) -> "ProposedAssignment":
+        if (self.employee_id is None) == (self.material_id is None):
+            raise ValueError("Exactly one of employee_id or material_id is required")
+        if self.material_id is not None and self.quantity is None:
+            raise ValueError("quantity is required for material assignments")
+        if self.start and self.end and self.end < self.start:
+            raise ValueError("end must not be before start")
+        return self
+
+
+class ScheduleProposal(BaseModel):
+    assignments: List[ProposedAssignment] = Field(..., min_length=1, max_length=2000)
+
+
+class AllocationConflict(BaseModel):
+    """An existing project booking, or another proposed assignment (`assignment`), that collides."""
+
+    project_id: int
+    assignment: Optional[int] = None
+    start: datetime
+    end: Optional[datetime] = None
+
+
+class AssignmentCheck(BaseModel):
+    assignment: int
+    ok: bool
+    conflicts: List[AllocationConflict] = []
+    peak_demand: Optional[float] = None
+    available: Optional[float] = None
+
+
+class ScheduleCheck(BaseModel):
+    ok: bool
+    conflicting: int
+    results: List[AssignmentCheck]
@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql.expression import FunctionElement
+
+Base = declarative_base()
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive UTC, the form plain `DateTime` columns store."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class utc_now(FunctionElement):
+    """The current time as naive UTC, comparable with plain `DateTime` columns."""
+    type = DateTime()
+    inherit_cache = True
+
+
+class whole_days(FunctionElement):
+    """`whole_days(start, end)`: days from start to end, floored like `timedelta.days`."""
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(utc_now)
+def _utc_now(element, compiler, **kw):
+    return "timezone('UTC', now())"
+
+
+@compiles(utc_now, "sqlite")
+def _utc_now_sqlite(element, compiler, **kw):
+    return "datetime('now')"
+
+
+@compiles(whole_days)
+def _whole_days(element, compiler, **kw):
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"floor(extract(epoch from ({end} - {start})) / 86400)"
+
+
+@compiles(whole_days, "sqlite")
+def _whole_days_sqlite(element, compiler, **kw):
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    days = f"(julianday({end}) - julianday({start}))"
+    # SQLite has no floor() without the math extension; CAST truncates toward zero.
+    return f"(CAST({days} AS INTEGER) - ({days} < CAST({days} AS INTEGER)))"
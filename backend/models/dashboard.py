@@ -0,0 +1,32 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class EmployeeSummary(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_department: Dict[str, int]
+
+
+class ProjectStatusSummary(BaseModel):
+    count: int
+    average_progress: float
+
+
+class ProjectSummary(BaseModel):
+    total: int
+    by_status: Dict[str, ProjectStatusSummary]
+
+
+class MaterialSummary(BaseModel):
+    total: int
+    total_inventory_value: float
+    low_stock: int
+    out_of_stock: int
+
+
+class DashboardSummary(BaseModel):
+    employees: EmployeeSummary
+    projects: ProjectSummary
+    materials: MaterialSummary
@@ -1,13 +1,17 @@
-from datetime import datetime
-from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey, Index
+from sqlalchemy.orm import backref, relationship
 
-Base = declarative_base()
+from .base import Base
 
 class Employee(Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        # text_pattern_ops lets `org_path LIKE '/1/5/%'` use the index.
+        Index("ix_employees_org_path", "org_path", postgresql_ops={"org_path": "text_pattern_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -19,7 +23,9 @@ class Employee(Base):
     status = Column(String, default="active", nullable=False)
     hourly_rate = Column(Float, nullable=False)
     is_supervisor = Column(Boolean, default=False)
-    supervisor_id = Column(Integer, ForeignKey("employees.id"), nullable=True)
+    supervisor_id = Column(Integer, ForeignKey("employees.id"), nullable=True, index=True)
+    # Materialized chain of command, e.g. "/1/5/23/"; maintained by services.org_service.
+    org_path = Column(String)
     last_status_update = Column(DateTime, default=datetime.utcnow)
     performance_score = Column(Float, default=0.0)
     total_hours_worked = Column(Float, default=0.0)
@@ -29,11 +35,9 @@ class Employee(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    projects = relationship("Project", secondary="employee_projects", back_populates="employees")
-    supervised_employees = relationship("Employee", 
-                                     backref="supervisor",
-                                     remote_side=[id],
-                                     uselist=True)
+    projects = relationship("Project", secondary="project_employee", back_populates="employees")
+    supervised_employees = relationship("Employee",
+                                     backref=backref("supervisor", remote_side=[id]))
 
     def update_status(self, new_status: str) -> None:
         self.status = new_status
@@ -42,15 +46,23 @@ class Employee(Base):
     def update_performance_score(self, score: float) -> None:
         if 0 <= score <= 100:
             self.performance_score = score
+            self._record_performance_event(score=score)
         else:
             raise ValueError("Performance score must be between 0 and 100")
 
     def add_hours_worked(self, hours: float) -> None:
         if hours > 0:
             self.total_hours_worked += hours
+            self._record_performance_event(hours=hours)
         else:
             raise ValueError("Hours worked must be positive")
 
+    def _record_performance_event(self, **event) -> None:
+        # Drained by the performance rollup hook when the session flushes.
+        if "_pending_performance" not in self.__dict__:
+            self.__dict__["_pending_performance"] = []
+        self.__dict__["_pending_performance"].append(event)
+
     def adjust_pto(self, hours: float) -> None:
         new_balance = self.available_pto + hours
         if new_balance >= 0:
@@ -70,8 +82,98 @@ class Employee(Base):
             "hourly_rate": self.hourly_rate,
             "is_supervisor": self.is_supervisor,
             "supervisor_id": self.supervisor_id,
+            "org_path": self.org_path,
             "performance_score": self.performance_score,
             "total_hours_worked": self.total_hours_worked,
             "available_pto": self.available_pto,
-            "last_status_update": self.last_status_update.isoformat() if self.last_status_update else None
-        }
\ No newline at end of file
+            "last_status_update": self.last_status_update.isoformat() if self.last_status_update else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class EmployeeCreate(BaseModel):
+    email: str = Field(..., min_length=3)
+    first_name: str = Field(..., min_length=1)
+    last_name: str = Field(..., min_length=1)
+    role: str
+    department: str
+    hourly_rate: float = Field(..., ge=0)
+    hire_date: Optional[datetime] = None
+    status: str = "active"
+    is_supervisor: bool = False
+    supervisor_id: Optional[int] = None
+    phone_number: Optional[str] = None
+    emergency_contact: Optional[str] = None
+
+
+class EmployeeUpdate(BaseModel):
+    email: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: Optional[str] = None
+    department: Optional[str] = None
+    hourly_rate: Optional[float] = Field(None, ge=0)
+    status: Optional[str] = None
+    is_supervisor: Optional[bool] = None
+    supervisor_id: Optional[int] = None
+    phone_number: Optional[str] = None
+    emergency_contact: Optional[str] = None
+
+
+class EmployeeRead(BaseModel):
+    """Response shape of `Employee.to_dict()`."""
+
+    id: int
+    email: str
+    first_name: str
+    last_name: str
+    role: str
+    department: str
+    status: str
+    hourly_rate: float
+    is_supervisor: Optional[bool] = None
+    supervisor_id: Optional[int] = None
+    org_path: Optional[str] = None
+    performance_score: Optional[float] = None
+    total_hours_worked: Optional[float] = None
+    available_pto: Optional[float] = None
+    last_status_update: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class EmployeeWithIncludes(EmployeeRead):
+    """`EmployeeRead` plus whichever relationships were requested with `include=`."""
+
+    projects: Optional[List[Dict[str, Any]]] = None
+    supervisor: Optional[Dict[str, Any]] = None
+    supervised_employees: Optional[List[Dict[str, Any]]] = None
+
+
+class EmployeeStatus(BaseModel):
+    id: int
+    status: str
+    last_status_update: Optional[datetime] = None
+
+
+class TeamRollup(BaseModel):
+    employee_id: int
+    headcount: int
+    total_hours_worked: float
+    average_performance: Optional[float] = None
+    max_depth: int
+
+
+class PerformancePeriod(BaseModel):
+    period_start: date
+    hours_worked: float
+    utilization: float
+    average_score: float
+
+
+class EmployeePerformance(BaseModel):
+    employee_id: int
+    total_hours_worked: float
+    performance_score: Optional[float] = None
+    score_trend: float = 0.0
+    utilization: float = 0.0
+    periods: List[PerformancePeriod] = []
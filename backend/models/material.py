@@ -1,13 +1,28 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-from typing import Optional, List
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.sql import func, text
+from typing import Any, Dict, Optional, List
+from pydantic import BaseModel, Field, model_validator
 
 from .base import Base
+from .supplier import Supplier  # noqa: F401  (target of Material.supplier)
 
 
 class Material(Base):
     __tablename__ = "materials"
+    __table_args__ = (
+        Index("ix_materials_quantity_id", "quantity", "id"),
+        # Must match `Material.is_low_stock` exactly for the planner to use it.
+        Index("ix_materials_low_stock", "id", postgresql_where=text("quantity <= min_quantity")),
+        # Trigram indexes from migration 0001, declared here so a fresh schema matches head.
+        *(
+            Index(f"ix_materials_{column}_trgm", column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+            for column in ("name", "sku", "description")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -27,16 +42,43 @@ class Material(Base):
     supplier = relationship("Supplier", back_populates="materials")
     project_materials = relationship("ProjectMaterial", back_populates="material")
 
-    def check_low_stock(self) -> bool:
+    @hybrid_property
+    def is_low_stock(self) -> bool:
         return self.quantity <= self.min_quantity
 
-    def update_quantity(self, amount: float) -> None:
-        self.quantity = max(0, self.quantity + amount)
-        self.last_updated = func.now()
+    def check_low_stock(self) -> bool:
+        return self.is_low_stock
 
-    def calculate_total_value(self) -> float:
+    async def update_quantity(self, db: AsyncSession, amount: float) -> "Material":
+        """Apply `amount` to stock; a thin wrapper over `stock_service.adjust_stock`."""
+        from ..services.stock_service import adjust_stock
+        return await adjust_stock(db, self, amount)
+
+    @hybrid_property
+    def total_value(self) -> float:
         return self.quantity * self.price_per_unit
 
+    def calculate_total_value(self) -> float:
+        return self.total_value
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "sku": self.sku,
+            "quantity": self.quantity,
+            "unit": self.unit,
+            "min_quantity": self.min_quantity,
+            "price_per_unit": self.price_per_unit,
+            "supplier_id": self.supplier_id,
+            "location": self.location,
+            "is_active": self.is_active,
+            "availability_status": self.availability_status,
+            "last_ordered": self.last_ordered.isoformat() if self.last_ordered else None,
+            "last_updated": self.last_updated.isoformat() if self.last_updated else None
+        }
+
     @property
     def availability_status(self) -> str:
         if self.quantity <= 0:
@@ -48,9 +90,12 @@ class Material(Base):
 
 class ProjectMaterial(Base):
     __tablename__ = "project_materials"
+    __table_args__ = (
+        Index("ix_project_materials_material_project", "material_id", "project_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
     material_id = Column(Integer, ForeignKey("materials.id"), nullable=False)
     quantity_allocated = Column(Float, nullable=False)
     quantity_used = Column(Float, default=0)
@@ -60,10 +105,130 @@ class ProjectMaterial(Base):
     project = relationship("Project", back_populates="project_materials")
     material = relationship("Material", back_populates="project_materials")
 
-    def update_usage(self, used_quantity: float) -> None:
-        self.quantity_used = min(self.quantity_allocated, self.quantity_used + used_quantity)
-        self.updated_at = func.now()
+    async def update_usage(self, db: AsyncSession, used_quantity: float) -> "ProjectMaterial":
+        """Draw `used_quantity` from stock for this project via `stock_service.adjust_stock`.
+
+        Usage is capped at the allocation; the instance is reloaded afterwards.
+        """
+        from ..services.stock_service import adjust_stock
+        material = await db.get(Material, self.material_id)
+        await adjust_stock(db, material, -used_quantity, project_id=self.project_id)
+        await db.refresh(self)
+        return self
 
     @property
     def remaining_quantity(self) -> float:
-        return self.quantity_allocated - self.quantity_used
\ No newline at end of file
+        return self.quantity_allocated - (self.quantity_used or 0)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "project_id": self.project_id,
+            "material_id": self.material_id,
+            "quantity_allocated": self.quantity_allocated,
+            "quantity_used": self.quantity_used,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class StockMovement(Base):
+    __tablename__ = "stock_movements"
+    __table_args__ = (
+        Index("ix_stock_movements_material_created", "material_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # The log goes with its material, so deleting a material is not blocked by its history.
+    material_id = Column(Integer, ForeignKey("materials.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
+    delta = Column(Float, nullable=False)
+    quantity_after = Column(Float, nullable=False)
+    reason = Column(String(255))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MaterialStockAlert(Base):
+    """Open low-stock alert; the row is removed once the material recovers."""
+
+    __tablename__ = "material_stock_alerts"
+
+    material_id = Column(Integer, ForeignKey("materials.id", ondelete="CASCADE"), primary_key=True)
+    quantity = Column(Float, nullable=False)
+    min_quantity = Column(Float, nullable=False)
+    alerted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MaterialCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    sku: str = Field(..., min_length=1, max_length=50)
+    unit: str = Field(..., max_length=50)
+    price_per_unit: float = Field(..., ge=0)
+    description: Optional[str] = Field(None, max_length=1000)
+    quantity: float = Field(0, ge=0)
+    min_quantity: float = Field(0, ge=0)
+    supplier_id: Optional[int] = None
+    location: Optional[str] = Field(None, max_length=255)
+    is_active: bool = True
+
+
+class MaterialUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    sku: Optional[str] = Field(None, min_length=1, max_length=50)
+    unit: Optional[str] = Field(None, max_length=50)
+    price_per_unit: Optional[float] = Field(None, ge=0)
+    description: Optional[str] = Field(None, max_length=1000)
+    quantity: Optional[float] = Field(None, ge=0)
+    min_quantity: Optional[float] = Field(None, ge=0)
+    supplier_id: Optional[int] = None
+    location: Optional[str] = Field(None, max_length=255)
+    is_active: Optional[bool] = None
+
+
+class MaterialRead(BaseModel):
+    """Response shape of `Material.to_dict()`."""
+
+    id: int
+    name: str
+    description: Optional[str] = None
+    sku: str
+    quantity: Optional[float] = None
+    unit: str
+    min_quantity: Optional[float] = None
+    price_per_unit: float
+    supplier_id: Optional[int] = None
+    location: Optional[str] = None
+    is_active: Optional[bool] = None
+    availability_status: str
+    last_ordered: Optional[datetime] = None
+    last_updated: Optional[datetime] = None
+
+
+class MaterialWithIncludes(MaterialRead):
+    """`MaterialRead` plus whichever relationships were requested with `include=`."""
+
+    project_materials: Optional[List[Dict[str, Any]]] = None
+    supplier: Optional[Dict[str, Any]] = None
+
+
+class StockMovementCreate(BaseModel):
+    material_id: Optional[int] = None
+    sku: Optional[str] = None
+    delta: float
+    project_id: Optional[int] = None
+    reason: Optional[str] = Field(None, max_length=255)
+
+    @model_validator(mode="after")
+    def _require_material(self) -> "StockMovementCreate":
+        if self.material_id is None and not self.sku:
+            raise ValueError("Either material_id or sku is required")
+        return self
+
+
+class StockMovementBatch(BaseModel):
+    movements: List[StockMovementCreate] = Field(..., min_length=1, max_length=2000)
+
+
+class StockLevel(BaseModel):
+    material_id: int
+    sku: str
+    quantity: float
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class EmployeePerformanceSummary(Base):
+    __tablename__ = "employee_performance_summaries"
+
+    employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    total_hours_worked = Column(Float, nullable=False, default=0)
+    current_score = Column(Float)
+    previous_score = Column(Float)
+    score_updates = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def score_trend(self) -> float:
+        if self.current_score is None or self.previous_score is None:
+            return 0.0
+        return self.current_score - self.previous_score
+
+
+class EmployeePerformancePeriod(Base):
+    __tablename__ = "employee_performance_periods"
+
+    employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    hours_worked = Column(Float, nullable=False, default=0)
+    # Hours from Employee.add_hours_worked rather than the time-entry ledger,
+    # kept apart so a rebuild from the ledger does not drop them.
+    direct_hours = Column(Float, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0)
+    score_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def average_score(self) -> float:
+        return self.score_sum / self.score_count if self.score_count else 0.0
@@ -1,16 +1,18 @@
 from datetime import datetime
-from typing import Optional, List
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Table
-from sqlalchemy.orm import relationship, Mapped
-from sqlalchemy.ext.declarative import declarative_base
+from typing import Any, Dict, Optional, List, Tuple
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, Table, and_, case, func
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, Mapped, query_expression
+from pydantic import BaseModel, Field
 
-Base = declarative_base()
+from .base import Base, utc_now, whole_days
 
 project_employee = Table(
     'project_employee',
     Base.metadata,
     Column('project_id', Integer, ForeignKey('projects.id')),
-    Column('employee_id', Integer, ForeignKey('employees.id'))
+    Column('employee_id', Integer, ForeignKey('employees.id')),
+    Index('ix_project_employee_employee_project', 'employee_id', 'project_id')
 )
 
 project_material = Table(
@@ -18,7 +20,8 @@ project_material = Table(
     Base.metadata,
     Column('project_id', Integer, ForeignKey('projects.id')),
     Column('material_id', Integer, ForeignKey('materials.id')),
-    Column('quantity_required', Float)
+    Column('quantity_required', Float),
+    Index('ix_project_material_material_project', 'material_id', 'project_id')
 )
 
 class Project(Base):
@@ -40,7 +43,7 @@ class Project(Base):
     employees: Mapped[List["Employee"]] = relationship(
         "Employee",
         secondary=project_employee,
-        backref="projects"
+        back_populates="projects"
     )
 
     materials: Mapped[List["Material"]] = relationship(
@@ -49,7 +52,16 @@ class Project(Base):
         backref="projects"
     )
 
-    def calculate_progress(self) -> float:
+    project_materials: Mapped[List["ProjectMaterial"]] = relationship(
+        "ProjectMaterial",
+        back_populates="project"
+    )
+
+    # Filled by `with_expression(Project.scheduled_progress, Project.computed_progress)`
+    # so list endpoints get the value from SQL instead of per-row Python.
+    scheduled_progress: Mapped[Optional[float]] = query_expression()
+
+    def calculate_progress(self, now: Optional[datetime] = None) -> float:
         if not self.end_date or not self.start_date:
             return self.progress
             
@@ -57,10 +69,49 @@ class Project(Base):
         if total_duration <= 0:
             return 100.0 if self.status == 'COMPLETED' else self.progress
             
-        days_passed = (datetime.utcnow() - self.start_date).days
+        days_passed = ((now or datetime.utcnow()) - self.start_date).days
         calculated_progress = min(100.0, (days_passed / total_duration) * 100)
         return calculated_progress if self.status != 'COMPLETED' else 100.0
 
+    @hybrid_property
+    def computed_progress(self) -> float:
+        return self.calculate_progress()
+
+    @computed_progress.expression
+    def computed_progress(cls):
+        # SQL twin of calculate_progress(); whole_days compiles per dialect.
+        total_days = whole_days(cls.start_date, cls.end_date)
+        scheduled = whole_days(cls.start_date, utc_now()) * 100.0 / total_days
+        return case(
+            (cls.end_date.is_(None), cls.progress),
+            (cls.status == 'COMPLETED', 100.0),
+            (total_days <= 0, cls.progress),
+            # CASE rather than least(), which SQLite lacks.
+            (scheduled > 100.0, 100.0),
+            else_=scheduled
+        )
+
+    @hybrid_property
+    def behind_schedule(self) -> bool:
+        return self.status != 'COMPLETED' and self.progress < self.computed_progress
+
+    @behind_schedule.expression
+    def behind_schedule(cls):
+        return and_(cls.status != 'COMPLETED', cls.progress < cls.computed_progress)
+
+    @hybrid_property
+    def period(self) -> Tuple[datetime, Optional[datetime]]:
+        # Half-open [start, end); no end means open-ended, and an end before
+        # the start books nothing, matching the SQL range below.
+        if self.end_date is not None and self.end_date < self.start_date:
+            return self.start_date, self.start_date
+        return self.start_date, self.end_date
+
+    @period.expression
+    def period(cls):
+        # Postgres only; must match ix_projects_period for the GiST index to be used.
+        return func.tsrange(cls.start_date, case((cls.end_date < cls.start_date, cls.start_date), else_=cls.end_date))
+
     def update_status(self) -> None:
         if self.progress >= 100:
             self.status = 'COMPLETED'
@@ -70,4 +121,110 @@ class Project(Base):
             self.status = 'PENDING'
 
     def is_over_budget(self, current_spend: float) -> bool:
-        return current_spend > self.budget
\ No newline at end of file
+        return current_spend > self.budget
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "start_date": self.start_date.isoformat() if self.start_date else None,
+            "end_date": self.end_date.isoformat() if self.end_date else None,
+            "budget": self.budget,
+            "progress": self.progress,
+            "status": self.status,
+            "client_name": self.client_name,
+            "priority": self.priority,
+            # Unset unless the row was loaded with the SQL expression (not on
+            # freshly written rows or identity-map hits), so fall back to Python.
+            "computed_progress": (
+                self.scheduled_progress if self.scheduled_progress is not None else self.calculate_progress()
+            ),
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+Index(
+    'ix_projects_period',
+    Project.period,
+    postgresql_using='gist',
+).ddl_if(dialect='postgresql')
+
+
+class ProjectCost(Base):
+    """Running spend per project, maintained alongside usage and time entries."""
+
+    __tablename__ = 'project_costs'
+
+    project_id: Mapped[int] = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    material_cost: Mapped[float] = Column(Float, nullable=False, default=0.0)
+    labour_cost: Mapped[float] = Column(Float, nullable=False, default=0.0)
+    updated_at: Mapped[datetime] = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @hybrid_property
+    def total_cost(self) -> float:
+        return self.material_cost + self.labour_cost
+
+
+class ProjectCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    start_date: datetime
+    budget: float = Field(..., ge=0)
+    description: Optional[str] = Field(None, max_length=500)
+    end_date: Optional[datetime] = None
+    progress: float = Field(0.0, ge=0, le=100)
+    status: str = Field('PENDING', max_length=20)
+    client_name: Optional[str] = Field(None, max_length=100)
+    priority: int = 1
+
+
+class ProjectUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    start_date: Optional[datetime] = None
+    budget: Optional[float] = Field(None, ge=0)
+    description: Optional[str] = Field(None, max_length=500)
+    end_date: Optional[datetime] = None
+    status: Optional[str] = Field(None, max_length=20)
+    client_name: Optional[str] = Field(None, max_length=100)
+    priority: Optional[int] = None
+
+
+class ProjectRead(BaseModel):
+    """Response shape of `Project.to_dict()`."""
+
+    id: int
+    name: str
+    description: Optional[str] = None
+    start_date: datetime
+    end_date: Optional[datetime] = None
+    budget: float
+    progress: Optional[float] = None
+    status: Optional[str] = None
+    client_name: Optional[str] = None
+    priority: Optional[int] = None
+    computed_progress: Optional[float] = None
+    updated_at: Optional[datetime] = None
+
+
+class ProjectWithIncludes(ProjectRead):
+    """`ProjectRead` plus whichever relationships were requested with `include=`."""
+
+    employees: Optional[List[Dict[str, Any]]] = None
+    materials: Optional[List[Dict[str, Any]]] = None
+    project_materials: Optional[List[Dict[str, Any]]] = None
+
+
+class ProjectProgress(BaseModel):
+    progress: float = Field(..., ge=0, le=100)
+
+
+class ProjectBudget(BaseModel):
+    project_id: int
+    name: str
+    budget: float
+    material_cost: float
+    labour_cost: float
+    total_cost: float
+    remaining: float
+    burn_ratio: Optional[float] = None
+    over_budget: bool
@@ -0,0 +1,9 @@
+"""Single entry point for the declarative metadata.
+
+Importing this module loads every model module, so `Base.metadata` is
+complete wherever schema is created, migrated or compared.
+"""
+from .base import Base
+from . import employee, material, performance, project, supplier, time_entry  # noqa: F401
+
+metadata = Base.metadata
@@ -0,0 +1,134 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from pydantic import BaseModel, Field
+
+from .base import Base
+
+
+class Supplier(Base):
+    __tablename__ = "suppliers"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+    contact_email = Column(String(255))
+    phone = Column(String(50))
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    materials = relationship("Material", back_populates="supplier")
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "contact_email": self.contact_email,
+            "phone": self.phone,
+            "is_active": self.is_active,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class SupplierPrice(Base):
+    """Append-only log of quoted unit prices, keyed by SKU."""
+
+    __tablename__ = "supplier_price_history"
+    __table_args__ = (
+        Index("ix_supplier_price_history_sku_supplier_recorded", "sku", "supplier_id", "recorded_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="CASCADE"), nullable=False)
+    sku = Column(String(50), nullable=False)
+    material_name = Column(String(255), nullable=False)
+    price_per_unit = Column(Float, nullable=False)
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class SupplierPriceSummary(Base):
+    """Latest and previous price per (SKU, supplier), maintained on every recorded price."""
+
+    __tablename__ = "supplier_price_summaries"
+
+    sku = Column(String(50), primary_key=True)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="CASCADE"), primary_key=True)
+    material_name = Column(String(255), nullable=False)
+    current_price = Column(Float, nullable=False)
+    previous_price = Column(Float)
+    min_price = Column(Float, nullable=False)
+    max_price = Column(Float, nullable=False)
+    observations = Column(Integer, nullable=False, default=0)
+    last_recorded = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class MaterialPriceComparison(Base):
+    """One row per SKU comparing current prices across suppliers."""
+
+    __tablename__ = "material_price_comparisons"
+    __table_args__ = (
+        # Serves the `name` filter's ILIKE; migration 0011.
+        Index(
+            "ix_material_price_comparisons_name_trgm",
+            "material_name",
+            postgresql_using="gin",
+            postgresql_ops={"material_name": "gin_trgm_ops"},
+        ),
+    )
+
+    sku = Column(String(50), primary_key=True)
+    material_name = Column(String(255), nullable=False)
+    supplier_count = Column(Integer, nullable=False)
+    cheapest_supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="SET NULL"))
+    cheapest_price = Column(Float, nullable=False)
+    highest_price = Column(Float, nullable=False)
+    average_price = Column(Float, nullable=False)
+    # Mean relative change between each supplier's previous and current price.
+    trend = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class SupplierCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    contact_email: Optional[str] = Field(None, max_length=255)
+    phone: Optional[str] = Field(None, max_length=50)
+    is_active: bool = True
+
+
+class SupplierPriceCreate(BaseModel):
+    supplier_id: int
+    sku: str = Field(..., min_length=1, max_length=50)
+    material_name: Optional[str] = Field(None, max_length=255)
+    price_per_unit: float = Field(..., ge=0)
+    recorded_at: Optional[datetime] = None
+
+
+class SupplierPriceBatch(BaseModel):
+    prices: List[SupplierPriceCreate] = Field(..., min_length=1, max_length=2000)
+
+
+class SupplierQuote(BaseModel):
+    supplier_id: int
+    supplier_name: Optional[str] = None
+    current_price: float
+    previous_price: Optional[float] = None
+    min_price: float
+    max_price: float
+    last_recorded: Optional[datetime] = None
+
+
+class PriceComparison(BaseModel):
+    sku: str
+    material_name: str
+    supplier_count: int
+    cheapest_supplier_id: Optional[int] = None
+    cheapest_price: float
+    highest_price: float
+    spread: float
+    average_price: float
+    trend: float
+    trend_direction: str
+    quotes: Optional[List[SupplierQuote]] = None
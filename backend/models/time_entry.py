@@ -0,0 +1,97 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+
+from .base import Base, naive_utc
+
+# Aggregate rows use 0 instead of NULL for "no project" so it can be part of the key.
+NO_PROJECT = 0
+
+
+class TimeEntry(Base):
+    """Append-only ledger of clock punches; rows are never updated in place."""
+
+    __tablename__ = "time_entries"
+    __table_args__ = (
+        Index("ix_time_entries_employee_clock_in", "employee_id", "clock_in"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
+    department = Column(String, nullable=False)
+    clock_in = Column(DateTime, nullable=False)
+    clock_out = Column(DateTime)
+    hours = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class TimeEntryDaily(Base):
+    __tablename__ = "time_entry_daily"
+    __table_args__ = (
+        Index("ix_time_entry_daily_project", "project_id", "bucket"),
+        Index("ix_time_entry_daily_department", "department", "bucket"),
+    )
+
+    bucket = Column(Date, primary_key=True)
+    employee_id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, primary_key=True, default=NO_PROJECT)
+    department = Column(String, nullable=False)
+    hours = Column(Float, nullable=False, default=0)
+    entries = Column(Integer, nullable=False, default=0)
+
+
+class TimeEntryWeekly(Base):
+    __tablename__ = "time_entry_weekly"
+    __table_args__ = (
+        Index("ix_time_entry_weekly_project", "project_id", "bucket"),
+        Index("ix_time_entry_weekly_department", "department", "bucket"),
+    )
+
+    bucket = Column(Date, primary_key=True)
+    employee_id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, primary_key=True, default=NO_PROJECT)
+    department = Column(String, nullable=False)
+    hours = Column(Float, nullable=False, default=0)
+    entries = Column(Integer, nullable=False, default=0)
+
+
+class TimeEntryCreate(BaseModel):
+    employee_id: int
+    project_id: Optional[int] = None
+    clock_in: datetime
+    clock_out: Optional[datetime] = None
+    hours: Optional[float] = Field(None, gt=0)
+
+    # The columns are naive UTC; asyncpg rejects aware values for them.
+    _naive_punches = field_validator("clock_in", "clock_out")(naive_utc)
+
+    @model_validator(mode="after")
+    def _resolve_hours(self) -> "TimeEntryCreate":
+        if self.clock_out is not None:
+            if self.clock_out <= self.clock_in:
+                raise ValueError("clock_out must be after clock_in")
+            if self.hours is None:
+                self.hours = (self.clock_out - self.clock_in).total_seconds() / 3600
+        if self.hours is None:
+            raise ValueError("Either clock_out or hours is required")
+        return self
+
+
+class TimeEntryBatch(BaseModel):
+    entries: List[TimeEntryCreate] = Field(..., min_length=1, max_length=5000)
+
+
+class TimeEntryBatchResult(BaseModel):
+    inserted: int
+    total_hours: float
+
+
+class HoursBucket(BaseModel):
+    bucket: date
+    key: Optional[str] = None
+    hours: float
+    entries: int
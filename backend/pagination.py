@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([v.isoformat() if hasattr(v, "isoformat") else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _coerce(column, value: Any) -> Any:
+    if isinstance(value, str) and column.type.python_type is datetime:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+
+def paginate(
+    query: Select,
+    columns: Tuple,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Select:
+    """Order `query` by `columns` and page it by cursor, falling back to offset."""
+    query = query.order_by(*(col.desc() if descending else col for col in columns))
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(columns):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        values = [_coerce(col, v) for col, v in zip(columns, values)]
+        if descending:
+            query = query.filter(tuple_(*columns) < tuple_(*values))
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*values))
+    elif skip:
+        query = query.offset(skip)
+    # Fetch one extra row so we know whether another page exists.
+    return query.limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], columns: Tuple, limit: int) -> Tuple[Sequence[Any], Optional[str]]:
+    """Trim the look-ahead row and return the page with its next cursor, if any."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], col.key) for col in columns])
+
+
+def finalize_page(rows: Sequence[Any], columns: Tuple, limit: int, response: Response) -> Sequence[Any]:
+    """Like `split_page`, but exposes the next cursor as a response header."""
+    rows, next_cursor = split_page(rows, columns, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+_query_counter: ContextVar[Optional[List[int]]] = ContextVar("query_counter", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+# Registered on the Engine class, so the primary, every replica and any engine
+# created later (tests, benchmarks) are all counted.
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+@contextmanager
+def count_queries() -> Iterator[List[int]]:
+    """Count statements executed in this context; read the total from `counter[0]`."""
+    counter = [0]
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[List[int]]:
+    with count_queries() as counter:
+        yield counter
+    if counter[0] > budget:
+        raise QueryBudgetExceeded(f"Executed {counter[0]} queries, budget is {budget}")
+
+
+class QueryBudgetMiddleware:
+    """Fail any request that runs more than `budget` queries.
+
+    Meant for tests and CI (enable with `QUERY_BUDGET`); an N+1 regression
+    surfaces as a QueryBudgetExceeded error from the test client. A plain
+    ASGI middleware rather than BaseHTTPMiddleware, so queries issued while a
+    StreamingResponse body is sent still count. The header carries the count
+    at the time headers go out; the budget is checked once the body is done.
+    """
+
+    def __init__(self, app: ASGIApp, budget: int):
+        self.app = app
+        self.budget = budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as counter:
+            async def send_with_count(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append(QUERY_COUNT_HEADER, str(counter[0]))
+                await send(message)
+
+            await self.app(scope, receive, send_with_count)
+        if counter[0] > self.budget:
+            raise QueryBudgetExceeded(
+                f"{scope['method']} {scope['path']} executed {counter[0]} queries, budget is {self.budget}"
+            )
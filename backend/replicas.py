@@ -0,0 +1,181 @@
+import asyncio
+import itertools
+import logging
+import math
+import time
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .database import create_engine_from_settings, engine
+
+logger = logging.getLogger(__name__)
+
+# Wall-clock time until which this client's reads go to the primary.
+PRIMARY_UNTIL_COOKIE = "primary_until"
+
+# One-element list per request, so a commit deep in a handler can extend it.
+_primary_until: ContextVar[Optional[List[float]]] = ContextVar("primary_until", default=None)
+
+# NULL when the replica is not streaming: no WAL receiver (stopped, never
+# connected, or promoted) or no word from the primary for longer than
+# wal_receiver_timeout, which is how a stalled connection looks until the
+# receiver gives up on it. Otherwise zero when it has replayed everything it
+# received, else the age of the last replayed transaction. Comparing LSNs
+# first avoids reporting an idle primary as replica lag.
+REPLICA_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN r.status IS DISTINCT FROM 'streaming' "
+    "OR now() - r.last_msg_receipt_time > COALESCE("
+    "NULLIF(current_setting('wal_receiver_timeout'), '0')::interval, interval '1 minute') THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END "
+    "FROM (SELECT 1) AS one LEFT JOIN pg_stat_wal_receiver AS r ON true"
+)
+
+
+class ReplicaRouter:
+    """Picks an engine for read-only work.
+
+    Replicas are polled for replication lag in the background; reads go
+    round-robin to those within `max_lag` seconds and fall back to the
+    primary when none qualify. For `max_lag` seconds after a client commits
+    on the primary, that client's reads stay on the primary so it sees its
+    own writes; see ReadYourWritesMiddleware. Other clients are unaffected.
+    """
+
+    def __init__(self, primary: AsyncEngine, urls: List[str], max_lag: float, check_interval: float):
+        self.primary = primary
+        self.replicas: List[AsyncEngine] = [create_engine_from_settings(url) for url in urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        # Unknown until the first check, so nothing is routed to a replica before then.
+        self._lag: Dict[AsyncEngine, Optional[float]] = {replica: None for replica in self.replicas}
+        self._cycle = itertools.cycle(self.replicas)
+        self._task: Optional[asyncio.Task] = None
+
+    def note_write(self) -> None:
+        """Pin the current request's client to the primary for `max_lag` seconds."""
+        primary_until = _primary_until.get()
+        if primary_until is not None:
+            primary_until[0] = time.time() + self.max_lag
+
+    def read_engine(self) -> AsyncEngine:
+        primary_until = _primary_until.get()
+        if not self.replicas or (primary_until is not None and time.time() < primary_until[0]):
+            return self.primary
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            lag = self._lag[replica]
+            if lag is not None and lag <= self.max_lag:
+                return replica
+        return self.primary
+
+    async def _check(self, replica: AsyncEngine) -> Optional[float]:
+        try:
+            async with replica.connect() as conn:
+                if conn.dialect.name != "postgresql":
+                    return 0.0
+                lag = (await conn.execute(REPLICA_LAG_SQL)).scalar_one()
+        except Exception:
+            logger.warning("Replica %s is unreachable", replica.url.render_as_string(hide_password=True))
+            return None
+        if lag is None:
+            logger.warning("Replica %s is not streaming from the primary", replica.url.render_as_string(hide_password=True))
+            return None
+        return float(lag)
+
+    async def check_lag(self) -> None:
+        lags = await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+        self._lag.update(zip(self.replicas, lags))
+
+    async def _monitor(self) -> None:
+        while True:
+            await self.check_lag()
+            await asyncio.sleep(self.check_interval)
+
+    async def start(self) -> None:
+        if self.replicas and self._task is None:
+            await self.check_lag()
+            self._task = asyncio.create_task(self._monitor())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for replica in self.replicas:
+            await replica.dispose()
+
+
+class ReadYourWritesMiddleware:
+    """Keep a client's reads on the primary for a while after it writes.
+
+    A commit on the primary during a request sets a cookie holding the time
+    until which that client should read from the primary; later requests
+    carrying it, on any worker, skip the replicas until it passes. A plain
+    ASGI middleware, like QueryBudgetMiddleware, so reads made while a
+    streamed body is sent see the pin too.
+    """
+
+    def __init__(self, app: ASGIApp, router: "ReplicaRouter"):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            requested = float(HTTPConnection(scope).cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+        except ValueError:
+            requested = 0.0
+        primary_until = [requested]
+
+        async def send_with_pin(message: Message) -> None:
+            if message["type"] == "http.response.start" and primary_until[0] != requested:
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{PRIMARY_UNTIL_COOKIE}={primary_until[0]:.3f}; Max-Age={math.ceil(self.router.max_lag)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        token = _primary_until.set(primary_until)
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _primary_until.reset(token)
+
+
+replica_router = ReplicaRouter(
+    engine,
+    settings.DATABASE_REPLICA_URLS,
+    settings.REPLICA_MAX_LAG_SECONDS,
+    settings.REPLICA_LAG_CHECK_INTERVAL,
+)
+
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _note_primary_commit(session: Session) -> None:
+    if session.bind is engine.sync_engine:
+        replica_router.note_write()
+
+
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """Session for read-only handlers; never use it to write."""
+    async with ReadSessionLocal(bind=replica_router.read_engine()) as session:
+        yield session
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from .config import settings
+from .pagination import NEXT_CURSOR_HEADER
+from .serialization import dumps
+from .singleflight import single_flight
+
+# (payload, extra headers) or None when the resource does not exist.
+Loader = Callable[[], Awaitable[Optional[Tuple[Any, Dict[str, str]]]]]
+
+
+def etag_for(body: bytes) -> str:
+    """Weak validator over the serialized body.
+
+    Hashing the body rather than ids and timestamps also catches derived
+    fields that change without a write, such as a project's computed progress.
+    """
+    return f'W/"{hashlib.sha1(body).hexdigest()}"'
+
+
+def page_loader(load_page: Callable[[], Awaitable[Tuple[Any, Optional[str]]]]) -> Loader:
+    """Adapt a `(rows, next_cursor)` page query into a cache loader."""
+    async def load():
+        rows, next_cursor = await load_page()
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        return [row.to_dict() for row in rows], headers
+    return load
+
+
+def detail_loader(load_row: Callable[[], Awaitable[Any]]) -> Loader:
+    async def load():
+        row = await load_row()
+        return (row.to_dict(), {}) if row is not None else None
+    return load
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {value.strip() for value in if_none_match.split(",")}
+    # Weak comparison: W/"x" and "x" name the same representation.
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+
+class LRUCacheBackend:
+    """Per-process fallback used when `REDIS_URL` is not configured."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._bumped_at: Dict[str, float] = {}
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    async def bump(self, namespace: str) -> None:
+        self._versions[namespace] = self._versions.get(namespace, 0) + 1
+        self._bumped_at[namespace] = time.time()
+
+    async def bumped_at(self, namespace: str) -> float:
+        return self._bumped_at.get(namespace, 0.0)
+
+
+class RedisCacheBackend:
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self._redis.get(f"response:{key}")
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        await self._redis.set(f"response:{key}", json.dumps(value), ex=max(1, int(ttl)))
+
+    async def version(self, namespace: str) -> int:
+        return int(await self._redis.get(f"response-version:{namespace}") or 0)
+
+    async def bump(self, namespace: str) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.incr(f"response-version:{namespace}")
+            pipe.set(f"response-bumped:{namespace}", time.time())
+            await pipe.execute()
+
+    async def bumped_at(self, namespace: str) -> float:
+        return float(await self._redis.get(f"response-bumped:{namespace}") or 0)
+
+
+class ResponseCache:
+    """Caches serialized read responses and answers conditional GETs.
+
+    Entries are keyed under a per-namespace version; writes bump the version,
+    which orphans every cached page and detail for that resource at once.
+
+    Loads may run on a replica that has not replayed the write behind a bump
+    yet, so for `settle` seconds after one, fills are served but not stored;
+    otherwise a stale body would be cached under the new version.
+    """
+
+    def __init__(self, backend, ttl: float, settle: float = 0.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.settle = settle
+
+    async def invalidate(self, namespace: str) -> None:
+        await self.backend.bump(namespace)
+
+    async def _fill(self, namespace: str, cache_key: str, loader: Loader) -> Optional[dict]:
+        result = await loader()
+        if result is None:
+            return None
+        payload, headers = result
+        body = dumps(payload)
+        entry = {"etag": etag_for(body), "body": body.decode(), "headers": headers}
+        if not self.settle or time.time() - await self.backend.bumped_at(namespace) >= self.settle:
+            await self.backend.set(cache_key, entry, self.ttl)
+        return entry
+
+    async def respond(self, request: Request, namespace: str, key: str, loader: Loader) -> Optional[Response]:
+        version = await self.backend.version(namespace)
+        cache_key = f"{namespace}:v{version}:{key}"
+
+        entry = await self.backend.get(cache_key)
+        if entry is None:
+            # Concurrent misses for the same key share one load instead of each querying.
+            entry = await single_flight.do(("response", cache_key), lambda: self._fill(namespace, cache_key, loader))
+            if entry is None:
+                return None
+
+        headers = {**entry["headers"], "ETag": entry["etag"], "Cache-Control": "private, no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+def _create_backend():
+    if settings.REDIS_URL:
+        return RedisCacheBackend(settings.REDIS_URL)
+    return LRUCacheBackend(settings.RESPONSE_CACHE_SIZE)
+
+
+# A replica can trail a write by up to the lag bound, plus the time until the next lag check notices.
+response_cache = ResponseCache(
+    _create_backend(),
+    settings.RESPONSE_CACHE_TTL,
+    settings.REPLICA_MAX_LAG_SECONDS + settings.REPLICA_LAG_CHECK_INTERVAL if settings.DATABASE_REPLICA_URLS else 0.0,
+)
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+
+from .database import engine
+from .models.registry import metadata
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).parent / "alembic.ini"
+# Arbitrary key shared by every process that may initialise the schema.
+SCHEMA_LOCK_KEY = 7_340_021
+
+
+def _alembic(command_name: str) -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    getattr(command, command_name)(config, "head")
+
+
+async def init_schema() -> None:
+    """Bring the database to the latest revision, once, whoever gets there first.
+
+    An empty database is built from the model metadata in one pass and
+    stamped at head; an existing one runs the pending migrations. A database
+    with application tables but no Alembic history is refused rather than
+    guessed at, since stamping it at head would skip migrations it never
+    ran. On Postgres
+    an advisory lock serialises concurrent callers, so every deploy step or
+    container can call this safely.
+    """
+    async with engine.connect() as conn:
+        postgres = conn.dialect.name == "postgresql"
+        if postgres:
+            await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        try:
+            existing = set(await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names()))
+            fresh = "alembic_version" not in existing
+            if fresh:
+                unversioned = sorted(existing & metadata.tables.keys())
+                if unversioned:
+                    raise RuntimeError(
+                        "Database has application tables but no alembic_version table "
+                        f"({', '.join(unversioned)}). Stamp the revision it matches with "
+                        "`alembic stamp <revision>`, then run init-db again to upgrade it."
+                    )
+                if postgres:
+                    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                await conn.run_sync(metadata.create_all)
+                await conn.commit()
+            # Alembic drives its own event loop, so it runs in a worker thread.
+            await asyncio.to_thread(_alembic, "stamp" if fresh else "upgrade")
+            logger.info("Schema %s at head", "created" if fresh else "upgraded")
+        finally:
+            if postgres:
+                # Clear any failed statement first, or the unlock would fail and hide
+                # the original error. The advisory lock is held by the session, so it
+                # survives the rollback.
+                await conn.rollback()
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEMA_LOCK_KEY})
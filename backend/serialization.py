@@ -0,0 +1,62 @@
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+import orjson
+from fastapi import HTTPException
+
+from .pagination import NEXT_CURSOR_HEADER
+
+# Returned with every projection: `id` keys the cursor and the modification
+# timestamp shows when the row last changed. The ETag is a hash of the whole
+# body (response_cache.etag_for), so it changes whenever the row does.
+ALWAYS_SELECTED = ("id", "updated_at", "last_updated")
+
+# Columns each list endpoint can project with `?fields=a,b`.
+EMPLOYEE_FIELDS = (
+    "email", "first_name", "last_name", "role", "department", "status", "hourly_rate", "is_supervisor",
+    "supervisor_id", "org_path", "performance_score", "total_hours_worked", "available_pto",
+    "last_status_update",
+)
+MATERIAL_FIELDS = (
+    "name", "description", "sku", "quantity", "unit", "min_quantity", "price_per_unit", "supplier_id",
+    "location", "is_active", "last_ordered",
+)
+PROJECT_FIELDS = (
+    "name", "description", "start_date", "end_date", "budget", "progress", "status", "client_name", "priority",
+)
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode JSON with orjson; datetimes come out as ISO 8601, like `to_dict()`."""
+    return orjson.dumps(payload)
+
+
+def parse_fields(fields: Optional[str], model, available: Sequence[str]) -> Optional[List]:
+    """Turn a `fields=a,b` query value into the columns to select, or None when absent.
+
+    Only plain columns listed in `available` can be projected; computed
+    values such as `availability_status` need the full ORM path.
+    """
+    if fields is None:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(available))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}"
+        )
+    columns = model.__table__.columns
+    names = [name for name in ALWAYS_SELECTED if name in columns]
+    names += [name for name in requested if name not in names]
+    return [columns[name] for name in names]
+
+
+def row_page_loader(
+    load_page: Callable[[], Awaitable[Tuple[Sequence[Any], Optional[str]]]]
+) -> Callable[[], Awaitable[Tuple[List[dict], dict]]]:
+    """Like `response_cache.page_loader`, for column-tuple rows instead of ORM objects."""
+    async def load():
+        rows, next_cursor = await load_page()
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        return [row._asdict() for row in rows], headers
+    return load
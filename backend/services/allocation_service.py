@@ -0,0 +1,367 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, exists, func, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..intervals import IntervalIndex
+from ..models.allocation import (
+    AllocationConflict,
+    AssignmentCheck,
+    AvailableEmployee,
+    MaterialOvercommit,
+    ProposedAssignment,
+    ScheduleCheck
+)
+from ..models.base import naive_utc
+from ..models.employee import Employee
+from ..models.material import Material, ProjectMaterial
+from ..models.project import Project, project_employee, project_material
+from ..pagination import paginate, split_page
+
+# Projects in these states no longer hold crews or stock.
+INACTIVE_STATUSES = ("COMPLETED", "CANCELLED")
+# Stands in for "no end date" so open-ended bookings compare like any other.
+OPEN_END = datetime.max
+# Float sums of quantities drift; treat anything within this as "fits".
+EPSILON = 1e-9
+
+
+class _Booking(NamedTuple):
+    project_id: int
+    # Index into the proposal for proposed bookings; None for existing ones.
+    assignment: Optional[int] = None
+
+
+def _span(start: datetime, end: Optional[datetime]) -> Tuple[datetime, datetime]:
+    """Python twin of `Project.period`, with open ends as OPEN_END."""
+    if end is None:
+        return start, OPEN_END
+    return start, max(start, end)
+
+
+def _overlaps(dialect_name: str, start: datetime, end: Optional[datetime]):
+    """Projects whose period shares any instant with `[start, end)`."""
+    if dialect_name == "postgresql":
+        # `&&` on the range expression is what ix_projects_period (GiST) answers.
+        return Project.period.op("&&")(func.tsrange(start, end))
+    condition = or_(
+        Project.end_date.is_(None),
+        and_(Project.end_date > start, Project.end_date > Project.start_date)
+    )
+    if end is not None:
+        condition = and_(Project.start_date < end, condition)
+    return condition
+
+
+def _active():
+    return Project.status.notin_(INACTIVE_STATUSES)
+
+
+async def get_available_employees_db(
+    db: AsyncSession,
+    start: datetime,
+    end: Optional[datetime] = None,
+    department: Optional[str] = None,
+    role: Optional[str] = None,
+    status: Optional[str] = "active",
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[AvailableEmployee], Optional[str]]:
+    """Employees not booked on any active project overlapping `[start, end)`.
+
+    The overlapping projects come from the period index and their crews from
+    the (employee_id, project_id) index, so busy employees are found without
+    walking every project or assignment.
+    """
+    start, end = naive_utc(start), naive_utc(end)
+    busy = (
+        select(project_employee.c.employee_id)
+        .join(Project, Project.id == project_employee.c.project_id)
+        .where(
+            project_employee.c.employee_id == Employee.id,
+            _active(),
+            _overlaps(db.bind.dialect.name, start, end)
+        )
+    )
+    query = select(
+        Employee.id, Employee.first_name, Employee.last_name, Employee.role, Employee.department
+    ).where(~busy.exists())
+    if status:
+        query = query.where(Employee.status == status)
+    if department:
+        query = query.where(Employee.department == department)
+    if role:
+        query = query.where(Employee.role == role)
+
+    order = (Employee.id,)
+    result = await db.execute(paginate(query, order, limit, cursor=cursor))
+    rows, next_cursor = split_page(result.all(), order, limit)
+    return [AvailableEmployee(**row._asdict()) for row in rows], next_cursor
+
+
+async def _load_demand(
+    db: AsyncSession,
+    material_ids: Sequence[int],
+    start: datetime,
+    end: Optional[datetime]
+) -> Dict[int, List[Tuple[datetime, datetime, _Booking, float]]]:
+    """Outstanding demand per material from active projects overlapping the window.
+
+    A project's allocation (allocated minus already used) counts when it has
+    one; otherwise its planned `project_material.quantity_required` does.
+    """
+    allocated = select(
+        ProjectMaterial.project_id.label("project_id"),
+        ProjectMaterial.material_id.label("material_id"),
+        (ProjectMaterial.quantity_allocated - func.coalesce(ProjectMaterial.quantity_used, 0)).label("quantity")
+    ).where(ProjectMaterial.material_id.in_(material_ids))
+    planned = select(
+        project_material.c.project_id,
+        project_material.c.material_id,
+        project_material.c.quantity_required
+    ).where(
+        project_material.c.material_id.in_(material_ids),
+        ~exists().where(
+            ProjectMaterial.project_id == project_material.c.project_id,
+            ProjectMaterial.material_id == project_material.c.material_id
+        )
+    )
+    demand = union_all(allocated, planned).subquery()
+    result = await db.execute(
+        select(demand.c.material_id, demand.c.project_id, demand.c.quantity, Project.start_date, Project.end_date)
+        .join(Project, Project.id == demand.c.project_id)
+        .where(demand.c.quantity > 0, _active(), _overlaps(db.bind.dialect.name, start, end))
+    )
+    bookings = defaultdict(list)
+    for row in result:
+        booked_from, booked_until = _span(row.start_date, row.end_date)
+        bookings[row.material_id].append((booked_from, booked_until, _Booking(row.project_id), row.quantity))
+    return bookings
+
+
+def _demand_profile(
+    bookings: Iterable[Tuple[datetime, datetime, _Booking, float]],
+    start: datetime,
+    end: datetime
+) -> Iterator[Tuple[datetime, float, Set[_Booking]]]:
+    """Sweep the bookings clipped to `[start, end)`.
+
+    Yields `(time, demand, bookings)` at each change point; the demand holds
+    until the next yielded time.
+    """
+    events = []
+    for booked_from, booked_until, booking, quantity in bookings:
+        booked_from, booked_until = max(booked_from, start), min(booked_until, end)
+        if booked_from < booked_until:
+            events.append((booked_from, 1, booking, quantity))
+            events.append((booked_until, 0, booking, quantity))
+    # Half-open intervals: at equal times, ends (0) are applied before starts (1).
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    active: Dict[_Booking, float] = {}
+    demand = 0.0
+    position = 0
+    while position < len(events):
+        time = events[position][0]
+        while position < len(events) and events[position][0] == time:
+            _, is_start, booking, quantity = events[position]
+            if is_start:
+                active[booking] = active.get(booking, 0.0) + quantity
+                demand += quantity
+            else:
+                active[booking] -= quantity
+                demand -= quantity
+                if active[booking] <= EPSILON:
+                    del active[booking]
+            position += 1
+        yield time, demand, set(active)
+
+
+def _overcommitted_windows(
+    bookings: Iterable[Tuple[datetime, datetime, _Booking, float]],
+    available: float,
+    start: datetime,
+    end: datetime
+) -> List[Tuple[datetime, datetime, float, Set[_Booking]]]:
+    """Maximal stretches where demand exceeds `available`, with their peak and contributors."""
+    windows = []
+    current = None
+    for time, demand, active in _demand_profile(bookings, start, end):
+        if demand > available + EPSILON:
+            if current is None:
+                current = [time, None, demand, set(active)]
+            else:
+                current[2] = max(current[2], demand)
+                current[3] |= active
+        elif current is not None:
+            current[1] = time
+            windows.append(tuple(current))
+            current = None
+    return windows
+
+
+async def get_material_overcommits_db(
+    db: AsyncSession,
+    material_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Optional[List[MaterialOvercommit]]:
+    """Periods in which active projects together need more of a material than is in stock.
+
+    Stock is the current on-hand quantity, so the window starts now unless
+    given. Returns None when the material does not exist.
+    """
+    material = (await db.execute(
+        select(Material.id, Material.quantity).where(Material.id == material_id)
+    )).first()
+    if material is None:
+        return None
+    available = material.quantity or 0.0
+    start = naive_utc(start) or datetime.utcnow()
+    end = naive_utc(end)
+
+    bookings = (await _load_demand(db, [material_id], start, end)).get(material_id, [])
+    return [
+        MaterialOvercommit(
+            material_id=material_id,
+            start=window_start,
+            end=None if window_end == OPEN_END else window_end,
+            peak_demand=peak,
+            available=available,
+            shortfall=peak - available,
+            project_ids=sorted({booking.project_id for booking in contributors})
+        )
+        for window_start, window_end, peak, contributors in _overcommitted_windows(
+            bookings, available, start, end or OPEN_END
+        )
+    ]
+
+
+async def _require_ids(db: AsyncSession, column, ids: Set[int], label: str) -> None:
+    found = set((await db.execute(select(column).where(column.in_(ids)))).scalars())
+    missing = sorted(ids - found)
+    if missing:
+        raise LookupError(f"{label} {missing[0]} not found")
+
+
+async def check_schedule_db(db: AsyncSession, assignments: Sequence[ProposedAssignment]) -> ScheduleCheck:
+    """Check a proposed schedule against existing bookings and against itself.
+
+    Only bookings for the employees and materials in the proposal, within the
+    proposal's overall time span, are loaded. Each resource's bookings then go
+    into an `IntervalIndex`, so every assignment is checked by an overlap
+    query instead of a scan over the whole schedule. Proposed material
+    quantities add to what the project already has.
+    """
+    project_ids = {assignment.project_id for assignment in assignments}
+    result = await db.execute(
+        select(Project.id, Project.start_date, Project.end_date).where(Project.id.in_(project_ids))
+    )
+    periods = {row.id: _span(row.start_date, row.end_date) for row in result}
+    missing = sorted(project_ids - periods.keys())
+    if missing:
+        raise LookupError(f"Project {missing[0]} not found")
+
+    employee_ids = {a.employee_id for a in assignments if a.employee_id is not None}
+    material_ids = {a.material_id for a in assignments if a.material_id is not None}
+    if employee_ids:
+        await _require_ids(db, Employee.id, employee_ids, "Employee")
+    stock: Dict[int, float] = {}
+    if material_ids:
+        result = await db.execute(select(Material.id, Material.quantity).where(Material.id.in_(material_ids)))
+        stock = {row.id: row.quantity or 0.0 for row in result}
+        missing = sorted(material_ids - stock.keys())
+        if missing:
+            raise LookupError(f"Material {missing[0]} not found")
+
+    spans = []
+    for assignment in assignments:
+        project_start, project_end = periods[assignment.project_id]
+        start = naive_utc(assignment.start) or project_start
+        end = naive_utc(assignment.end) or project_end
+        spans.append((start, max(start, end)))
+    window_start = min(start for start, _ in spans)
+    window_end = max(end for _, end in spans)
+    window_end = None if window_end == OPEN_END else window_end
+
+    crew_bookings = defaultdict(list)
+    if employee_ids:
+        result = await db.execute(
+            select(project_employee.c.employee_id, Project.id, Project.start_date, Project.end_date)
+            .join(Project, Project.id == project_employee.c.project_id)
+            .where(
+                project_employee.c.employee_id.in_(employee_ids),
+                _active(),
+                _overlaps(db.bind.dialect.name, window_start, window_end)
+            )
+        )
+        for row in result:
+            booked_from, booked_until = _span(row.start_date, row.end_date)
+            crew_bookings[row.employee_id].append((booked_from, booked_until, _Booking(row.id)))
+    material_bookings = (
+        await _load_demand(db, sorted(material_ids), window_start, window_end) if material_ids else {}
+    )
+
+    for position, (assignment, (start, end)) in enumerate(zip(assignments, spans)):
+        booking = _Booking(assignment.project_id, position)
+        if assignment.employee_id is not None:
+            crew_bookings[assignment.employee_id].append((start, end, booking))
+        else:
+            material_bookings.setdefault(assignment.material_id, []).append((start, end, booking, assignment.quantity))
+
+    crew_index = {employee_id: IntervalIndex(bookings) for employee_id, bookings in crew_bookings.items()}
+    material_index = {
+        material_id: IntervalIndex((start, end, (booking, quantity)) for start, end, booking, quantity in bookings)
+        for material_id, bookings in material_bookings.items()
+    }
+
+    results = []
+    for position, (assignment, (start, end)) in enumerate(zip(assignments, spans)):
+        if assignment.employee_id is not None:
+            conflicts = [
+                _conflict(booking, booked_from, booked_until)
+                for booked_from, booked_until, booking in crew_index[assignment.employee_id].overlapping(start, end)
+                # Being on the same project twice is not a double booking.
+                if booking.project_id != assignment.project_id
+            ]
+            results.append(AssignmentCheck(assignment=position, ok=not conflicts, conflicts=conflicts))
+            continue
+
+        available = stock[assignment.material_id]
+        overlapping = [
+            (booked_from, booked_until, booking, quantity)
+            for booked_from, booked_until, (booking, quantity)
+            in material_index[assignment.material_id].overlapping(start, end)
+        ]
+        peak = max((demand for _, demand, _ in _demand_profile(overlapping, start, end)), default=0.0)
+        conflicts = []
+        if peak > available + EPSILON:
+            contributors = set()
+            for _, _, _, active in _overcommitted_windows(overlapping, available, start, end):
+                contributors |= active
+            conflicts = [
+                _conflict(booking, booked_from, booked_until)
+                for booked_from, booked_until, booking, _ in overlapping
+                if booking in contributors and booking.assignment != position
+            ]
+        results.append(AssignmentCheck(
+            assignment=position,
+            ok=peak <= available + EPSILON,
+            conflicts=conflicts,
+            peak_demand=peak,
+            available=available
+        ))
+
+    conflicting = sum(1 for check in results if not check.ok)
+    return ScheduleCheck(ok=conflicting == 0, conflicting=conflicting, results=results)
+
+
+def _conflict(booking: _Booking, start: datetime, end: datetime) -> AllocationConflict:
+    return AllocationConflict(
+        project_id=booking.project_id,
+        assignment=booking.assignment,
+        start=start,
+        end=None if end == OPEN_END else end
+    )
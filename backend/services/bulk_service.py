@@ -0,0 +1,256 @@
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Table, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import dialect_insert
+from ..replicas import ReadSessionLocal, replica_router
+from ..models.employee import Employee, EmployeeCreate
+from ..models.material import Material, MaterialCreate
+from ..models.project import Project, ProjectCreate
+from ..models.supplier import SupplierPriceCreate
+from .supplier_price_service import record_prices
+
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+class _CopyRejected(Exception):
+    pass
+
+
+class BulkResource(NamedTuple):
+    table: Table
+    schema: Type[BaseModel]
+    # Natural key reported back when a row collides with an existing one.
+    unique_key: Optional[str]
+    # Runs in the import transaction with each chunk's inserted records.
+    on_insert: Optional[Callable[[AsyncSession, List[dict]], Awaitable[None]]] = None
+
+
+async def _record_material_prices(db: AsyncSession, records: List[dict]) -> None:
+    # The same price log create_material writes through record_material_price.
+    prices = [
+        SupplierPriceCreate(
+            supplier_id=record["supplier_id"],
+            sku=record["sku"],
+            material_name=record["name"],
+            price_per_unit=record["price_per_unit"],
+        )
+        for record in records
+        if record.get("supplier_id") is not None and record.get("price_per_unit") is not None
+    ]
+    if prices:
+        await record_prices(db, prices)
+
+
+RESOURCES: Dict[str, BulkResource] = {
+    "employees": BulkResource(Employee.__table__, EmployeeCreate, "email"),
+    "materials": BulkResource(Material.__table__, MaterialCreate, "sku", _record_material_prices),
+    "projects": BulkResource(Project.__table__, ProjectCreate, None),
+}
+
+
+def read_rows(stream: io.IOBase, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yield raw rows from an uploaded CSV or NDJSON file without loading it whole."""
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    if fmt == "csv":
+        for row in csv.DictReader(text):
+            # Empty CSV cells mean "not provided", not the empty string.
+            yield {key: value for key, value in row.items() if value != ""}
+    else:
+        for line in text:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield f"Invalid JSON: {e}"
+
+
+def _apply_defaults(table: Table, row: Dict[str, Any]) -> Dict[str, Any]:
+    # COPY bypasses SQLAlchemy's Python-side column defaults, so fill them in here.
+    for column in table.columns:
+        if row.get(column.key) is None and column.default is not None:
+            if column.default.is_scalar:
+                row[column.key] = column.default.arg
+            elif column.default.is_callable:
+                row[column.key] = column.default.arg(None)
+    return row
+
+
+def _report(errors: List[dict], row_number: int, details: Any) -> None:
+    if len(errors) < MAX_REPORTED_ERRORS:
+        errors.append({"row": row_number, "errors": details})
+
+
+def _validate_chunk(resource: BulkResource, rows: Iterable, start: int, errors: List[dict]) -> List[tuple]:
+    valid = []
+    first_seen: Dict[Any, int] = {}
+    key = resource.unique_key
+    for offset, raw in enumerate(rows):
+        row_number = start + offset
+        try:
+            if not isinstance(raw, dict):
+                raise ValueError(raw if isinstance(raw, str) else "Row must be an object")
+            record = resource.schema.model_validate(raw).model_dump()
+        except (ValidationError, ValueError) as e:
+            _report(errors, row_number, e.errors(include_url=False) if isinstance(e, ValidationError) else str(e))
+            continue
+        if key:
+            # Caught here, because ON CONFLICT DO NOTHING would silently skip the repeat.
+            if record[key] in first_seen:
+                _report(errors, row_number, f"{key} {record[key]!r} duplicates row {first_seen[record[key]]}")
+                continue
+            first_seen[record[key]] = row_number
+        valid.append((row_number, _apply_defaults(resource.table, record)))
+    return valid
+
+
+def _constraint_message(error: IntegrityError) -> str:
+    # asyncpg's own exception, when there is one, carries the message without the class prefix.
+    return str(error.orig.__cause__ or error.orig).splitlines()[0]
+
+
+async def _copy_chunk(db: AsyncSession, table: Table, records: List[dict]) -> None:
+    from asyncpg import PostgresError
+
+    columns = list(records[0])
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    try:
+        await raw.driver_connection.copy_records_to_table(
+            table.name,
+            records=[tuple(record[column] for column in columns) for record in records],
+            columns=columns,
+        )
+    except PostgresError as e:
+        raise _CopyRejected(str(e)) from e
+
+
+async def _insert_chunk(db: AsyncSession, resource: BulkResource, chunk: List[tuple], errors: List[dict]) -> List[dict]:
+    """Insert a chunk, skipping and reporting rows whose key already exists; return the inserted records."""
+    insert_ = dialect_insert(db.bind.dialect.name)
+    statement = insert_(resource.table).values([record for _, record in chunk])
+    if not resource.unique_key:
+        await db.execute(statement)
+        return [record for _, record in chunk]
+
+    key = resource.unique_key
+    result = await db.execute(
+        statement.on_conflict_do_nothing(index_elements=[key]).returning(resource.table.c[key])
+    )
+    inserted = set(result.scalars().all())
+    loaded = []
+    for row_number, record in chunk:
+        if record[key] in inserted:
+            loaded.append(record)
+        else:
+            _report(errors, row_number, f"{key} {record[key]!r} already exists")
+    return loaded
+
+
+async def _insert_rows(db: AsyncSession, resource: BulkResource, chunk: List[tuple], errors: List[dict]) -> List[dict]:
+    """Insert a rejected chunk one row per savepoint, to pin each constraint error on its row."""
+    loaded = []
+    for row_number, record in chunk:
+        try:
+            async with db.begin_nested():
+                loaded += await _insert_chunk(db, resource, [(row_number, record)], errors)
+        except IntegrityError as e:
+            _report(errors, row_number, _constraint_message(e))
+    return loaded
+
+
+async def _load_chunk(db: AsyncSession, resource: BulkResource, chunk: List[tuple], use_copy: bool, errors: List[dict]) -> List[dict]:
+    if use_copy:
+        try:
+            async with db.begin_nested():
+                await _copy_chunk(db, resource.table, [record for _, record in chunk])
+            return [record for _, record in chunk]
+        except _CopyRejected:
+            pass
+    try:
+        async with db.begin_nested():
+            return await _insert_chunk(db, resource, chunk, errors)
+    except IntegrityError:
+        # A foreign key or check constraint failed somewhere in the chunk.
+        return await _insert_rows(db, resource, chunk, errors)
+
+
+async def import_rows(db: AsyncSession, resource_name: str, rows: Iterable[Dict[str, Any]]) -> dict:
+    """Validate rows in chunks and load the valid ones.
+
+    Repeated keys within the file are reported during validation. Each chunk
+    is then tried with COPY first (asyncpg only) inside a savepoint; if COPY
+    hits a constraint, the chunk is retried as a multi-row INSERT that skips
+    and reports rows whose key already exists. If that still violates a
+    constraint (a foreign key, say), the chunk is inserted row by row so each
+    failure is reported against its own row.
+    """
+    resource = RESOURCES[resource_name]
+    use_copy = db.bind.dialect.driver == "asyncpg"
+    errors: List[dict] = []
+    inserted = 0
+    total = 0
+
+    chunk_rows: List[Dict[str, Any]] = []
+    iterator = iter(rows)
+    while True:
+        chunk_rows.clear()
+        for raw in iterator:
+            chunk_rows.append(raw)
+            if len(chunk_rows) == IMPORT_CHUNK_SIZE:
+                break
+        if not chunk_rows:
+            break
+
+        chunk = _validate_chunk(resource, chunk_rows, total + 1, errors)
+        total += len(chunk_rows)
+        if not chunk:
+            continue
+
+        loaded = await _load_chunk(db, resource, chunk, use_copy, errors)
+        inserted += len(loaded)
+        if loaded and resource.on_insert:
+            await resource.on_insert(db, loaded)
+
+    await db.commit()
+    return {"total": total, "inserted": inserted, "failed": total - inserted, "errors": errors}
+
+
+def _serialize(value: Any) -> Any:
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+async def export_rows(resource_name: str, fmt: str) -> AsyncIterator[str]:
+    """Stream a whole table with a server-side cursor in constant memory."""
+    table = RESOURCES[resource_name].table
+    columns = [column.key for column in table.columns]
+    # Exports are long sequential scans; run them on a replica when one is fresh enough.
+    async with ReadSessionLocal(bind=replica_router.read_engine()) as session:
+        result = await session.stream(
+            select(table).order_by(table.c.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            async for partition in result.partitions():
+                for row in partition:
+                    writer.writerow([_serialize(value) for value in row])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            async for partition in result.partitions():
+                yield "".join(
+                    json.dumps({column: _serialize(value) for column, value in zip(columns, row)}) + "\n"
+                    for row in partition
+                )
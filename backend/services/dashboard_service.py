@@ -0,0 +1,62 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.dashboard import (
+    DashboardSummary,
+    EmployeeSummary,
+    MaterialSummary,
+    ProjectStatusSummary,
+    ProjectSummary,
+)
+from ..models.employee import Employee
+from ..models.material import Material
+from ..models.project import Project
+
+# Bucket for rows without a status, since a None key cannot be serialized.
+UNKNOWN_STATUS = "unknown"
+
+
+async def get_dashboard_summary_db(db: AsyncSession) -> DashboardSummary:
+    employee_status = func.coalesce(Employee.status, UNKNOWN_STATUS)
+    employees_by_status = dict((await db.execute(
+        select(employee_status, func.count()).group_by(employee_status)
+    )).all())
+    employees_by_department = dict((await db.execute(
+        select(Employee.department, func.count()).group_by(Employee.department)
+    )).all())
+
+    project_status = func.coalesce(Project.status, UNKNOWN_STATUS)
+    project_rows = (await db.execute(
+        select(project_status, func.count(), func.avg(Project.computed_progress))
+        .group_by(project_status)
+    )).all()
+
+    materials = (await db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(Material.total_value), 0.0),
+            func.count().filter(Material.is_low_stock),
+            func.count().filter(Material.quantity <= 0),
+        )
+    )).one()
+
+    return DashboardSummary(
+        employees=EmployeeSummary(
+            total=sum(employees_by_status.values()),
+            by_status=employees_by_status,
+            by_department=employees_by_department,
+        ),
+        projects=ProjectSummary(
+            total=sum(count for _, count, _ in project_rows),
+            by_status={
+                status: ProjectStatusSummary(count=count, average_progress=average or 0.0)
+                for status, count, average in project_rows
+            },
+        ),
+        materials=MaterialSummary(
+            total=materials[0],
+            total_inventory_value=materials[1],
+            low_stock=materials[2],
+            out_of_stock=materials[3],
+        ),
+    )
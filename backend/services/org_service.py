@@ -0,0 +1,194 @@
+from typing import List, Optional
+
+from sqlalchemy import String, cast, func, literal, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.employee import Employee, TeamRollup
+from ..models.performance import EmployeePerformanceSummary
+
+# Guards the recursive queries against a supervisor cycle in legacy data.
+MAX_ORG_DEPTH = 100
+
+
+class OrgCycleError(ValueError):
+    pass
+
+
+def _subtree_cte(root_id: int, max_depth: int = MAX_ORG_DEPTH):
+    tree = (
+        select(Employee.id, literal(0).label("depth"))
+        .where(Employee.id == root_id)
+        .cte("subtree", recursive=True)
+    )
+    return tree.union_all(
+        select(Employee.id, tree.c.depth + 1)
+        .where(Employee.supervisor_id == tree.c.id, tree.c.depth < max_depth)
+    )
+
+
+async def get_subtree_db(
+    db: AsyncSession,
+    employee_id: int,
+    max_depth: int = MAX_ORG_DEPTH
+) -> Optional[List[dict]]:
+    """Everyone below `employee_id`, breadth first; None if the employee does not exist."""
+    tree = _subtree_cte(employee_id, max_depth)
+    result = await db.execute(
+        select(Employee, tree.c.depth)
+        .join(tree, Employee.id == tree.c.id)
+        .order_by(tree.c.depth, Employee.id)
+    )
+    rows = [{**employee.to_dict(), "depth": depth} for employee, depth in result]
+    # The root row (depth 0) is only selected to tell "no reports" from "no such employee".
+    return rows[1:] if rows else None
+
+
+def _chain_cte(employee_id: int):
+    chain = (
+        select(Employee.id, Employee.supervisor_id, literal(0).label("depth"))
+        .where(Employee.id == employee_id)
+        .cte("chain", recursive=True)
+    )
+    return chain.union_all(
+        select(Employee.id, Employee.supervisor_id, chain.c.depth + 1)
+        .where(Employee.id == chain.c.supervisor_id, chain.c.depth < MAX_ORG_DEPTH)
+    )
+
+
+async def get_ancestors_db(db: AsyncSession, employee_id: int) -> Optional[List[dict]]:
+    chain = _chain_cte(employee_id)
+    result = await db.execute(
+        select(Employee, chain.c.depth)
+        .join(chain, Employee.id == chain.c.id)
+        .order_by(chain.c.depth)
+    )
+    rows = [{**employee.to_dict(), "depth": depth} for employee, depth in result]
+    return rows[1:] if rows else None
+
+
+async def get_team_rollup_db(db: AsyncSession, employee_id: int, include_self: bool = False) -> Optional[TeamRollup]:
+    tree = _subtree_cte(employee_id)
+    hours = func.coalesce(EmployeePerformanceSummary.total_hours_worked, Employee.total_hours_worked, 0.0)
+    member = true() if include_self else tree.c.depth > 0
+    found, headcount, total_hours, average, max_depth = (await db.execute(
+        select(
+            func.count(),
+            func.count().filter(member),
+            func.sum(hours).filter(member),
+            func.avg(Employee.performance_score).filter(member),
+            func.max(tree.c.depth),
+        )
+        .select_from(tree)
+        .join(Employee, Employee.id == tree.c.id)
+        .outerjoin(EmployeePerformanceSummary, EmployeePerformanceSummary.employee_id == Employee.id)
+    )).one()
+    if not found:
+        return None
+    return TeamRollup(
+        employee_id=employee_id,
+        headcount=headcount,
+        total_hours_worked=total_hours or 0.0,
+        average_performance=average,
+        max_depth=max_depth,
+    )
+
+
+async def is_in_subtree_db(db: AsyncSession, supervisor_id: int, employee_id: int) -> Optional[bool]:
+    """Constant-time membership check using the materialized paths."""
+    result = await db.execute(
+        select(Employee.id, Employee.org_path).where(Employee.id.in_((supervisor_id, employee_id)))
+    )
+    paths = dict(result.all())
+    if supervisor_id not in paths or employee_id not in paths:
+        return None
+    if not paths[supervisor_id] or not paths[employee_id]:
+        return None
+    return supervisor_id != employee_id and paths[employee_id].startswith(paths[supervisor_id])
+
+
+async def supervisor_path(db: AsyncSession, supervisor_id: Optional[int]) -> str:
+    """The org path new reports of `supervisor_id` hang under ("/" for none).
+
+    A supervisor whose own path was never set (legacy rows) gets it rebuilt
+    from the chain of command first. Raises LookupError for an unknown
+    supervisor and OrgCycleError if that chain loops.
+    """
+    if supervisor_id is None:
+        return "/"
+    found = (await db.execute(
+        select(Employee.id, Employee.org_path).where(Employee.id == supervisor_id)
+    )).one_or_none()
+    if found is None:
+        raise LookupError(f"Unknown supervisor id: {supervisor_id}")
+    if found.org_path:
+        return found.org_path
+
+    chain = _chain_cte(supervisor_id)
+    rows = (await db.execute(select(chain.c.id, chain.c.supervisor_id).order_by(chain.c.depth.desc()))).all()
+    if rows[0].supervisor_id is not None:
+        # The walk stopped at MAX_ORG_DEPTH without reaching the top.
+        raise OrgCycleError(f"Supervisor {supervisor_id} has a cycle in their reporting line")
+    path = "/" + "".join(f"{row.id}/" for row in rows)
+    await db.execute(
+        update(Employee)
+        .where(Employee.id == supervisor_id)
+        .values(org_path=path)
+        .execution_options(synchronize_session=False)
+    )
+    return path
+
+
+async def sync_org_path(db: AsyncSession, employee: Employee, parent_path: Optional[str] = None) -> None:
+    """Recompute `employee.org_path` after a supervisor change and rewrite its subtree.
+
+    Must run after the employee has an id and before the transaction commits.
+    Pass `parent_path` when `supervisor_path` was already called for this
+    supervisor. Raises LookupError for an unknown supervisor and OrgCycleError
+    if the new supervisor reports to this employee.
+    """
+    if parent_path is None:
+        parent_path = await supervisor_path(db, employee.supervisor_id)
+    new_path = f"{parent_path}{employee.id}/"
+
+    old_path = (await db.execute(
+        select(Employee.org_path).where(Employee.id == employee.id)
+    )).scalar_one_or_none()
+    if old_path == new_path:
+        return
+    if employee.supervisor_id == employee.id or (old_path and parent_path.startswith(old_path)):
+        raise OrgCycleError("An employee cannot report to someone in their own reporting line")
+
+    if old_path:
+        await db.execute(
+            update(Employee)
+            .where(Employee.org_path.startswith(old_path, autoescape=True))
+            .values(org_path=new_path + func.substr(Employee.org_path, len(old_path) + 1))
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        await db.execute(
+            update(Employee)
+            .where(Employee.id == employee.id)
+            .values(org_path=new_path)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def rebuild_org_paths(db: AsyncSession) -> int:
+    tree = (
+        select(Employee.id, ("/" + cast(Employee.id, String) + "/").label("path"), literal(0).label("depth"))
+        .where(Employee.supervisor_id.is_(None))
+        .cte("org_tree", recursive=True)
+    )
+    tree = tree.union_all(
+        select(Employee.id, tree.c.path + cast(Employee.id, String) + "/", tree.c.depth + 1)
+        .where(Employee.supervisor_id == tree.c.id, tree.c.depth < MAX_ORG_DEPTH)
+    )
+    result = await db.execute(
+        update(Employee)
+        .where(Employee.id == tree.c.id)
+        .values(org_path=tree.c.path)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,192 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, event, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from ..config import settings
+from ..database import dialect_insert
+from ..models.employee import Employee, EmployeePerformance, PerformancePeriod
+from ..models.performance import EmployeePerformanceSummary, EmployeePerformancePeriod
+from ..models.time_entry import TimeEntryWeekly
+
+PERIODS_RETURNED = 12
+
+
+def period_start_for(moment: datetime) -> date:
+    day = moment.date()
+    return day - timedelta(days=day.weekday())
+
+
+def _apply_event(connection, employee_id: int, event: dict, period_start: date) -> None:
+    insert_ = dialect_insert(connection.dialect.name)
+    hours = event.get("hours", 0.0)
+    score = event.get("score")
+
+    summary = insert_(EmployeePerformanceSummary).values(
+        employee_id=employee_id,
+        total_hours_worked=hours,
+        current_score=score,
+        score_updates=1 if score is not None else 0,
+    )
+    summary_set = {
+        "total_hours_worked": EmployeePerformanceSummary.total_hours_worked + hours,
+        "updated_at": func.now(),
+    }
+    if score is not None:
+        summary_set.update(
+            previous_score=EmployeePerformanceSummary.current_score,
+            current_score=score,
+            score_updates=EmployeePerformanceSummary.score_updates + 1,
+        )
+    connection.execute(summary.on_conflict_do_update(index_elements=["employee_id"], set_=summary_set))
+
+    period = insert_(EmployeePerformancePeriod).values(
+        employee_id=employee_id,
+        period_start=period_start,
+        hours_worked=hours,
+        direct_hours=hours,
+        score_sum=score or 0.0,
+        score_count=1 if score is not None else 0,
+    )
+    connection.execute(period.on_conflict_do_update(
+        index_elements=["employee_id", "period_start"],
+        set_={
+            "hours_worked": EmployeePerformancePeriod.hours_worked + hours,
+            "direct_hours": EmployeePerformancePeriod.direct_hours + hours,
+            "score_sum": EmployeePerformancePeriod.score_sum + (score or 0.0),
+            "score_count": EmployeePerformancePeriod.score_count + (1 if score is not None else 0),
+            "updated_at": func.now(),
+        },
+    ))
+
+
+@event.listens_for(Session, "after_flush")
+def _roll_up_performance_events(session: Session, flush_context) -> None:
+    period_start = period_start_for(datetime.utcnow())
+    for obj in session.new | session.dirty:
+        if not isinstance(obj, Employee):
+            continue
+        pending = obj.__dict__.pop("_pending_performance", None)
+        if not pending:
+            continue
+        connection = session.connection()
+        for performance_event in pending:
+            _apply_event(connection, obj.id, performance_event, period_start)
+
+
+async def add_hours_to_rollups(db: AsyncSession, hours_by_period: Dict[Tuple[int, date], float]) -> None:
+    """Fold batched hours into the rollups with one upsert per table."""
+    if not hours_by_period:
+        return
+    insert_ = dialect_insert(db.bind.dialect.name)
+
+    periods = insert_(EmployeePerformancePeriod).values([
+        {"employee_id": employee_id, "period_start": period_start, "hours_worked": hours}
+        for (employee_id, period_start), hours in sorted(hours_by_period.items())
+    ])
+    await db.execute(periods.on_conflict_do_update(
+        index_elements=["employee_id", "period_start"],
+        set_={
+            "hours_worked": EmployeePerformancePeriod.hours_worked + periods.excluded.hours_worked,
+            "updated_at": func.now(),
+        },
+    ))
+
+    totals: Dict[int, float] = {}
+    for (employee_id, _), hours in hours_by_period.items():
+        totals[employee_id] = totals.get(employee_id, 0.0) + hours
+    summaries = insert_(EmployeePerformanceSummary).values([
+        {"employee_id": employee_id, "total_hours_worked": hours}
+        for employee_id, hours in sorted(totals.items())
+    ])
+    await db.execute(summaries.on_conflict_do_update(
+        index_elements=["employee_id"],
+        set_={
+            "total_hours_worked": EmployeePerformanceSummary.total_hours_worked + summaries.excluded.total_hours_worked,
+            "updated_at": func.now(),
+        },
+    ))
+
+
+async def get_performance_metrics_db(db: AsyncSession, employee_id: int) -> Optional[EmployeePerformance]:
+    result = await db.execute(
+        select(EmployeePerformanceSummary, EmployeePerformancePeriod)
+        .outerjoin(
+            EmployeePerformancePeriod,
+            EmployeePerformancePeriod.employee_id == EmployeePerformanceSummary.employee_id
+        )
+        .filter(EmployeePerformanceSummary.employee_id == employee_id)
+        .order_by(EmployeePerformancePeriod.period_start.desc())
+        .limit(PERIODS_RETURNED)
+    )
+    rows = result.all()
+    if not rows:
+        return None
+
+    summary = rows[0][0]
+    periods = [
+        PerformancePeriod(
+            period_start=period.period_start,
+            hours_worked=period.hours_worked,
+            utilization=period.hours_worked / settings.STANDARD_WEEKLY_HOURS,
+            average_score=period.average_score,
+        )
+        for _, period in rows if period is not None
+    ]
+    return EmployeePerformance(
+        employee_id=employee_id,
+        total_hours_worked=summary.total_hours_worked,
+        performance_score=summary.current_score,
+        score_trend=summary.score_trend,
+        utilization=periods[0].utilization if periods else 0.0,
+        periods=periods,
+    )
+
+
+async def rebuild_performance_rollups(db: AsyncSession) -> int:
+    """Recompute the rollups from the employees table and the time-entry ledger.
+
+    Summary hours are `Employee.total_hours_worked` plus everything in the
+    ledger; period hours are reset to each period's direct hours plus its
+    weekly ledger bucket. So the summary equals the sum of the periods plus
+    any hours recorded before the rollups existed, which belong to no period.
+    Score history lives only in the period rows, so scores are preserved.
+    """
+    ledger_hours = (
+        select(TimeEntryWeekly.employee_id, func.sum(TimeEntryWeekly.hours).label("hours"))
+        .group_by(TimeEntryWeekly.employee_id)
+        .subquery()
+    )
+    await db.execute(delete(EmployeePerformanceSummary))
+    result = await db.execute(
+        insert(EmployeePerformanceSummary).from_select(
+            ["employee_id", "total_hours_worked", "current_score", "previous_score", "score_updates"],
+            select(
+                Employee.id,
+                func.coalesce(Employee.total_hours_worked, 0.0) + func.coalesce(ledger_hours.c.hours, 0.0),
+                Employee.performance_score,
+                Employee.performance_score,
+                literal(0),
+            ).outerjoin(ledger_hours, ledger_hours.c.employee_id == Employee.id)
+        )
+    )
+
+    await db.execute(update(EmployeePerformancePeriod).values(hours_worked=EmployeePerformancePeriod.direct_hours))
+    insert_ = dialect_insert(db.bind.dialect.name)
+    periods = insert_(EmployeePerformancePeriod).from_select(
+        ["employee_id", "period_start", "hours_worked"],
+        select(TimeEntryWeekly.employee_id, TimeEntryWeekly.bucket, func.sum(TimeEntryWeekly.hours))
+        .group_by(TimeEntryWeekly.employee_id, TimeEntryWeekly.bucket)
+    )
+    await db.execute(periods.on_conflict_do_update(
+        index_elements=["employee_id", "period_start"],
+        set_={
+            "hours_worked": EmployeePerformancePeriod.direct_hours + periods.excluded.hours_worked,
+            "updated_at": func.now(),
+        },
+    ))
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,146 @@
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import dialect_insert
+from ..models.employee import Employee
+from ..models.material import Material, ProjectMaterial
+from ..models.project import Project, ProjectBudget, ProjectCost
+from ..models.time_entry import TimeEntry
+
+
+async def add_labour_costs(db: AsyncSession, labour_by_project: Dict[int, float]) -> None:
+    """Add labour spend to the rollups in the caller's transaction."""
+    if not labour_by_project:
+        return
+    insert_ = dialect_insert(db.bind.dialect.name)
+    statement = insert_(ProjectCost).values([
+        {"project_id": project_id, "material_cost": 0.0, "labour_cost": amount}
+        for project_id, amount in sorted(labour_by_project.items())
+    ])
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=["project_id"],
+        set_={
+            "labour_cost": ProjectCost.labour_cost + statement.excluded.labour_cost,
+            "updated_at": func.now(),
+        },
+    ))
+
+
+async def refresh_material_costs(db: AsyncSession, project_ids: Iterable[int]) -> None:
+    """Recompute material spend for just these projects from their usage rows.
+
+    Usage updates are capped server-side, so the applied delta is not known
+    up front; re-summing the (indexed) usage rows of the touched projects is
+    both exact and cheap.
+    """
+    project_ids = sorted(set(project_ids))
+    if not project_ids:
+        return
+    insert_ = dialect_insert(db.bind.dialect.name)
+    statement = insert_(ProjectCost).from_select(
+        ["project_id", "material_cost", "labour_cost"],
+        select(
+            ProjectMaterial.project_id,
+            func.coalesce(func.sum(func.coalesce(ProjectMaterial.quantity_used, 0) * Material.price_per_unit), 0.0),
+            0.0,
+        )
+        .join(Material, Material.id == ProjectMaterial.material_id)
+        .where(ProjectMaterial.project_id.in_(project_ids))
+        .group_by(ProjectMaterial.project_id)
+    )
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=["project_id"],
+        set_={"material_cost": statement.excluded.material_cost, "updated_at": func.now()},
+    ))
+
+
+async def refresh_costs_for_materials(db: AsyncSession, material_ids: Iterable[int]) -> None:
+    """Re-sum material spend on every project using these materials, e.g. after a price change."""
+    material_ids = set(material_ids)
+    if not material_ids:
+        return
+    result = await db.execute(
+        select(ProjectMaterial.project_id).where(ProjectMaterial.material_id.in_(material_ids)).distinct()
+    )
+    await refresh_material_costs(db, result.scalars())
+
+
+def _budget_query():
+    total = func.coalesce(ProjectCost.material_cost, 0.0) + func.coalesce(ProjectCost.labour_cost, 0.0)
+    return select(
+        Project.id,
+        Project.name,
+        Project.budget,
+        func.coalesce(ProjectCost.material_cost, 0.0).label("material_cost"),
+        func.coalesce(ProjectCost.labour_cost, 0.0).label("labour_cost"),
+        total.label("total_cost"),
+    ).outerjoin(ProjectCost, ProjectCost.project_id == Project.id), total
+
+
+def _to_budget(row) -> ProjectBudget:
+    return ProjectBudget(
+        project_id=row.id,
+        name=row.name,
+        budget=row.budget,
+        material_cost=row.material_cost,
+        labour_cost=row.labour_cost,
+        total_cost=row.total_cost,
+        remaining=row.budget - row.total_cost,
+        burn_ratio=row.total_cost / row.budget if row.budget else None,
+        over_budget=row.total_cost > row.budget,
+    )
+
+
+async def get_project_budget_db(db: AsyncSession, project_id: int) -> Optional[ProjectBudget]:
+    query, _ = _budget_query()
+    row = (await db.execute(query.where(Project.id == project_id))).one_or_none()
+    return _to_budget(row) if row else None
+
+
+async def get_projects_over_budget_db(db: AsyncSession, threshold: float = 1.0) -> List[ProjectBudget]:
+    """Projects whose spend exceeds `threshold` x budget, worst burn first."""
+    query, total = _budget_query()
+    # Inner join: projects without any recorded spend cannot be over budget.
+    query = query.where(ProjectCost.project_id.is_not(None), total > Project.budget * threshold)
+    result = await db.execute(query.order_by((total / func.nullif(Project.budget, 0)).desc().nulls_first()))
+    return [_to_budget(row) for row in result]
+
+
+async def rebuild_project_costs(db: AsyncSession) -> int:
+    """Recompute every rollup from usage rows and the time-entry ledger.
+
+    Labour is valued at each employee's current hourly rate here, whereas the
+    incremental path uses the rate at the time the hours were recorded.
+    """
+    materials = (
+        select(
+            ProjectMaterial.project_id.label("project_id"),
+            func.sum(func.coalesce(ProjectMaterial.quantity_used, 0) * Material.price_per_unit).label("cost"),
+        )
+        .join(Material, Material.id == ProjectMaterial.material_id)
+        .group_by(ProjectMaterial.project_id)
+        .subquery()
+    )
+    labour = (
+        select(
+            TimeEntry.project_id.label("project_id"),
+            func.sum(TimeEntry.hours * Employee.hourly_rate).label("cost"),
+        )
+        .join(Employee, Employee.id == TimeEntry.employee_id)
+        .where(TimeEntry.project_id.is_not(None))
+        .group_by(TimeEntry.project_id)
+        .subquery()
+    )
+    await db.execute(delete(ProjectCost))
+    result = await db.execute(
+        insert(ProjectCost).from_select(
+            ["project_id", "material_cost", "labour_cost"],
+            select(Project.id, func.coalesce(materials.c.cost, 0.0), func.coalesce(labour.c.cost, 0.0))
+            .outerjoin(materials, materials.c.project_id == Project.id)
+            .outerjoin(labour, labour.c.project_id == Project.id)
+        )
+    )
+    await db.commit()
+    return result.rowcount
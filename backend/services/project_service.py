@@ -0,0 +1,105 @@
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import with_expression
+
+from ..pagination import paginate, split_page
+from ..models.project import Project, ProjectCreate, ProjectUpdate, ProjectProgress
+
+# Evaluated by the database alongside each row; see Project.scheduled_progress.
+WITH_SCHEDULED_PROGRESS = with_expression(Project.scheduled_progress, Project.computed_progress)
+
+
+async def create_project_db(db: AsyncSession, project: ProjectCreate) -> Project:
+    db_project = Project(**project.dict())
+    db.add(db_project)
+    await db.commit()
+    await db.refresh(db_project)
+    return db_project
+
+
+async def get_project_db(db: AsyncSession, project_id: int, options: Sequence = ()) -> Optional[Project]:
+    return await db.get(Project, project_id, options=(WITH_SCHEDULED_PROGRESS, *options))
+
+
+async def get_projects_db(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    options: Sequence = (),
+    sort: str = "id",
+    behind_schedule: Optional[bool] = None,
+    columns: Optional[Sequence] = None
+) -> Tuple[List, Optional[str]]:
+    """Page of projects, or of column-tuple rows when `columns` is given.
+
+    Raises ValueError for a cursor combined with a progress sort.
+    """
+    if columns is not None:
+        query = select(*columns)
+    else:
+        query = select(Project).options(WITH_SCHEDULED_PROGRESS, *options)
+    if status:
+        query = query.filter(Project.status == status)
+    if behind_schedule is not None:
+        query = query.filter(Project.behind_schedule if behind_schedule else ~Project.behind_schedule)
+    if sort == "id":
+        order = (Project.id,)
+        result = await db.execute(paginate(query, order, limit, skip, cursor))
+        return split_page(_rows(result, columns), order, limit)
+
+    # Computed progress moves with the clock, so a cursor taken from it would
+    # not be stable between requests; these sorts page by offset only.
+    if cursor:
+        raise ValueError("Cursor pagination is only supported when sorting by id")
+    progress = Project.computed_progress.desc() if sort.startswith("-") else Project.computed_progress
+    result = await db.execute(query.order_by(progress, Project.id).offset(skip).limit(limit))
+    return _rows(result, columns), None
+
+
+def _rows(result, columns: Optional[Sequence]) -> List:
+    return result.all() if columns is not None else result.scalars().all()
+
+
+async def update_project_db(
+    db: AsyncSession,
+    project_id: int,
+    project_update: ProjectUpdate
+) -> Optional[Project]:
+    db_project = await db.get(Project, project_id)
+    if not db_project:
+        return None
+
+    for key, value in project_update.dict(exclude_unset=True).items():
+        setattr(db_project, key, value)
+    await db.commit()
+    await db.refresh(db_project)
+    return db_project
+
+
+async def delete_project_db(db: AsyncSession, project_id: int) -> bool:
+    db_project = await db.get(Project, project_id)
+    if not db_project:
+        return False
+
+    await db.delete(db_project)
+    await db.commit()
+    return True
+
+
+async def update_project_progress_db(
+    db: AsyncSession,
+    project_id: int,
+    progress: ProjectProgress
+) -> Optional[ProjectProgress]:
+    db_project = await db.get(Project, project_id)
+    if not db_project:
+        return None
+
+    db_project.progress = progress.progress
+    db_project.update_status()
+    await db.commit()
+    return progress
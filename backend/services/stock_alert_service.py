@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from typing import List
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from ..database import AsyncSessionLocal, dialect_insert, engine
+from ..events import stock_alert_broadcaster
+from ..models.material import Material, MaterialStockAlert
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary advisory-lock key held by whichever worker runs the monitor.
+MONITOR_LOCK_KEY = 7_340_023
+
+
+async def check_low_stock_crossings(db: AsyncSession) -> List[dict]:
+    """Open alerts for materials that crossed below their threshold and re-arm recovered ones.
+
+    Only the inserting transaction gets a row back from ON CONFLICT DO NOTHING,
+    so each crossing is reported once even with several workers polling.
+    """
+    # IN (subquery) rather than DELETE ... USING, which SQLite lacks.
+    await db.execute(
+        delete(MaterialStockAlert)
+        .where(MaterialStockAlert.material_id.in_(
+            select(Material.id).filter(Material.quantity > Material.min_quantity)
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+    insert_ = dialect_insert(db.bind.dialect.name)
+    result = await db.execute(
+        insert_(MaterialStockAlert)
+        .from_select(
+            ["material_id", "quantity", "min_quantity"],
+            select(Material.id, Material.quantity, Material.min_quantity).filter(Material.is_low_stock)
+        )
+        .on_conflict_do_nothing(index_elements=["material_id"])
+        .returning(MaterialStockAlert.material_id, MaterialStockAlert.quantity, MaterialStockAlert.min_quantity)
+    )
+    crossings = [
+        {"material_id": row.material_id, "quantity": row.quantity, "min_quantity": row.min_quantity}
+        for row in result
+    ]
+    await db.commit()
+    return crossings
+
+
+async def check_and_publish() -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            for alert in await check_low_stock_crossings(session):
+                logger.warning("Material %(material_id)s is low on stock (%(quantity)s <= %(min_quantity)s)", alert)
+                stock_alert_broadcaster.publish(alert)
+    except Exception:
+        logger.exception("Low-stock check failed")
+
+
+async def try_lead(conn: AsyncConnection) -> bool:
+    """Take the monitor lock on `conn` if no other worker holds it (always True off Postgres)."""
+    if conn.dialect.name != "postgresql":
+        return True
+    acquired = (await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": MONITOR_LOCK_KEY})).scalar_one()
+    # The lock belongs to the session, so ending the transaction keeps it.
+    await conn.commit()
+    return acquired
+
+
+async def release_lead(conn: AsyncConnection) -> None:
+    # A pooled connection would keep the session-level lock after being
+    # returned, so close it for real and let the server drop the lock.
+    await conn.invalidate()
+
+
+async def run_low_stock_monitor(interval: float) -> None:
+    """Check for crossings every `interval` seconds, in one worker at a time.
+
+    Every worker runs this, but only the one holding the advisory lock checks.
+    The lock lives as long as that worker's connection, and the others retry
+    each interval, so a standby takes over when the leader exits or its
+    connection drops.
+    """
+    while True:
+        try:
+            async with engine.connect() as conn:
+                if await try_lead(conn):
+                    logger.info("Running the low-stock monitor in this worker")
+                    try:
+                        while True:
+                            await check_and_publish()
+                            await asyncio.sleep(interval)
+                            # Fails once the lock's session is gone, handing leadership back.
+                            await conn.execute(text("SELECT 1"))
+                            await conn.commit()
+                    finally:
+                        await release_lead(conn)
+        except Exception:
+            logger.exception("Low-stock monitor lost its database connection")
+        await asyncio.sleep(interval)
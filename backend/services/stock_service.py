@@ -0,0 +1,127 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, and_, bindparam, case, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.material import Material, ProjectMaterial, StockLevel, StockMovement, StockMovementCreate
+from .project_cost_service import refresh_material_costs
+
+
+async def _lock_materials(db: AsyncSession, movements: List[StockMovementCreate]) -> Dict[int, Tuple[str, float]]:
+    """Lock the batch's materials and return `{id: (sku, quantity)}` as of the lock.
+
+    The rows are claimed by a touching UPDATE whose subquery selects them
+    FOR UPDATE in id order, so parallel batches queue instead of deadlocking
+    on Postgres; on SQLite the UPDATE takes the database write lock. Either
+    way the quantities read here cannot change until this transaction ends.
+    """
+    ids = {m.material_id for m in movements if m.material_id is not None}
+    skus = {m.sku for m in movements if m.material_id is None}
+    targets = (
+        select(Material.id)
+        .filter(or_(Material.id.in_(ids), Material.sku.in_(skus)))
+        .order_by(Material.id)
+        .with_for_update()
+    )
+    result = await db.execute(
+        update(Material)
+        .where(Material.id.in_(targets))
+        .values(last_updated=func.now())
+        .returning(Material.id, Material.sku, Material.quantity)
+        .execution_options(synchronize_session=False)
+    )
+    locked = {row.id: (row.sku, row.quantity or 0.0) for row in result}
+    id_by_sku = {sku: material_id for material_id, (sku, _) in locked.items()}
+
+    missing = sorted(str(i) for i in ids - locked.keys()) + sorted(skus - id_by_sku.keys())
+    if missing:
+        raise LookupError(f"Unknown materials: {', '.join(missing)}")
+    return locked
+
+
+async def apply_stock_movements_db(db: AsyncSession, movements: List[StockMovementCreate]) -> List[StockLevel]:
+    """Apply a batch of quantity deltas in one transaction with set-based updates.
+
+    Movements are applied in order and a material never drops below zero, so
+    each logged movement records the level right after it. Raises
+    LookupError if any material cannot be found.
+    """
+    locked = await _lock_materials(db, movements)
+    id_by_sku = {sku: material_id for material_id, (sku, _) in locked.items()}
+
+    level: Dict[int, float] = {material_id: quantity for material_id, (_, quantity) in locked.items()}
+    usage: Dict[Tuple[int, int], float] = defaultdict(float)
+    log = []
+    for movement in movements:
+        material_id = movement.material_id if movement.material_id is not None else id_by_sku[movement.sku]
+        level[material_id] = max(0.0, level[material_id] + movement.delta)
+        if movement.project_id is not None and movement.delta < 0:
+            usage[(movement.project_id, material_id)] -= movement.delta
+        log.append({
+            "material_id": material_id,
+            "project_id": movement.project_id,
+            "delta": movement.delta,
+            "quantity_after": level[material_id],
+            "reason": movement.reason,
+        })
+
+    touched = sorted({entry["material_id"] for entry in log})
+    # The rows are locked, so the levels computed above can be written as-is.
+    await db.execute(
+        # Core table, so this runs as a plain executemany rather than an ORM bulk update.
+        update(Material.__table__)
+        .where(Material.id == bindparam("target_id"))
+        .values(quantity=bindparam("target_quantity"), last_updated=func.now()),
+        [{"target_id": material_id, "target_quantity": level[material_id]} for material_id in touched]
+    )
+    levels = {
+        material_id: StockLevel(material_id=material_id, sku=locked[material_id][0], quantity=level[material_id])
+        for material_id in touched
+    }
+
+    if usage:
+        used = func.coalesce(ProjectMaterial.quantity_used, 0) + bindparam("used", type_=Float)
+        await db.execute(
+            update(ProjectMaterial.__table__)
+            .where(and_(
+                ProjectMaterial.project_id == bindparam("target_project_id"),
+                ProjectMaterial.material_id == bindparam("target_material_id")
+            ))
+            .values(
+                # CASE rather than least(), which SQLite lacks.
+                quantity_used=case(
+                    (used > ProjectMaterial.quantity_allocated, ProjectMaterial.quantity_allocated),
+                    else_=used
+                ),
+                updated_at=func.now()
+            ),
+            [
+                {"target_project_id": project_id, "target_material_id": material_id, "used": amount}
+                for (project_id, material_id), amount in sorted(usage.items())
+            ]
+        )
+        await refresh_material_costs(db, (project_id for project_id, _ in usage))
+
+    await db.execute(insert(StockMovement), log)
+    await db.commit()
+    return [levels[material_id] for material_id in touched]
+
+
+async def adjust_stock(
+    db: AsyncSession,
+    material: Material,
+    amount: float,
+    project_id: Optional[int] = None,
+    reason: Optional[str] = None
+) -> Material:
+    """Apply one movement to `material` and reload it so its attributes are current.
+
+    Use this instead of assigning to `Material.quantity` directly: the update
+    is locked, floored at zero and logged like any batch movement.
+    """
+    await apply_stock_movements_db(db, [
+        StockMovementCreate(material_id=material.id, delta=amount, project_id=project_id, reason=reason)
+    ])
+    await db.refresh(material)
+    return material
@@ -0,0 +1,370 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, bindparam, case, delete, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import dialect_insert, escape_like
+from ..models.material import Material
+from ..models.supplier import (
+    MaterialPriceComparison,
+    PriceComparison,
+    Supplier,
+    SupplierPrice,
+    SupplierPriceCreate,
+    SupplierPriceSummary,
+    SupplierQuote,
+)
+from ..pagination import paginate, split_page
+from .project_cost_service import refresh_costs_for_materials
+
+# Relative change below which a price is reported as flat.
+TREND_TOLERANCE = 0.01
+REBUILD_CHUNK_SIZE = 1000
+# Arbitrary advisory-lock namespace for per-SKU comparison refreshes.
+PRICE_LOCK_KEY = 7_340_022
+
+# Locks are taken in SKU order (volatile target-list functions run after the
+# sort), so overlapping batches queue rather than deadlock.
+LOCK_SKUS_SQL = text(
+    "SELECT pg_advisory_xact_lock(:key, hashtext(sku)) "
+    "FROM unnest(CAST(:skus AS text[])) AS sku ORDER BY sku"
+)
+
+
+async def _resolve_names(db: AsyncSession, prices: List[SupplierPriceCreate]) -> Dict[str, str]:
+    supplier_ids = {price.supplier_id for price in prices}
+    found = set((await db.execute(select(Supplier.id).where(Supplier.id.in_(supplier_ids)))).scalars())
+    missing = sorted(supplier_ids - found)
+    if missing:
+        raise LookupError(f"Unknown suppliers: {', '.join(map(str, missing))}")
+
+    unnamed = {price.sku for price in prices if not price.material_name}
+    if not unnamed:
+        return {}
+    result = await db.execute(select(Material.sku, Material.name).where(Material.sku.in_(unnamed)))
+    names = {row.sku: row.name for row in result}
+    missing_skus = sorted(unnamed - names.keys())
+    if missing_skus:
+        raise LookupError(f"material_name is required for unknown SKUs: {', '.join(missing_skus)}")
+    return names
+
+
+async def _apply_material_prices(db: AsyncSession, current: Dict[Tuple[str, int], float]) -> None:
+    """Move materials bought from a supplier onto its new `current` price and re-cost their projects."""
+    result = await db.execute(
+        select(Material.id, Material.sku, Material.supplier_id, Material.price_per_unit)
+        .where(Material.sku.in_({sku for sku, _ in current}))
+    )
+    changed = [
+        {"target_id": row.id, "target_price": current[(row.sku, row.supplier_id)]}
+        for row in result
+        if (row.sku, row.supplier_id) in current and row.price_per_unit != current[(row.sku, row.supplier_id)]
+    ]
+    if not changed:
+        return
+    await db.execute(
+        update(Material.__table__)
+        .where(Material.id == bindparam("target_id"))
+        .values(price_per_unit=bindparam("target_price"), last_updated=func.now()),
+        changed,
+    )
+    await refresh_costs_for_materials(db, (row["target_id"] for row in changed))
+
+
+async def record_prices(db: AsyncSession, prices: List[SupplierPriceCreate]) -> Set[str]:
+    """Log prices and fold them into the summaries in the caller's transaction.
+
+    Within a batch the latest `recorded_at` per (SKU, supplier) becomes the
+    current price; across batches the most recently submitted price wins, so
+    backfilled history needs `rebuild_price_comparisons`. A material bought
+    from the quoting supplier takes that current price as its own, and the
+    material costs of projects using it are re-summed. Raises LookupError
+    for unknown suppliers, or unknown SKUs submitted without a name.
+    """
+    names = await _resolve_names(db, prices)
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "supplier_id": price.supplier_id,
+            "sku": price.sku,
+            "material_name": price.material_name or names[price.sku],
+            "price_per_unit": price.price_per_unit,
+            "recorded_at": price.recorded_at or now,
+        }
+        for price in prices
+    ]
+    await db.execute(insert(SupplierPrice), rows)
+
+    by_pair: Dict[Tuple[str, int], list] = defaultdict(list)
+    for row in rows:
+        by_pair[(row["sku"], row["supplier_id"])].append(row)
+
+    summaries = []
+    for (sku, supplier_id), observed in sorted(by_pair.items()):
+        observed.sort(key=lambda row: row["recorded_at"])
+        prices_seen = [row["price_per_unit"] for row in observed]
+        summaries.append({
+            "sku": sku,
+            "supplier_id": supplier_id,
+            "material_name": observed[-1]["material_name"],
+            "current_price": prices_seen[-1],
+            "previous_price": prices_seen[-2] if len(prices_seen) > 1 else None,
+            "min_price": min(prices_seen),
+            "max_price": max(prices_seen),
+            "observations": len(prices_seen),
+            "last_recorded": observed[-1]["recorded_at"],
+        })
+
+    insert_ = dialect_insert(db.bind.dialect.name)
+    statement = insert_(SupplierPriceSummary).values(summaries)
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=["sku", "supplier_id"],
+        set_={
+            "material_name": statement.excluded.material_name,
+            "current_price": statement.excluded.current_price,
+            "previous_price": func.coalesce(statement.excluded.previous_price, SupplierPriceSummary.current_price),
+            # CASE rather than least()/greatest(), which SQLite lacks.
+            "min_price": case(
+                (statement.excluded.min_price < SupplierPriceSummary.min_price, statement.excluded.min_price),
+                else_=SupplierPriceSummary.min_price
+            ),
+            "max_price": case(
+                (statement.excluded.max_price > SupplierPriceSummary.max_price, statement.excluded.max_price),
+                else_=SupplierPriceSummary.max_price
+            ),
+            "observations": SupplierPriceSummary.observations + statement.excluded.observations,
+            "last_recorded": statement.excluded.last_recorded,
+            "updated_at": func.now(),
+        },
+    ))
+
+    await _apply_material_prices(db, {(row["sku"], row["supplier_id"]): row["current_price"] for row in summaries})
+    skus = {sku for sku, _ in by_pair}
+    await refresh_price_comparisons(db, skus)
+    return skus
+
+
+async def record_prices_db(db: AsyncSession, prices: List[SupplierPriceCreate]) -> int:
+    skus = await record_prices(db, prices)
+    await db.commit()
+    return len(skus)
+
+
+async def record_material_price(db: AsyncSession, material: Material) -> None:
+    """Log a material's own supplier price, e.g. after a create or price change."""
+    if material.supplier_id is None or material.price_per_unit is None:
+        return
+    await record_prices(db, [SupplierPriceCreate(
+        supplier_id=material.supplier_id,
+        sku=material.sku,
+        material_name=material.name,
+        price_per_unit=material.price_per_unit,
+    )])
+
+
+async def refresh_price_comparisons(db: AsyncSession, skus: Iterable[str]) -> None:
+    """Recompute the comparison rows for just these SKUs from their summaries.
+
+    On Postgres each SKU is locked until the transaction ends first. A refresh
+    then runs only after earlier writers to the same SKU have committed, so it
+    aggregates their summaries too instead of overwriting them with a partial
+    view.
+    """
+    skus = sorted(set(skus))
+    if not skus:
+        return
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(LOCK_SKUS_SQL, {"key": PRICE_LOCK_KEY, "skus": skus})
+    change = (SupplierPriceSummary.current_price - SupplierPriceSummary.previous_price) / func.nullif(
+        SupplierPriceSummary.previous_price, 0
+    )
+    stats = (
+        select(
+            SupplierPriceSummary.sku.label("sku"),
+            func.max(SupplierPriceSummary.material_name).label("material_name"),
+            func.count().label("supplier_count"),
+            func.min(SupplierPriceSummary.current_price).label("cheapest_price"),
+            func.max(SupplierPriceSummary.current_price).label("highest_price"),
+            func.avg(SupplierPriceSummary.current_price).label("average_price"),
+            func.coalesce(func.avg(change), 0.0).label("trend"),
+        )
+        .where(SupplierPriceSummary.sku.in_(skus))
+        .group_by(SupplierPriceSummary.sku)
+        .subquery()
+    )
+    # Ties on price go to the lowest supplier id so the result is stable.
+    cheapest = (
+        select(SupplierPriceSummary.sku.label("sku"), func.min(SupplierPriceSummary.supplier_id).label("supplier_id"))
+        .join(stats, and_(
+            stats.c.sku == SupplierPriceSummary.sku,
+            stats.c.cheapest_price == SupplierPriceSummary.current_price,
+        ))
+        .group_by(SupplierPriceSummary.sku)
+        .subquery()
+    )
+    # An upsert rather than delete-then-insert: two transactions refreshing the
+    # same new SKU would otherwise both insert it and one would hit the key.
+    insert_ = dialect_insert(db.bind.dialect.name)
+    statement = insert_(MaterialPriceComparison).from_select(
+        [
+            "sku", "material_name", "supplier_count", "cheapest_supplier_id",
+            "cheapest_price", "highest_price", "average_price", "trend",
+        ],
+        select(
+            stats.c.sku, stats.c.material_name, stats.c.supplier_count, cheapest.c.supplier_id,
+            stats.c.cheapest_price, stats.c.highest_price, stats.c.average_price, stats.c.trend,
+        ).join(cheapest, cheapest.c.sku == stats.c.sku)
+    )
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=["sku"],
+        set_={
+            **{
+                name: statement.excluded[name]
+                for name in (
+                    "material_name", "supplier_count", "cheapest_supplier_id",
+                    "cheapest_price", "highest_price", "average_price", "trend",
+                )
+            },
+            "updated_at": func.now(),
+        },
+    ))
+
+
+def _trend_direction(trend: float) -> str:
+    if trend > TREND_TOLERANCE:
+        return "rising"
+    if trend < -TREND_TOLERANCE:
+        return "falling"
+    return "flat"
+
+
+def _to_comparison(row: MaterialPriceComparison, quotes: Optional[List[SupplierQuote]] = None) -> PriceComparison:
+    return PriceComparison(
+        sku=row.sku,
+        material_name=row.material_name,
+        supplier_count=row.supplier_count,
+        cheapest_supplier_id=row.cheapest_supplier_id,
+        cheapest_price=row.cheapest_price,
+        highest_price=row.highest_price,
+        spread=row.highest_price - row.cheapest_price,
+        average_price=row.average_price,
+        trend=row.trend,
+        trend_direction=_trend_direction(row.trend),
+        quotes=quotes,
+    )
+
+
+async def get_price_comparisons_db(
+    db: AsyncSession,
+    name: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[PriceComparison], Optional[str]]:
+    order = (MaterialPriceComparison.sku,)
+    query = select(MaterialPriceComparison)
+    if name:
+        query = query.where(MaterialPriceComparison.material_name.ilike(f"%{escape_like(name)}%", escape="\\"))
+    result = await db.execute(paginate(query, order, limit, cursor=cursor))
+    rows, next_cursor = split_page(result.scalars().all(), order, limit)
+    return [_to_comparison(row) for row in rows], next_cursor
+
+
+async def get_price_comparison_db(db: AsyncSession, sku: str) -> Optional[PriceComparison]:
+    row = await db.get(MaterialPriceComparison, sku)
+    if not row:
+        return None
+    result = await db.execute(
+        select(SupplierPriceSummary, Supplier.name)
+        .outerjoin(Supplier, Supplier.id == SupplierPriceSummary.supplier_id)
+        .where(SupplierPriceSummary.sku == sku)
+        .order_by(SupplierPriceSummary.current_price, SupplierPriceSummary.supplier_id)
+    )
+    quotes = [
+        SupplierQuote(
+            supplier_id=summary.supplier_id,
+            supplier_name=supplier_name,
+            current_price=summary.current_price,
+            previous_price=summary.previous_price,
+            min_price=summary.min_price,
+            max_price=summary.max_price,
+            last_recorded=summary.last_recorded,
+        )
+        for summary, supplier_name in result
+    ]
+    return _to_comparison(row, quotes)
+
+
+async def get_price_history_db(
+    db: AsyncSession,
+    sku: str,
+    supplier_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    limit: int = 500
+) -> List[dict]:
+    query = select(
+        SupplierPrice.supplier_id, SupplierPrice.price_per_unit, SupplierPrice.recorded_at
+    ).where(SupplierPrice.sku == sku)
+    if supplier_id is not None:
+        query = query.where(SupplierPrice.supplier_id == supplier_id)
+    if since is not None:
+        query = query.where(SupplierPrice.recorded_at >= since)
+    result = await db.execute(query.order_by(SupplierPrice.recorded_at.desc()).limit(limit))
+    return [
+        {"supplier_id": row.supplier_id, "price_per_unit": row.price_per_unit, "recorded_at": row.recorded_at}
+        for row in result
+    ]
+
+
+async def rebuild_price_comparisons(db: AsyncSession) -> int:
+    """Recompute every summary and comparison row from the price history."""
+    ranked = select(
+        SupplierPrice.sku,
+        SupplierPrice.supplier_id,
+        SupplierPrice.material_name,
+        SupplierPrice.price_per_unit,
+        SupplierPrice.recorded_at,
+        func.row_number().over(
+            partition_by=(SupplierPrice.sku, SupplierPrice.supplier_id),
+            order_by=(SupplierPrice.recorded_at.desc(), SupplierPrice.id.desc()),
+        ).label("rank"),
+    ).subquery()
+    totals = (
+        select(
+            SupplierPrice.sku.label("sku"),
+            SupplierPrice.supplier_id.label("supplier_id"),
+            func.min(SupplierPrice.price_per_unit).label("min_price"),
+            func.max(SupplierPrice.price_per_unit).label("max_price"),
+            func.count().label("observations"),
+        )
+        .group_by(SupplierPrice.sku, SupplierPrice.supplier_id)
+        .subquery()
+    )
+    latest = ranked.alias("latest")
+    previous = ranked.alias("previous")
+    await db.execute(delete(SupplierPriceSummary))
+    await db.execute(insert(SupplierPriceSummary).from_select(
+        [
+            "sku", "supplier_id", "material_name", "current_price", "previous_price",
+            "min_price", "max_price", "observations", "last_recorded",
+        ],
+        select(
+            latest.c.sku, latest.c.supplier_id, latest.c.material_name, latest.c.price_per_unit,
+            previous.c.price_per_unit, totals.c.min_price, totals.c.max_price, totals.c.observations,
+            latest.c.recorded_at,
+        )
+        .join(totals, and_(totals.c.sku == latest.c.sku, totals.c.supplier_id == latest.c.supplier_id))
+        .outerjoin(previous, and_(
+            previous.c.sku == latest.c.sku,
+            previous.c.supplier_id == latest.c.supplier_id,
+            previous.c.rank == 2,
+        ))
+        .where(latest.c.rank == 1)
+    ))
+    skus = (await db.execute(select(SupplierPriceSummary.sku).distinct())).scalars().all()
+    await db.execute(delete(MaterialPriceComparison))
+    for start in range(0, len(skus), REBUILD_CHUNK_SIZE):
+        await refresh_price_comparisons(db, skus[start:start + REBUILD_CHUNK_SIZE])
+    await db.commit()
+    return len(skus)
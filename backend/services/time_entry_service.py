@@ -0,0 +1,153 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import dialect_insert
+from ..models.employee import Employee
+from ..models.project import Project
+from ..models.time_entry import (
+    NO_PROJECT,
+    HoursBucket,
+    TimeEntry,
+    TimeEntryBatchResult,
+    TimeEntryCreate,
+    TimeEntryDaily,
+    TimeEntryWeekly,
+)
+from .performance_service import add_hours_to_rollups, period_start_for
+from .project_cost_service import add_labour_costs
+
+BucketKey = Tuple[date, int, int]
+
+
+async def _upsert_buckets(db: AsyncSession, model, buckets: Dict[BucketKey, list]) -> None:
+    # Deterministic key order keeps concurrent batches from deadlocking on bucket rows.
+    rows = [
+        {
+            "bucket": bucket,
+            "employee_id": employee_id,
+            "project_id": project_id,
+            "department": department,
+            "hours": hours,
+            "entries": entries,
+        }
+        for (bucket, employee_id, project_id), (department, hours, entries) in sorted(buckets.items())
+    ]
+    insert_ = dialect_insert(db.bind.dialect.name)
+    statement = insert_(model).values(rows)
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=["bucket", "employee_id", "project_id"],
+        # The department stays as first recorded, so a transfer mid-bucket
+        # does not move hours already booked to the old department.
+        set_={
+            "hours": model.hours + statement.excluded.hours,
+            "entries": model.entries + statement.excluded.entries,
+        },
+    ))
+
+
+async def ingest_time_entries_db(db: AsyncSession, entries: List[TimeEntryCreate]) -> TimeEntryBatchResult:
+    """Append a batch of punches and fold them into the daily/weekly buckets.
+
+    Raises LookupError if any punch references an unknown employee or project.
+    """
+    employee_ids = {entry.employee_id for entry in entries}
+    result = await db.execute(
+        select(Employee.id, Employee.department, Employee.hourly_rate).filter(Employee.id.in_(employee_ids))
+    )
+    employees = {row.id: row for row in result}
+    missing = employee_ids - employees.keys()
+    if missing:
+        raise LookupError(f"Unknown employee ids: {sorted(missing)}")
+
+    project_ids = {entry.project_id for entry in entries if entry.project_id is not None}
+    if project_ids:
+        found = set((await db.execute(select(Project.id).filter(Project.id.in_(project_ids)))).scalars())
+        missing = project_ids - found
+        if missing:
+            raise LookupError(f"Unknown project ids: {sorted(missing)}")
+
+    daily: Dict[BucketKey, list] = defaultdict(lambda: [None, 0.0, 0])
+    weekly: Dict[BucketKey, list] = defaultdict(lambda: [None, 0.0, 0])
+    hours_by_period: Dict[Tuple[int, date], float] = defaultdict(float)
+    labour_by_project: Dict[int, float] = defaultdict(float)
+    rows = []
+    for entry in entries:
+        employee = employees[entry.employee_id]
+        department = employee.department
+        day = entry.clock_in.date()
+        week = period_start_for(entry.clock_in)
+        project_id = entry.project_id or NO_PROJECT
+        rows.append({
+            "employee_id": entry.employee_id,
+            "project_id": entry.project_id,
+            "department": department,
+            "clock_in": entry.clock_in,
+            "clock_out": entry.clock_out,
+            "hours": entry.hours,
+        })
+        for buckets, bucket in ((daily, day), (weekly, week)):
+            totals = buckets[(bucket, entry.employee_id, project_id)]
+            totals[0] = department
+            totals[1] += entry.hours
+            totals[2] += 1
+        hours_by_period[(entry.employee_id, week)] += entry.hours
+        if entry.project_id is not None:
+            labour_by_project[entry.project_id] += entry.hours * (employee.hourly_rate or 0.0)
+
+    await db.execute(insert(TimeEntry), rows)
+    await _upsert_buckets(db, TimeEntryDaily, daily)
+    await _upsert_buckets(db, TimeEntryWeekly, weekly)
+    await add_hours_to_rollups(db, hours_by_period)
+    await add_labour_costs(db, labour_by_project)
+    await db.commit()
+    return TimeEntryBatchResult(inserted=len(rows), total_hours=sum(row["hours"] for row in rows))
+
+
+async def get_hours_db(
+    db: AsyncSession,
+    granularity: str = "day",
+    group_by: str = "employee",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    employee_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    department: Optional[str] = None
+) -> List[HoursBucket]:
+    model = TimeEntryWeekly if granularity == "week" else TimeEntryDaily
+    key = {
+        "employee": model.employee_id,
+        "project": model.project_id,
+        "department": model.department,
+    }[group_by]
+
+    query = select(
+        model.bucket,
+        key.label("key"),
+        func.sum(model.hours).label("hours"),
+        func.sum(model.entries).label("entries"),
+    )
+    if start:
+        query = query.filter(model.bucket >= start)
+    if end:
+        query = query.filter(model.bucket <= end)
+    if employee_id is not None:
+        query = query.filter(model.employee_id == employee_id)
+    if project_id is not None:
+        query = query.filter(model.project_id == project_id)
+    if department:
+        query = query.filter(model.department == department)
+
+    result = await db.execute(query.group_by(model.bucket, key).order_by(model.bucket, key))
+    return [
+        HoursBucket(
+            bucket=row.bucket,
+            key=None if group_by == "project" and row.key == NO_PROJECT else str(row.key),
+            hours=row.hours,
+            entries=row.entries,
+        )
+        for row in result
+    ]
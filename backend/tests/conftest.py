@@ -0,0 +1,65 @@
+"""Shared fixtures: a throwaway database with the full schema.
+
+Tests run against a temporary SQLite file by default. Point
+``TEST_DATABASE_URL`` at an empty Postgres database to run them there
+instead (the schema is dropped afterwards):
+
+    TEST_DATABASE_URL=postgresql+asyncpg://localhost/construction_test python -m pytest backend/tests
+"""
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.database import create_engine_from_settings
+from backend.models.registry import metadata
+
+
+async def _create_schema(engine) -> None:
+    async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+        await conn.run_sync(metadata.create_all)
+    await engine.dispose()
+
+
+async def _drop_schema(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    url = os.environ.get("TEST_DATABASE_URL") or f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine_from_settings(url)
+    asyncio.run(_create_schema(engine))
+    yield engine
+    asyncio.run(_drop_schema(engine))
+
+
+@pytest.fixture
+def run(engine):
+    """Run a coroutine to completion, closing pooled connections on the same loop."""
+    async def _run(coro):
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return lambda coro: asyncio.run(_run(coro))
+
+
+@pytest.fixture
+def session_factory(engine):
+    return async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+def postgres(engine):
+    """Skip on SQLite, for code that relies on Postgres-only SQL."""
+    if engine.dialect.name != "postgresql":
+        pytest.skip("needs Postgres (set TEST_DATABASE_URL)")
@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from backend.api.allocations import _check_window
+from backend.models.allocation import ProposedAssignment
+
+NAIVE = datetime(2026, 5, 1, 12, 0)
+# 12:00 at UTC+2 is 10:00 UTC, two hours before NAIVE.
+AWARE = datetime(2026, 5, 1, 12, 0, tzinfo=timezone(timedelta(hours=2)))
+
+
+def test_assignment_window_mixes_aware_and_naive_values():
+    assignment = ProposedAssignment(project_id=1, employee_id=1, start=AWARE, end=NAIVE)
+
+    assert (assignment.start, assignment.end) == (datetime(2026, 5, 1, 10, 0), NAIVE)
+    with pytest.raises(ValidationError, match="end must not be before start"):
+        ProposedAssignment(project_id=1, employee_id=1, start=NAIVE, end=AWARE)
+
+
+def test_query_window_mixes_aware_and_naive_values():
+    _check_window(AWARE, NAIVE)
+    with pytest.raises(HTTPException) as raised:
+        _check_window(NAIVE, AWARE)
+    assert raised.value.status_code == 400
@@ -0,0 +1,96 @@
+import io
+import json
+
+from sqlalchemy import func, select
+
+from backend.models.employee import Employee
+from backend.models.supplier import SupplierPriceSummary
+from backend.services.bulk_service import import_rows, read_rows
+
+
+def _employee(email, **extra):
+    return {
+        "email": email, "first_name": "A", "last_name": "B", "role": "crew",
+        "department": "ops", "hourly_rate": 30, **extra,
+    }
+
+
+def _ndjson(rows):
+    return read_rows(io.BytesIO("".join(json.dumps(row) + "\n" for row in rows).encode()), "ndjson")
+
+
+def test_repeated_keys_within_a_file_are_reported(session_factory, run):
+    async def scenario():
+        async with session_factory() as session:
+            report = await import_rows(session, "employees", _ndjson([
+                _employee("a@example.com"),
+                _employee("b@example.com"),
+                _employee("a@example.com"),
+            ]))
+        async with session_factory() as session:
+            count = await session.scalar(select(func.count()).select_from(Employee))
+        return report, count
+
+    report, count = run(scenario())
+
+    assert (report["inserted"], report["failed"], count) == (2, 1, 2)
+    assert report["errors"] == [{"row": 3, "errors": "email 'a@example.com' duplicates row 1"}]
+
+
+def test_existing_keys_are_reported(session_factory, run):
+    async def scenario():
+        async with session_factory() as session:
+            await import_rows(session, "employees", _ndjson([_employee("a@example.com")]))
+        async with session_factory() as session:
+            return await import_rows(session, "employees", _ndjson([
+                _employee("a@example.com"), _employee("b@example.com"),
+            ]))
+
+    report = run(scenario())
+
+    assert (report["inserted"], report["failed"]) == (1, 1)
+    assert report["errors"] == [{"row": 1, "errors": "email 'a@example.com' already exists"}]
+
+
+def test_foreign_key_violations_are_attributed_to_their_rows(postgres, session_factory, run):
+    async def scenario():
+        async with session_factory() as session:
+            report = await import_rows(session, "employees", _ndjson([
+                _employee("a@example.com"),
+                _employee("b@example.com", supervisor_id=999),
+                _employee("c@example.com"),
+            ]))
+        async with session_factory() as session:
+            emails = (await session.execute(select(Employee.email).order_by(Employee.email))).scalars().all()
+        return report, emails
+
+    report, emails = run(scenario())
+
+    assert (report["inserted"], report["failed"]) == (2, 1)
+    assert emails == ["a@example.com", "c@example.com"]
+    assert [error["row"] for error in report["errors"]] == [2]
+    assert "foreign key" in report["errors"][0]["errors"]
+
+
+def test_imported_materials_record_supplier_prices(postgres, session_factory, run):
+    from backend.models.supplier import Supplier
+
+    async def scenario():
+        async with session_factory() as session:
+            supplier = Supplier(name="s")
+            session.add(supplier)
+            await session.commit()
+            report = await import_rows(session, "materials", _ndjson([
+                {"name": "Rebar", "sku": "R-1", "unit": "m", "price_per_unit": 4.5, "supplier_id": supplier.id},
+                {"name": "Sand", "sku": "S-1", "unit": "t", "price_per_unit": 20},
+            ]))
+        async with session_factory() as session:
+            summaries = (await session.execute(
+                select(SupplierPriceSummary.sku, SupplierPriceSummary.current_price)
+            )).all()
+        return report, summaries
+
+    report, summaries = run(scenario())
+
+    assert report["inserted"] == 2
+    assert [tuple(row) for row in summaries] == [("R-1", 4.5)]
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from backend.models.project import Project
+from backend.services.dashboard_service import get_dashboard_summary_db
+
+
+def test_projects_without_a_status_are_counted_as_unknown(session_factory, run):
+    async def scenario():
+        async with session_factory() as session:
+            session.add_all([
+                Project(name="a", start_date=datetime(2026, 1, 1), budget=1.0, progress=10.0),
+                Project(name="b", start_date=datetime(2026, 1, 1), budget=1.0, progress=30.0, status="PENDING"),
+            ])
+            await session.flush()
+            # Older rows predate the status default.
+            await session.execute(update(Project).filter(Project.name == "a").values(status=None))
+            await session.commit()
+            return await get_dashboard_summary_db(session)
+
+    summary = run(scenario())
+
+    assert summary.projects.total == 2
+    assert summary.projects.by_status["unknown"].count == 1
+    assert summary.projects.by_status["unknown"].average_progress == 10.0
@@ -0,0 +1,63 @@
+import asyncio
+
+from backend import events
+from backend.events import EventBroadcaster
+
+
+class _PubSub:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def subscribe(self, channel):
+        self.redis.subscribes += 1
+        if self.redis.subscribes == 1:
+            raise ConnectionError("connection refused")
+
+    async def listen(self):
+        yield {"type": "subscribe", "data": 1}
+        while True:
+            yield {"type": "message", "data": await self.redis.messages.get()}
+
+    async def close(self):
+        pass
+
+
+class _Redis:
+    """Just enough of redis.asyncio: the first subscribe fails, publishes loop back."""
+
+    def __init__(self):
+        self.subscribes = 0
+        self.messages = asyncio.Queue()
+
+    def pubsub(self):
+        return _PubSub(self)
+
+    async def publish(self, channel, data):
+        await asyncio.sleep(0)
+        self.messages.put_nowait(data)
+
+    async def close(self):
+        pass
+
+
+def test_listener_resubscribes_and_publishes_are_tracked(monkeypatch):
+    monkeypatch.setattr(events, "LISTEN_RETRY_MIN_SECONDS", 0.01)
+
+    async def scenario():
+        broadcaster = EventBroadcaster("test")
+        broadcaster._redis = _Redis()
+        broadcaster._listener = asyncio.create_task(broadcaster._listen())
+        queue = broadcaster.subscribe()
+        broadcaster.publish({"id": 1})
+        in_flight = len(broadcaster._publishing)
+        received = await asyncio.wait_for(queue.get(), timeout=1)
+        subscribes = broadcaster._redis.subscribes
+        await broadcaster.stop()
+        return in_flight, received, subscribes, broadcaster._publishing
+
+    in_flight, received, subscribes, publishing = asyncio.run(scenario())
+
+    assert in_flight == 1
+    assert received == {"id": 1}
+    assert subscribes == 2
+    assert not publishing
@@ -0,0 +1,23 @@
+from backend.api.materials import _search_materials
+from backend.models.material import Material
+
+
+def test_search_falls_back_to_substring_matches_without_trigrams(session_factory, run):
+    async def scenario():
+        async with session_factory() as session:
+            session.add_all([
+                Material(name="Copper pipe", sku="CP-1", unit="m", price_per_unit=1.0),
+                Material(name="Pipe clamp", sku="PIPE-7", unit="ea", price_per_unit=1.0),
+                Material(name="Rebar", sku="RB-1", unit="ea", price_per_unit=1.0, description="100% steel"),
+                Material(name="Sand", sku="SD-1", unit="t", price_per_unit=1.0),
+            ])
+            await session.commit()
+            pipes = await session.scalars(_search_materials("pipe", "sqlite"))
+            percent = await session.scalars(_search_materials("100%", "sqlite"))
+            return [m.sku for m in pipes], [m.sku for m in percent]
+
+    pipes, percent = run(scenario())
+
+    # SKU prefix hits rank first; LIKE wildcards in the term match literally.
+    assert pipes == ["PIPE-7", "CP-1"]
+    assert percent == ["RB-1"]
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import select
+
+from backend.models.employee import Employee
+from backend.services.org_service import supervisor_path, sync_org_path
+
+
+def _employee(email: str, supervisor_id=None) -> Employee:
+    return Employee(
+        email=email, first_name="A", last_name="B", role="crew", department="ops",
+        hourly_rate=30, supervisor_id=supervisor_id
+    )
+
+
+def test_supervisor_without_a_path_gets_it_rebuilt(session_factory, run):
+    async def scenario():
+        async with session_factory() as session:
+            # Legacy rows: nobody has an org_path yet.
+            top = _employee("top@example.com")
+            session.add(top)
+            await session.flush()
+            middle = _employee("middle@example.com", top.id)
+            session.add(middle)
+            await session.flush()
+            report = _employee("report@example.com", middle.id)
+            session.add(report)
+            await session.flush()
+            await sync_org_path(session, report)
+            await session.commit()
+            ids = (top.id, middle.id, report.id)
+        async with session_factory() as session:
+            paths = dict((await session.execute(select(Employee.id, Employee.org_path))).all())
+        return ids, paths
+
+    (top, middle, report), paths = run(scenario())
+
+    assert paths[middle] == f"/{top}/{middle}/"
+    assert paths[report] == f"/{top}/{middle}/{report}/"
+
+
+def test_unknown_supervisor_is_a_lookup_error(session_factory, run):
+    async def scenario():
+        async with session_factory() as session:
+            await supervisor_path(session, 999)
+
+    with pytest.raises(LookupError, match="Unknown supervisor id: 999"):
+        run(scenario())
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from backend.models.employee import Employee
+from backend.models.time_entry import TimeEntryCreate
+from backend.services.performance_service import get_performance_metrics_db, rebuild_performance_rollups
+from backend.services.time_entry_service import ingest_time_entries_db
+
+
+def test_rebuild_keeps_hours_recorded_outside_the_ledger(session_factory, run):
+    now = datetime.utcnow()
+
+    async def scenario():
+        async with session_factory() as session:
+            employee = Employee(
+                email="a@example.com", first_name="A", last_name="B", role="crew", department="ops",
+                hourly_rate=30, total_hours_worked=0
+            )
+            session.add(employee)
+            await session.commit()
+            employee.add_hours_worked(6)
+            await session.commit()
+            employee_id = employee.id
+        async with session_factory() as session:
+            await ingest_time_entries_db(session, [
+                TimeEntryCreate(employee_id=employee_id, clock_in=now, hours=4),
+                TimeEntryCreate(employee_id=employee_id, clock_in=now - timedelta(weeks=1), hours=3),
+            ])
+        async with session_factory() as session:
+            before = await get_performance_metrics_db(session, employee_id)
+            await rebuild_performance_rollups(session)
+        async with session_factory() as session:
+            after = await get_performance_metrics_db(session, employee_id)
+        return before, after
+
+    before, after = run(scenario())
+
+    assert [period.hours_worked for period in before.periods] == [10.0, 3.0]
+    assert after.periods == before.periods
+    assert after.total_hours_worked == before.total_hours_worked == 13.0
@@ -0,0 +1,46 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.models.project import Project
+from backend.services.project_service import get_projects_db
+
+
+def test_to_dict_computes_progress_when_not_loaded_from_sql():
+    start = datetime.utcnow() - timedelta(days=10)
+    project = Project(name="p", start_date=start, end_date=start + timedelta(days=40), budget=1.0, status="IN_PROGRESS")
+
+    assert project.to_dict()["computed_progress"] == 25.0
+
+
+def test_progress_sort_rejects_cursor():
+    with pytest.raises(ValueError, match="sorting by id"):
+        asyncio.run(get_projects_db(None, cursor="abc", sort="computed_progress"))
+
+
+def test_sql_progress_matches_python(session_factory, run):
+    start = datetime.utcnow() - timedelta(days=10, hours=12)
+    projects = [
+        Project(name="on track", start_date=start, end_date=start + timedelta(days=40), budget=1.0,
+                progress=50.0, status="IN_PROGRESS"),
+        Project(name="late", start_date=start - timedelta(days=60), end_date=start, budget=1.0,
+                progress=10.0, status="IN_PROGRESS"),
+        Project(name="open ended", start_date=start, budget=1.0, progress=5.0, status="IN_PROGRESS"),
+        Project(name="done", start_date=start, end_date=start + timedelta(days=40), budget=1.0,
+                progress=100.0, status="COMPLETED"),
+    ]
+
+    async def scenario():
+        async with session_factory() as session:
+            session.add_all(projects)
+            await session.commit()
+        async with session_factory() as session:
+            ordered, _ = await get_projects_db(session, sort="-computed_progress")
+            behind, _ = await get_projects_db(session, behind_schedule=True)
+            return [(p.name, p.to_dict()["computed_progress"]) for p in ordered], [p.name for p in behind]
+
+    ordered, behind = run(scenario())
+
+    assert ordered == [("late", 100.0), ("done", 100.0), ("on track", 25.0), ("open ended", 5.0)]
+    assert behind == ["late"]
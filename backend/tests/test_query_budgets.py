@@ -0,0 +1,130 @@
+"""Per-endpoint query budgets: an N+1 regression fails here, not in production."""
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from jose import jwt
+
+from backend import response_cache as response_cache_module
+from backend.api import dashboard
+from backend.config import settings
+from backend.database import get_db
+from backend.main import app
+from backend.models.employee import Employee
+from backend.models.material import Material, ProjectMaterial
+from backend.models.project import Project
+from backend.query_budget import QUERY_COUNT_HEADER, QueryBudgetMiddleware, assert_max_queries
+from backend.replicas import get_read_db
+from backend.response_cache import LRUCacheBackend
+
+ROWS = 20
+
+
+async def _seed(session_factory) -> None:
+    async with session_factory() as session:
+        boss = Employee(
+            email="boss@example.com", first_name="B", last_name="Oss", role="manager",
+            department="ops", hourly_rate=50, is_supervisor=True, org_path="/1/"
+        )
+        session.add(boss)
+        await session.flush()
+        employees = [
+            Employee(
+                email=f"e{i}@example.com", first_name="E", last_name=str(i), role="crew",
+                department="ops", hourly_rate=30, supervisor_id=boss.id, org_path=f"/1/{i + 2}/"
+            )
+            for i in range(ROWS)
+        ]
+        start = datetime.utcnow() - timedelta(days=30)
+        projects = [
+            Project(name=f"p{i}", start_date=start, end_date=start + timedelta(days=90), budget=1000.0, employees=employees[:5])
+            for i in range(ROWS)
+        ]
+        materials = [
+            Material(name=f"m{i}", sku=f"SKU-{i}", unit="ea", price_per_unit=2.0, quantity=i, min_quantity=5)
+            for i in range(ROWS)
+        ]
+        session.add_all(employees + projects + materials)
+        await session.flush()
+        session.add_all(
+            ProjectMaterial(project_id=project.id, material_id=material.id, quantity_allocated=1)
+            for project in projects for material in materials[:3]
+        )
+        await session.commit()
+
+
+@pytest.fixture
+def client(session_factory, run, monkeypatch):
+    async def override_db():
+        async with session_factory() as session:
+            yield session
+
+    run(_seed(session_factory))
+    monkeypatch.setattr(settings, "JWT_SECRET", "test-secret")
+    monkeypatch.setattr(response_cache_module.response_cache, "backend", LRUCacheBackend(64))
+    dashboard.summary_cache.clear()
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_read_db] = override_db
+    token = jwt.encode({"sub": "tester"}, "test-secret", algorithm=settings.JWT_ALGORITHM)
+
+    async def get(path, **params):
+        async with httpx.AsyncClient(app=app, base_url="http://test", headers={"Authorization": f"Bearer {token}"}) as http:
+            return await http.get(path, params=params)
+
+    yield get
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path, params, budget", [
+    ("/api/employees/", {}, 1),
+    ("/api/employees/", {"include": "supervisor,projects"}, 2),
+    ("/api/employees/2", {}, 1),
+    ("/api/employees/status", {"ids": ",".join(str(i) for i in range(1, ROWS))}, 1),
+    ("/api/materials/", {}, 1),
+    ("/api/materials/", {"include": "project_materials"}, 2),
+    ("/api/materials/1", {}, 1),
+    ("/api/materials/low-stock", {}, 1),
+])
+def test_endpoint_query_budget(client, run, path, params, budget):
+    async def request():
+        with assert_max_queries(budget) as counter:
+            response = await client(path, **params)
+        return response, counter[0]
+
+    response, queries = run(request())
+
+    assert response.status_code == 200, response.text
+    assert queries > 0
+
+
+@pytest.mark.parametrize("path, params, budget", [
+    ("/api/projects/", {}, 1),
+    ("/api/projects/", {"include": "employees,project_materials"}, 3),
+    ("/api/projects/1", {}, 1),
+    ("/api/dashboard/summary", {}, 4),
+])
+def test_postgres_endpoint_query_budget(postgres, client, run, path, params, budget):
+    test_endpoint_query_budget(client, run, path, params, budget)
+
+
+def test_middleware_counts_queries_of_streamed_bodies(session_factory, run):
+    from sqlalchemy import text
+    from starlette.responses import StreamingResponse
+
+    async def streaming_app(scope, receive, send):
+        async def body():
+            async with session_factory() as session:
+                for _ in range(3):
+                    await session.execute(text("SELECT 1"))
+                    yield b"row\n"
+
+        await StreamingResponse(body())(scope, receive, send)
+
+    guarded = QueryBudgetMiddleware(streaming_app, budget=2)
+
+    async def request():
+        async with httpx.AsyncClient(app=guarded, base_url="http://test") as http:
+            return await http.get("/")
+
+    with pytest.raises(Exception, match="executed 3 queries, budget is 2"):
+        run(request())
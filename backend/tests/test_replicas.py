@@ -0,0 +1,44 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from backend.database import create_engine_from_settings
+from backend.replicas import PRIMARY_UNTIL_COOKIE, ReadYourWritesMiddleware, ReplicaRouter
+
+
+def _app(router: ReplicaRouter) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, router=router)
+
+    @app.post("/write")
+    async def write():
+        router.note_write()
+        return {}
+
+    @app.get("/read")
+    async def read():
+        return {"primary": router.read_engine() is router.primary}
+
+    return app
+
+
+def test_only_the_writing_client_is_pinned_to_the_primary():
+    router = ReplicaRouter(create_engine_from_settings("sqlite+aiosqlite://"), ["sqlite+aiosqlite://"], 5.0, 1.0)
+    router._lag = {replica: 0.0 for replica in router.replicas}
+    app = _app(router)
+
+    async def scenario():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as writer, \
+                httpx.AsyncClient(app=app, base_url="http://test") as other:
+            before = (await writer.get("/read")).json()["primary"]
+            await writer.post("/write")
+            pinned = (await writer.get("/read")).json()["primary"]
+            unaffected = (await other.get("/read")).json()["primary"]
+            writer.cookies.set(PRIMARY_UNTIL_COOKIE, "1.0")
+            expired = (await writer.get("/read")).json()["primary"]
+        await router.stop()
+        await router.primary.dispose()
+        return before, pinned, unaffected, expired
+
+    assert asyncio.run(scenario()) == (False, True, False, False)
@@ -0,0 +1,74 @@
+import asyncio
+
+from starlette.requests import Request
+
+from backend.response_cache import LRUCacheBackend, ResponseCache
+
+
+def _request(headers=None):
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": raw})
+
+
+def _counting_loader(payload):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return payload, {}
+
+    return load, calls
+
+
+def test_fills_are_cached_until_invalidated():
+    cache = ResponseCache(LRUCacheBackend(16), ttl=60)
+    load, calls = _counting_loader({"id": 1, "name": "a"})
+
+    async def scenario():
+        first = await cache.respond(_request(), "things", "detail:1", load)
+        await cache.respond(_request(), "things", "detail:1", load)
+        await cache.invalidate("things")
+        await cache.respond(_request(), "things", "detail:1", load)
+        return first
+
+    first = asyncio.run(scenario())
+
+    assert first.body == b'{"id":1,"name":"a"}'
+    assert len(calls) == 2
+
+
+def test_fills_right_after_a_bump_are_not_stored():
+    # A replica may still be serving the pre-write row during the settle window.
+    cache = ResponseCache(LRUCacheBackend(16), ttl=60, settle=30)
+    load, calls = _counting_loader({"id": 1, "name": "a"})
+
+    async def scenario():
+        await cache.invalidate("things")
+        await cache.respond(_request(), "things", "detail:1", load)
+        await cache.respond(_request(), "things", "detail:1", load)
+        cache.backend._bumped_at["things"] -= 30
+        await cache.respond(_request(), "things", "detail:1", load)
+        await cache.respond(_request(), "things", "detail:1", load)
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 3
+
+
+def test_etag_changes_with_derived_fields():
+    # Same row and timestamp; only the clock-derived progress moved.
+    stamp = {"id": 1, "updated_at": "2026-01-01T00:00:00"}
+    cache = ResponseCache(LRUCacheBackend(16), ttl=60)
+    before, _ = _counting_loader({**stamp, "computed_progress": 10.0})
+    after, _ = _counting_loader({**stamp, "computed_progress": 11.0})
+
+    async def scenario():
+        first = await cache.respond(_request(), "projects", "detail:1", before)
+        await cache.invalidate("projects")
+        second = await cache.respond(_request({"If-None-Match": first.headers["etag"]}), "projects", "detail:1", after)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import inspect
+
+from backend import schema
+from backend.models.registry import metadata
+
+
+def test_init_schema_refuses_unversioned_database(engine, run, monkeypatch):
+    # The `engine` fixture leaves every application table in place, but no alembic_version.
+    monkeypatch.setattr(schema, "engine", engine)
+    stamped = []
+    monkeypatch.setattr(schema, "_alembic", stamped.append)
+
+    with pytest.raises(RuntimeError, match="no alembic_version"):
+        run(schema.init_schema())
+    assert stamped == []
+
+
+def test_init_schema_creates_and_stamps_empty_database(engine, run, monkeypatch):
+    monkeypatch.setattr(schema, "engine", engine)
+    stamped = []
+    monkeypatch.setattr(schema, "_alembic", stamped.append)
+
+    async def scenario():
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.drop_all)
+        await schema.init_schema()
+        async with engine.connect() as conn:
+            return await conn.run_sync(lambda sync_conn: set(inspect(sync_conn).get_table_names()))
+
+    tables = run(scenario())
+
+    assert metadata.tables.keys() <= tables
+    assert stamped == ["stamp"]
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+from sqlalchemy import select
+
+from backend.api.materials import _stock_alert_events
+from backend.events import stock_alert_broadcaster
+from backend.models.material import Material, MaterialStockAlert
+from backend.services.stock_alert_service import check_low_stock_crossings, release_lead, try_lead
+
+
+class _Client:
+    """Stands in for a Request; disconnects after `events` stream messages."""
+
+    def __init__(self, events: int):
+        self.events = events
+
+    async def is_disconnected(self) -> bool:
+        self.events -= 1
+        return self.events < 0
+
+
+def test_alert_stream_relays_published_crossings():
+    alert = {"material_id": 7, "quantity": 1.0, "min_quantity": 5.0}
+
+    async def scenario():
+        stream = _stock_alert_events(_Client(events=1))
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        stock_alert_broadcaster.publish(alert)
+        first = await pending
+        await stream.aclose()
+        return first
+
+    assert asyncio.run(scenario()) == f"event: low-stock\ndata: {json.dumps(alert)}\n\n"
+
+
+def test_only_one_worker_leads_the_monitor(postgres, engine, run):
+    async def scenario():
+        async with engine.connect() as first, engine.connect() as second:
+            led = [await try_lead(first), await try_lead(second)]
+            await release_lead(first)
+        # Released connections go back to the pool; none may still hold the lock.
+        async with engine.connect() as third:
+            led.append(await try_lead(third))
+        return led
+
+    assert run(scenario()) == [True, False, True]
+
+
+def test_crossing_alerts_once_and_recovery_rearms(session_factory, run):
+    async def scenario():
+        async with session_factory() as session:
+            material = Material(name="Rebar", sku="R-1", unit="ea", price_per_unit=1.0, quantity=10, min_quantity=5)
+            session.add(material)
+            await session.commit()
+
+            checks = []
+            for quantity in (10, 3, 2, 8, 4):
+                material.quantity = quantity
+                await session.commit()
+                crossings = await check_low_stock_crossings(session)
+                open_alerts = (await session.execute(select(MaterialStockAlert.material_id))).scalars().all()
+                checks.append(([alert["quantity"] for alert in crossings], open_alerts))
+            return material.id, checks
+
+    material_id, checks = run(scenario())
+
+    assert checks == [
+        ([], []),
+        ([3.0], [material_id]),
+        ([], [material_id]),
+        ([], []),
+        ([4.0], [material_id]),
+    ]
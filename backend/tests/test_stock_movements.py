@@ -0,0 +1,161 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from backend.models.material import Material, ProjectMaterial, StockMovement, StockMovementCreate
+from backend.models.project import Project
+from backend.services.stock_service import adjust_stock, apply_stock_movements_db
+
+
+async def _seed(session_factory, quantities):
+    async with session_factory() as session:
+        materials = [
+            Material(name=f"m{i}", sku=f"SKU-{i}", unit="ea", price_per_unit=2.0, quantity=quantity, min_quantity=2)
+            for i, quantity in enumerate(quantities)
+        ]
+        session.add_all(materials)
+        await session.commit()
+        return [material.id for material in materials]
+
+
+async def _apply(session_factory, movements):
+    async with session_factory() as session:
+        return await apply_stock_movements_db(session, movements)
+
+
+async def _movements(session_factory, material_id):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(StockMovement.delta, StockMovement.quantity_after)
+            .filter(StockMovement.material_id == material_id)
+            .order_by(StockMovement.id)
+        )
+        return [tuple(row) for row in result]
+
+
+def test_parallel_batches_do_not_lose_updates(session_factory, run):
+    workers, rounds = 8, 5
+
+    async def scenario():
+        material_ids = await _seed(session_factory, [0, 10])
+
+        async def worker():
+            for _ in range(rounds):
+                await _apply(session_factory, [
+                    StockMovementCreate(material_id=material_ids[0], delta=2),
+                    StockMovementCreate(sku="SKU-1", delta=1),
+                ])
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+        async with session_factory() as session:
+            result = await session.execute(
+                select(Material.id, Material.quantity).filter(Material.id.in_(material_ids))
+            )
+            quantities = dict(result.all())
+        first = await _movements(session_factory, material_ids[0])
+        second = await _movements(session_factory, material_ids[1])
+        return material_ids, quantities, first, second
+
+    material_ids, quantities, first, second = run(scenario())
+
+    batches = workers * rounds
+    assert quantities == {material_ids[0]: 2 * batches, material_ids[1]: 10 + batches}
+    # Batches are serialized, so the log reads as an unbroken running balance.
+    assert [after for _, after in first] == [2.0 * n for n in range(1, batches + 1)]
+    assert [after for _, after in second] == [10.0 + n for n in range(1, batches + 1)]
+
+
+def test_quantity_after_is_recorded_per_movement(session_factory, run):
+    async def scenario():
+        material_id, = await _seed(session_factory, [5])
+        levels = await _apply(session_factory, [
+            StockMovementCreate(material_id=material_id, delta=3),
+            StockMovementCreate(material_id=material_id, delta=-10),
+            StockMovementCreate(material_id=material_id, delta=4),
+        ])
+        return levels, await _movements(session_factory, material_id)
+
+    levels, movements = run(scenario())
+
+    # Each movement is floored at zero in order, not the netted total.
+    assert movements == [(3.0, 8.0), (-10.0, 0.0), (4.0, 4.0)]
+    assert [level.quantity for level in levels] == [4.0]
+
+
+def test_unknown_material_rolls_back_the_batch(session_factory, run):
+    async def scenario():
+        material_id, = await _seed(session_factory, [5])
+        with pytest.raises(LookupError, match="SKU-missing"):
+            await _apply(session_factory, [
+                StockMovementCreate(material_id=material_id, delta=1),
+                StockMovementCreate(sku="SKU-missing", delta=1),
+            ])
+        async with session_factory() as session:
+            material = await session.get(Material, material_id)
+        return material.quantity, await _movements(session_factory, material_id)
+
+    quantity, movements = run(scenario())
+
+    assert quantity == 5
+    assert movements == []
+
+
+def test_adjust_stock_reloads_instance_and_records_usage(session_factory, run):
+    async def scenario():
+        material_id, = await _seed(session_factory, [5])
+        async with session_factory() as session:
+            project = Project(name="p", start_date=datetime(2026, 1, 1), budget=1000.0)
+            session.add(project)
+            await session.flush()
+            session.add(ProjectMaterial(project_id=project.id, material_id=material_id, quantity_allocated=3))
+            await session.commit()
+
+            material = await session.get(Material, material_id)
+            await adjust_stock(session, material, -4, project_id=project.id)
+            usage = await session.scalar(
+                select(ProjectMaterial.quantity_used).filter(ProjectMaterial.project_id == project.id)
+            )
+            return material.quantity, material.availability_status, usage
+
+    quantity, status, usage = run(scenario())
+
+    assert (quantity, status) == (1.0, "low_stock")
+    # Usage is capped at the allocation.
+    assert usage == 3.0
+
+
+def test_model_wrappers_go_through_adjust_stock(session_factory, run):
+    async def scenario():
+        material_id, = await _seed(session_factory, [10])
+        async with session_factory() as session:
+            project = Project(name="p", start_date=datetime(2026, 1, 1), budget=1000.0)
+            session.add(project)
+            await session.flush()
+            allocation = ProjectMaterial(project_id=project.id, material_id=material_id, quantity_allocated=5)
+            session.add(allocation)
+            await session.commit()
+
+            material = await session.get(Material, material_id)
+            await material.update_quantity(session, 2)
+            await allocation.update_usage(session, 3)
+            return material_id, allocation.quantity_used
+
+    material_id, used = run(scenario())
+
+    assert used == 3.0
+    assert run(_movements(session_factory, material_id)) == [(2.0, 12.0), (-3.0, 9.0)]
+
+
+def test_deleting_a_material_removes_its_movements(postgres, session_factory, run):
+    async def scenario():
+        material_id, = await _seed(session_factory, [5])
+        await _apply(session_factory, [StockMovementCreate(material_id=material_id, delta=1)])
+        async with session_factory() as session:
+            await session.delete(await session.get(Material, material_id))
+            await session.commit()
+        return await _movements(session_factory, material_id)
+
+    assert run(scenario()) == []
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime
+
+from backend.models.material import Material, ProjectMaterial
+from backend.models.project import Project
+from backend.models.supplier import Supplier, SupplierPriceCreate, SupplierPriceSummary
+from backend.services.project_cost_service import get_project_budget_db, refresh_material_costs
+from backend.services.supplier_price_service import get_price_comparisons_db, record_prices_db
+
+
+async def _suppliers(session_factory, count):
+    async with session_factory() as session:
+        suppliers = [Supplier(name=f"s{i}") for i in range(count)]
+        session.add_all(suppliers)
+        await session.commit()
+        return [supplier.id for supplier in suppliers]
+
+
+def test_concurrent_batches_for_a_new_sku_share_one_comparison(postgres, session_factory, run):
+    async def scenario():
+        supplier_ids = await _suppliers(session_factory, 4)
+
+        async def submit(supplier_id, price):
+            async with session_factory() as session:
+                await record_prices_db(session, [
+                    SupplierPriceCreate(supplier_id=supplier_id, sku="NEW-1", material_name="Rebar", price_per_unit=price)
+                ])
+
+        await asyncio.gather(*(submit(supplier_id, 10.0 + i) for i, supplier_id in enumerate(supplier_ids)))
+        async with session_factory() as session:
+            return supplier_ids, await get_price_comparisons_db(session)
+
+    supplier_ids, (comparisons, _) = run(scenario())
+
+    assert [(c.sku, c.supplier_count, c.cheapest_supplier_id, c.cheapest_price) for c in comparisons] == [
+        ("NEW-1", 4, supplier_ids[0], 10.0)
+    ]
+
+
+def test_later_batches_widen_the_summary_range(session_factory, run):
+    async def scenario():
+        cheap_id, dear_id = await _suppliers(session_factory, 2)
+        for supplier_id, price in [(cheap_id, 10.0), (cheap_id, 8.0), (cheap_id, 12.0), (dear_id, 20.0)]:
+            async with session_factory() as session:
+                await record_prices_db(session, [
+                    SupplierPriceCreate(supplier_id=supplier_id, sku="PIPE", material_name="Pipe", price_per_unit=price)
+                ])
+        async with session_factory() as session:
+            summary = await session.get(SupplierPriceSummary, ("PIPE", cheap_id))
+            comparisons, _ = await get_price_comparisons_db(session)
+        return cheap_id, summary, comparisons
+
+    cheap_id, summary, comparisons = run(scenario())
+
+    assert (summary.current_price, summary.previous_price, summary.min_price, summary.max_price) == (12.0, 8.0, 8.0, 12.0)
+    assert summary.observations == 3
+    assert [(c.sku, c.supplier_count, c.cheapest_supplier_id, c.cheapest_price, c.highest_price) for c in comparisons] == [
+        ("PIPE", 2, cheap_id, 12.0, 20.0)
+    ]
+
+
+def test_name_filter_matches_wildcards_literally(postgres, session_factory, run):
+    async def scenario():
+        supplier_id, = await _suppliers(session_factory, 1)
+        async with session_factory() as session:
+            await record_prices_db(session, [
+                SupplierPriceCreate(supplier_id=supplier_id, sku="A", material_name="Pipe 50% off", price_per_unit=1),
+                SupplierPriceCreate(supplier_id=supplier_id, sku="B", material_name="Pipe 50 mm", price_per_unit=1),
+                SupplierPriceCreate(supplier_id=supplier_id, sku="C", material_name="steel_beam", price_per_unit=1),
+                SupplierPriceCreate(supplier_id=supplier_id, sku="D", material_name="steel beam", price_per_unit=1),
+            ])
+        async with session_factory() as session:
+            percent, _ = await get_price_comparisons_db(session, name="50%")
+            underscore, _ = await get_price_comparisons_db(session, name="l_b")
+        return percent, underscore
+
+    percent, underscore = run(scenario())
+
+    assert [c.sku for c in percent] == ["A"]
+    assert [c.sku for c in underscore] == ["C"]
+
+
+def test_supplier_price_recosts_projects_using_the_material(session_factory, run):
+    async def scenario():
+        supplier_id, other_id = await _suppliers(session_factory, 2)
+        async with session_factory() as session:
+            material = Material(name="Rebar", sku="REBAR", unit="ea", price_per_unit=2.0, supplier_id=supplier_id)
+            project = Project(name="p", start_date=datetime(2026, 1, 1), budget=1000.0)
+            session.add_all([material, project])
+            await session.flush()
+            session.add(ProjectMaterial(project_id=project.id, material_id=material.id, quantity_allocated=5, quantity_used=5))
+            await session.flush()
+            await refresh_material_costs(session, [project.id])
+            await session.commit()
+            project_id = project.id
+
+        async def cost():
+            async with session_factory() as session:
+                return (await get_project_budget_db(session, project_id)).material_cost
+
+        costs = [await cost()]
+        async with session_factory() as session:
+            # Another supplier's quote is only a comparison, not what the material costs.
+            await record_prices_db(session, [SupplierPriceCreate(supplier_id=other_id, sku="REBAR", price_per_unit=1.0)])
+        costs.append(await cost())
+        async with session_factory() as session:
+            await record_prices_db(session, [SupplierPriceCreate(supplier_id=supplier_id, sku="REBAR", price_per_unit=3.0)])
+        costs.append(await cost())
+        return costs
+
+    assert run(scenario()) == [10.0, 10.0, 15.0]
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import select
+
+from backend.models.employee import Employee
+from backend.models.time_entry import TimeEntry, TimeEntryCreate, TimeEntryWeekly
+from backend.services.time_entry_service import ingest_time_entries_db
+
+
+async def _employee(session_factory) -> int:
+    async with session_factory() as session:
+        employee = Employee(
+            email="a@example.com", first_name="A", last_name="B", role="crew", department="ops", hourly_rate=30
+        )
+        session.add(employee)
+        await session.commit()
+        return employee.id
+
+
+def test_aware_punches_are_stored_as_naive_utc(session_factory, run):
+    async def scenario():
+        employee_id = await _employee(session_factory)
+        async with session_factory() as session:
+            await ingest_time_entries_db(session, [TimeEntryCreate(
+                employee_id=employee_id, clock_in="2026-03-02T08:00:00+02:00", clock_out="2026-03-02T10:30:00+02:00"
+            )])
+        async with session_factory() as session:
+            return (await session.execute(select(TimeEntry.clock_in, TimeEntry.hours))).one()
+
+    clock_in, hours = run(scenario())
+
+    assert clock_in.isoformat() == "2026-03-02T06:00:00"
+    assert hours == 2.5
+
+
+def test_unknown_project_is_a_lookup_error(session_factory, run):
+    async def scenario():
+        employee_id = await _employee(session_factory)
+        async with session_factory() as session:
+            await ingest_time_entries_db(session, [
+                TimeEntryCreate(employee_id=employee_id, project_id=999, clock_in="2026-03-02T08:00:00", hours=1)
+            ])
+
+    with pytest.raises(LookupError, match=r"Unknown project ids: \[999\]"):
+        run(scenario())
+
+
+def test_bucket_keeps_the_department_it_was_opened_with(session_factory, run):
+    async def scenario():
+        employee_id = await _employee(session_factory)
+        async with session_factory() as session:
+            await ingest_time_entries_db(session, [
+                TimeEntryCreate(employee_id=employee_id, clock_in="2026-03-02T08:00:00", hours=4)
+            ])
+            employee = await session.get(Employee, employee_id)
+            employee.department = "sales"
+            await session.commit()
+            await ingest_time_entries_db(session, [
+                TimeEntryCreate(employee_id=employee_id, clock_in="2026-03-03T08:00:00", hours=2)
+            ])
+        async with session_factory() as session:
+            return (await session.execute(select(TimeEntryWeekly.department, TimeEntryWeekly.hours))).all()
+
+    assert run(scenario()) == [("ops", 6.0)]
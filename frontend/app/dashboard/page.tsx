@@ -3,52 +3,34 @@
 import { useEffect, useState } from 'react'
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts'
 import { createClientComponentClient } from '@supabase/auth-helpers-nextjs'
-import EmployeeStatusCard from '@/components/EmployeeStatusCard'
-import ProjectProgressBar from '@/components/ProjectProgressBar'
-import MaterialsTracker from '@/components/MaterialsTracker'
-import { Employee } from '@/types/employee'
-import { Project } from '@/types/project'
-import { Material } from '@/types/material'
-import { fetchEmployees, fetchProjects, fetchMaterials } from '@/lib/api-client'
+import { apiClient, DashboardSummary } from '@/lib/api-client'
 
 export default function DashboardPage() {
-  const [employees, setEmployees] = useState<Employee[]>([])
-  const [projects, setProjects] = useState<Project[]>([])
-  const [materials, setMaterials] = useState<Material[]>([])
+  const [summary, setSummary] = useState<DashboardSummary | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
-  
+
   const supabase = createClientComponentClient()
 
   useEffect(() => {
-    const loadDashboardData = async () => {
-      try {
-        setLoading(true)
-        const [employeeData, projectData, materialData] = await Promise.all([
-          fetchEmployees(),
-          fetchProjects(),
-          fetchMaterials()
-        ])
-        
-        setEmployees(employeeData)
-        setProjects(projectData)
-        setMaterials(materialData)
-      } catch (err) {
-        setError(err instanceof Error ? err.message : 'Failed to load dashboard data')
-      } finally {
-        setLoading(false)
+    // The server aggregates; the page only ever downloads the summary.
+    const loadSummary = async () => {
+      const { data, error: loadError } = await apiClient.dashboard.getSummary()
+      if (loadError) {
+        setError(loadError)
+      } else {
+        setSummary(data)
       }
+      setLoading(false)
     }
 
-    loadDashboardData()
+    loadSummary()
 
     const projectsSubscription = supabase
       .channel('project-updates')
-      .on('postgres_changes', { event: '*', schema: 'public', table: 'projects' }, 
-        payload => {
-          setProjects(current => current.map(project => 
-            project.id === payload.new.id ? { ...project, ...payload.new } : project
-          ))
+      .on('postgres_changes', { event: '*', schema: 'public', table: 'projects' },
+        () => {
+          loadSummary()
         }
       )
       .subscribe()
@@ -66,30 +48,37 @@ export default function DashboardPage() {
     )
   }
 
-  if (error) {
+  if (error || !summary) {
     return (
       <div className="p-4 bg-red-100 border border-red-400 text-red-700 rounded">
-        {error}
+        {error || 'Failed to load dashboard data'}
       </div>
     )
   }
 
+  const projectsByStatus = Object.entries(summary.projects.by_status).map(([status, { count, average_progress }]) => ({
+    status,
+    count,
+    average_progress: Math.round(average_progress)
+  }))
+
   return (
     <div className="p-6 max-w-7xl mx-auto">
       <h1 className="text-3xl font-bold mb-8">Dashboard</h1>
-      
+
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6 mb-8">
         <div className="col-span-full lg:col-span-2">
           <div className="bg-white p-6 rounded-lg shadow">
-            <h2 className="text-xl font-semibold mb-4">Project Progress</h2>
+            <h2 className="text-xl font-semibold mb-4">Project Progress ({summary.projects.total} projects)</h2>
             <div className="h-[300px]">
               <ResponsiveContainer width="100%" height="100%">
-                <BarChart data={projects}>
+                <BarChart data={projectsByStatus}>
                   <CartesianGrid strokeDasharray="3 3" />
-                  <XAxis dataKey="name" />
+                  <XAxis dataKey="status" />
                   <YAxis />
                   <Tooltip />
-                  <Bar dataKey="progress" fill="#3B82F6" />
+                  <Bar dataKey="average_progress" name="Average progress (%)" fill="#3B82F6" />
+                  <Bar dataKey="count" name="Projects" fill="#10B981" />
                 </BarChart>
               </ResponsiveContainer>
             </div>
@@ -97,10 +86,13 @@ export default function DashboardPage() {
         </div>
 
         <div className="bg-white p-6 rounded-lg shadow">
-          <h2 className="text-xl font-semibold mb-4">Employee Status</h2>
-          <div className="space-y-4">
-            {employees.map(employee => (
-              <EmployeeStatusCard key={employee.id} employee={employee} />
+          <h2 className="text-xl font-semibold mb-4">Employee Status ({summary.employees.total})</h2>
+          <div className="space-y-2">
+            {Object.entries(summary.employees.by_status).map(([status, count]) => (
+              <div key={status} className="flex justify-between">
+                <span className="capitalize">{status.replace('_', ' ')}</span>
+                <span className="font-semibold">{count}</span>
+              </div>
             ))}
           </div>
         </div>
@@ -108,17 +100,39 @@ export default function DashboardPage() {
 
       <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
         <div className="bg-white p-6 rounded-lg shadow">
-          <h2 className="text-xl font-semibold mb-4">Active Projects</h2>
-          {projects.map(project => (
-            <ProjectProgressBar key={project.id} project={project} />
-          ))}
+          <h2 className="text-xl font-semibold mb-4">Employees by Department</h2>
+          <div className="space-y-2">
+            {Object.entries(summary.employees.by_department).map(([department, count]) => (
+              <div key={department} className="flex justify-between">
+                <span>{department}</span>
+                <span className="font-semibold">{count}</span>
+              </div>
+            ))}
+          </div>
         </div>
 
         <div className="bg-white p-6 rounded-lg shadow">
           <h2 className="text-xl font-semibold mb-4">Materials Inventory</h2>
-          <MaterialsTracker materials={materials} />
+          <dl className="grid grid-cols-2 gap-4">
+            <div>
+              <dt className="text-sm text-gray-500">Materials</dt>
+              <dd className="text-2xl font-semibold">{summary.materials.total}</dd>
+            </div>
+            <div>
+              <dt className="text-sm text-gray-500">Inventory value</dt>
+              <dd className="text-2xl font-semibold">${summary.materials.total_inventory_value.toFixed(2)}</dd>
+            </div>
+            <div>
+              <dt className="text-sm text-gray-500">Low stock</dt>
+              <dd className="text-2xl font-semibold text-yellow-600">{summary.materials.low_stock}</dd>
+            </div>
+            <div>
+              <dt className="text-sm text-gray-500">Out of stock</dt>
+              <dd className="text-2xl font-semibold text-red-600">{summary.materials.out_of_stock}</dd>
+            </div>
+          </dl>
         </div>
       </div>
     </div>
   )
-}
\ No newline at end of file
+}
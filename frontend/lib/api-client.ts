@@ -4,11 +4,30 @@ import { Material } from '../types/material';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
+export type EmployeeStatusSnapshot = {
+  id: number;
+  status: string;
+  last_status_update: string | null;
+};
+
 type ApiResponse<T> = {
   data: T | null;
   error: string | null;
 };
 
+// Delay before reopening a status stream that dropped, as EventSource would.
+const STREAM_RETRY_MS = 3000;
+
+let authToken: string | null = null;
+
+export function setAuthToken(token: string | null): void {
+  authToken = token;
+}
+
+function authHeaders(): Record<string, string> {
+  return authToken ? { Authorization: `Bearer ${authToken}` } : {};
+}
+
 async function handleResponse<T>(response: Response): Promise<ApiResponse<T>> {
   if (!response.ok) {
     const error = await response.text();
@@ -18,7 +37,84 @@ async function handleResponse<T>(response: Response): Promise<ApiResponse<T>> {
   return { data, error: null };
 }
 
+/**
+ * Read a server-sent event stream with fetch, which, unlike EventSource, can
+ * send the bearer token. Resolves when the stream ends; returns false if the
+ * server refused it, in which case reconnecting would not help.
+ */
+async function readEventStream(
+  url: string,
+  onEvent: (event: string, data: string) => void,
+  signal: AbortSignal
+): Promise<boolean> {
+  const response = await fetch(url, {
+    headers: { Accept: 'text/event-stream', ...authHeaders() },
+    signal
+  });
+  if (!response.ok || !response.body) {
+    return false;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let event = 'message';
+  let data: string[] = [];
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) {
+      return true;
+    }
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split(/\r?\n/);
+    buffer = lines.pop() ?? '';
+    for (const line of lines) {
+      if (line === '') {
+        if (data.length) {
+          onEvent(event, data.join('\n'));
+        }
+        event = 'message';
+        data = [];
+      } else if (!line.startsWith(':')) {
+        const colon = line.indexOf(':');
+        const field = colon < 0 ? line : line.slice(0, colon);
+        const fieldValue = colon < 0 ? '' : line.slice(colon + 1).replace(/^ /, '');
+        if (field === 'event') {
+          event = fieldValue;
+        } else if (field === 'data') {
+          data.push(fieldValue);
+        }
+      }
+    }
+  }
+}
+
+export type DashboardSummary = {
+  employees: {
+    total: number;
+    by_status: Record<string, number>;
+    by_department: Record<string, number>;
+  };
+  projects: {
+    total: number;
+    by_status: Record<string, { count: number; average_progress: number }>;
+  };
+  materials: {
+    total: number;
+    total_inventory_value: number;
+    low_stock: number;
+    out_of_stock: number;
+  };
+};
+
 export const apiClient = {
+  dashboard: {
+    async getSummary(): Promise<ApiResponse<DashboardSummary>> {
+      const response = await fetch(`${API_BASE_URL}/api/dashboard/summary`);
+      return handleResponse<DashboardSummary>(response);
+    }
+  },
+
   employees: {
     async getAll(): Promise<ApiResponse<Employee[]>> {
       const response = await fetch(`${API_BASE_URL}/api/employees`);
@@ -30,6 +126,37 @@ export const apiClient = {
       return handleResponse<Employee>(response);
     },
 
+    async getStatuses(ids: string[]): Promise<ApiResponse<EmployeeStatusSnapshot[]>> {
+      const response = await fetch(`${API_BASE_URL}/api/employees/status?ids=${ids.join(',')}`);
+      return handleResponse<EmployeeStatusSnapshot[]>(response);
+    },
+
+    streamStatuses(ids: string[], onStatus: (update: EmployeeStatusSnapshot) => void): () => void {
+      const url = `${API_BASE_URL}/api/employees/status/stream?ids=${ids.join(',')}`;
+      const controller = new AbortController();
+      const onEvent = (event: string, data: string) => {
+        if (event === 'status') {
+          onStatus(JSON.parse(data));
+        }
+      };
+
+      (async () => {
+        while (!controller.signal.aborted) {
+          try {
+            if (!(await readEventStream(url, onEvent, controller.signal))) {
+              return;
+            }
+          } catch {
+            if (controller.signal.aborted) {
+              return;
+            }
+          }
+          await new Promise((resolve) => setTimeout(resolve, STREAM_RETRY_MS));
+        }
+      })();
+      return () => controller.abort();
+    },
+
     async getPerformance(id: string): Promise<ApiResponse<any>> {
       const response = await fetch(`${API_BASE_URL}/api/employees/${id}/performance`);
       return handleResponse<any>(response);